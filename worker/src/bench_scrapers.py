@@ -0,0 +1,231 @@
+"""
+Offline corpus capture and parse/normalize/dedup throughput benchmarks.
+
+Record a corpus from the live sites (once, or when a site's markup changes):
+    python -m src.bench_scrapers record --corpus fixtures/corpus/v1
+
+Benchmark against it without any network access:
+    python -m src.bench_scrapers run --corpus fixtures/corpus/v1 --baseline benchmarks/baseline.json
+    python -m src.bench_scrapers run --corpus fixtures/corpus/v1 --baseline benchmarks/baseline.json --save-baseline
+
+Cold-start time and memory of a worker process (each measured in fresh interpreters):
+    python -m src.bench_scrapers startup --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from src.scrapers.orchestrator import ScraperOrchestrator
+from src.scrapers.deduplicator import Deduplicator
+from src.scrapers.dedup_store import MemoryDedupStore
+from src.scrapers.change_tracker import ChangeTracker
+from src.scrapers.recording import PageCorpus, PageRecorder, ReplayTransport, set_page_recorder, set_replay_transport
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("BenchScrapers")
+
+
+def _fresh_orchestrator() -> ScraperOrchestrator:
+    # Benchmarks must not read or write the persistent dedup store or change snapshot
+    orchestrator = ScraperOrchestrator()
+    orchestrator.deduplicator = Deduplicator(store=MemoryDedupStore())
+    orchestrator.change_tracker = ChangeTracker()
+    return orchestrator
+
+
+async def record(corpus_path: str):
+    set_page_recorder(PageRecorder(PageCorpus(corpus_path)))
+    orchestrator = _fresh_orchestrator()
+    try:
+        jobs = await orchestrator.run_all()
+    finally:
+        await orchestrator.close()
+    print(f"Recorded pages into {corpus_path} ({len(jobs)} unique jobs).")
+
+
+async def bench_scraper(scraper, repeat: int) -> Dict[str, Any]:
+    pages = await scraper.fetch()
+    if not pages:
+        return {}
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = await scraper.parse(pages)
+        parsed_at = time.perf_counter()
+        normalized = await scraper.normalize(parsed)
+        normalized_at = time.perf_counter()
+        Deduplicator(store=MemoryDedupStore()).process_and_deduplicate(normalized)
+        deduped_at = time.perf_counter()
+        timings = {
+            "parse_s": parsed_at - start,
+            "normalize_s": normalized_at - parsed_at,
+            "dedup_s": deduped_at - normalized_at,
+        }
+        best = {key: min(value, best.get(key, value)) for key, value in timings.items()}
+    # Peak memory gets its own pass: tracing allocations would skew the timings above
+    tracemalloc.start()
+    Deduplicator(store=MemoryDedupStore()).process_and_deduplicate(await scraper.normalize(await scraper.parse(pages)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    jobs = len(parsed)
+    return {
+        "pages": len(pages),
+        "jobs": jobs,
+        "parse_pages_per_s": len(pages) / best["parse_s"],
+        "parse_jobs_per_s": jobs / best["parse_s"],
+        "normalize_jobs_per_s": jobs / best["normalize_s"] if jobs else 0.0,
+        "dedup_jobs_per_s": jobs / best["dedup_s"] if jobs else 0.0,
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+async def bench_end_to_end() -> Dict[str, Any]:
+    orchestrator = _fresh_orchestrator()
+    tracemalloc.start()
+    start = time.perf_counter()
+    jobs = await orchestrator.run_all()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "jobs": len(jobs),
+        "fetched": orchestrator.total_fetched,
+        "run_all_s": elapsed,
+        "run_all_jobs_per_s": orchestrator.total_fetched / elapsed,
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+async def run(corpus_path: str, repeat: int) -> Dict[str, Any]:
+    set_replay_transport(ReplayTransport(PageCorpus(corpus_path)))
+    results: Dict[str, Any] = {"scrapers": {}}
+    orchestrator = ScraperOrchestrator()
+    for scraper in orchestrator.scrapers:
+        metrics = await bench_scraper(scraper, repeat)
+        await scraper.close()
+        if metrics:
+            results["scrapers"][scraper.name] = metrics
+        else:
+            logger.warning(f"No recorded pages for {scraper.name}, skipping.")
+    results["end_to_end"] = await bench_end_to_end()
+    await orchestrator.close()
+    return results
+
+
+# What a process does before scraping: import the orchestrator, then get scrapers ready to run
+STARTUP_SCENARIOS = {
+    "import": [],
+    "one_source": ["LinkedIn"],
+    "all_sources": None,
+}
+
+_STARTUP_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+from src.scrapers.orchestrator import ScraperOrchestrator
+imported = time.perf_counter()
+sources = json.loads(sys.argv[1])
+if sources != []:
+    orchestrator = ScraperOrchestrator()
+    orchestrator._select(sources)
+ready = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "ready_s": ready - started,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def bench_startup(repeat: int) -> Dict[str, Any]:
+    """Best of `repeat` fresh interpreters per scenario, since only a cold process shows import costs."""
+    results = {}
+    for scenario, sources in STARTUP_SCENARIOS.items():
+        runs = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", _STARTUP_PROBE, json.dumps(sources)],
+                                    capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        results[scenario] = {key: min(run[key] for run in runs) for key in runs[0]}
+    return results
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Throughputs (*_per_s) may not drop, and peak memory or startup times may not grow, by more
+    than `threshold`.
+    """
+    regressions = []
+    sections = [(f"scrapers.{name}", metrics, baseline.get("scrapers", {}).get(name, {}))
+                for name, metrics in results.get("scrapers", {}).items()]
+    if "end_to_end" in results:
+        sections.append(("end_to_end", results["end_to_end"], baseline.get("end_to_end", {})))
+    sections.extend((f"startup.{name}", metrics, baseline.get("startup", {}).get(name, {}))
+                    for name, metrics in results.get("startup", {}).items())
+    for label, current, previous in sections:
+        for key, value in current.items():
+            if key not in previous:
+                continue
+            if key.endswith("_per_s") and value < previous[key] * (1 - threshold):
+                regressions.append(f"{label}.{key}: {value:.1f} < baseline {previous[key]:.1f}")
+            elif key in ("peak_mem_kb", "max_rss_kb") and value > previous[key] * (1 + threshold):
+                regressions.append(f"{label}.{key}: {value:.0f} > baseline {previous[key]:.0f}")
+            elif key in ("import_s", "ready_s") and value > previous[key] * (1 + threshold):
+                regressions.append(f"{label}.{key}: {value:.3f} > baseline {previous[key]:.3f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["record", "run", "startup"])
+    parser.add_argument("--corpus", default="fixtures/corpus/v1")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression before failing")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.corpus))
+        return
+
+    if args.command == "startup":
+        results = {"startup": bench_startup(args.repeat)}
+    else:
+        # Measure parsing cost itself rather than pool start-up and pickling, unless asked otherwise
+        os.environ.setdefault("SCRAPER_PARSE_EXECUTOR", "inline")
+        results = asyncio.run(run(args.corpus, args.repeat))
+    print(json.dumps(results, indent=2))
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    if args.save_baseline:
+        # Startup and throughput results are saved separately; keep the other one's section
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif baseline:
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src.scrapers.orchestrator import ScraperOrchestrator
+from src.scrapers.scheduling import get_scheduler
+from src.scrapers.sink import JobSink
+
+logger = logging.getLogger(__name__)
+
+# Reused across scheduled runs so the dedup store and change snapshot carry over in a long-lived worker
+_orchestrator: Optional[ScraperOrchestrator] = None
+
+
+def get_orchestrator() -> ScraperOrchestrator:
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = ScraperOrchestrator()
+    return _orchestrator
+
+
+async def close_orchestrator():
+    """Shuts down the orchestrator's Chromium and HTTP connections, which stay open across runs, if it was created."""
+    if _orchestrator is not None:
+        await _orchestrator.close()
+
+
+async def run_full_scraping_pipeline(database_url: Optional[str] = None, reparse: bool = False,
+                                     sources: Optional[List[str]] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Scrapes every source (or the given `ScraperOrchestrator.units()`) and upserts new or changed
+    jobs into the database as they stream in. Each source's outcome feeds the adaptive scheduler.
+    With `reparse`, the latest archived pages are parsed again instead (see page_archive).
+    Scraping stops after `deadline` seconds (RUN_DEADLINE by default), keeping what it got.
+    """
+    return await persist(get_orchestrator().stream_all(reparse, sources, deadline), database_url, reparse)
+
+
+async def persist(jobs: AsyncIterator[Dict[str, Any]], database_url: Optional[str] = None,
+                  reparse: bool = False) -> Dict[str, Any]:
+    """
+    Upserts an orchestrator job stream (`stream_all` or `merge`) into the database, then feeds
+    the run's per-source outcomes to the adaptive scheduler.
+    """
+    orchestrator = get_orchestrator()
+    sink = JobSink(
+        database_url,
+        batch_size=int(os.environ.get("SINK_BATCH_SIZE") or 500),
+        flush_interval=float(os.environ.get("SINK_FLUSH_INTERVAL") or 5.0),
+        create_tables=True,
+    )
+    written = await sink.consume(jobs)
+    logger.info(f"Pipeline wrote {written} jobs.")
+    if not reparse:
+        get_scheduler().record_run(orchestrator.last_outcomes)
+    return {"written": written, **orchestrator.last_changes, "report": orchestrator.last_report}
+
+
+async def run_due_sources(database_url: Optional[str] = None) -> Dict[str, Any]:
+    """Runs only the sources whose adaptive schedule is due; meant to be triggered on a short beat tick."""
+    due = get_scheduler().due(get_orchestrator().units())
+    if not due:
+        logger.info("No sources due.")
+        return {"written": 0, "sources": []}
+    return {**await run_full_scraping_pipeline(database_url, sources=due), "sources": due}
+
+
+def describe_schedule() -> List[Dict[str, Any]]:
+    """The learned schedule of every source, soonest first; sources never run are due now."""
+    scheduler = get_scheduler()
+    described = []
+    for unit in get_orchestrator().units():
+        schedule = scheduler.get(unit)
+        described.append({
+            "source": unit,
+            "next_run_at": datetime.datetime.utcfromtimestamp(schedule.next_run_at).isoformat() if schedule else None,
+            "interval_min": round(schedule.interval / 60, 1) if schedule else None,
+            "changes_per_hour": round(schedule.change_rate, 2) if schedule else None,
+            "failure_rate": round(schedule.failure_rate, 2) if schedule else None,
+        })
+    return sorted(described, key=lambda entry: entry["next_run_at"] or "")
+
+
+async def run_once(coro):
+    """Runs a pipeline coroutine in a one-off process, then closes the orchestrator's shared clients."""
+    try:
+        return await coro
+    finally:
+        await close_orchestrator()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description="Scrape all sources into the database.")
+    parser.add_argument("--reparse", action="store_true", help="Parse archived pages again instead of fetching")
+    parser.add_argument("--sources", help="Comma-separated sources to run, e.g. LinkedIn,CompanyPages:Feedzai")
+    parser.add_argument("--deadline", type=float, help="Seconds the scrape may take; slower sources are cut short")
+    parser.add_argument("--due", action="store_true", help="Run only the sources the adaptive schedule says are due")
+    parser.add_argument("--schedule", action="store_true", help="Print the learned schedule and exit")
+    args = parser.parse_args()
+    if args.schedule:
+        print(json.dumps(describe_schedule(), indent=2))
+    elif args.due:
+        print(asyncio.run(run_once(run_due_sources())))
+    else:
+        sources = args.sources.split(",") if args.sources else None
+        print(asyncio.run(run_once(run_full_scraping_pipeline(reparse=args.reparse, sources=sources, deadline=args.deadline))))
@@ -0,0 +1,208 @@
+"""
+Adapters for the public job board APIs of applicant tracking systems (ATS). Many careers
+pages are SPAs rendering one of these boards; asking the board's JSON API directly is one
+small request instead of a browser render, and gives structured titles, locations and dates.
+
+A company in companies.json is asked through its ATS when its entry names one, e.g.
+    {"company": "Acme", "url": "https://acme.com/careers", "ats": "greenhouse", "board": "acme"}
+where "ats" is an adapter's `name` and "board" the company's token in the board URL
+(boards.greenhouse.io/<board>, jobs.lever.co/<board>, apply.workable.com/<board>,
+jobs.smartrecruiters.com/<board>). Entries without one are rendered, and
+a board found embedded in the careers page is used instead for the rest of the worker's life.
+"""
+import abc
+import datetime
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Path segments that follow an ATS host without naming a board
+_NOT_BOARDS = {"embed", "api", "v0", "v1", "j", "jobs", "static", "assets", "widget"}
+
+
+def _iso(value: Any) -> Optional[str]:
+    """ATS dates come as ISO strings or epoch milliseconds; posted_at is always an ISO date-time string."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.datetime.utcfromtimestamp(value / 1000).isoformat()
+    return str(value)
+
+
+def _join(*parts: Optional[str]) -> str:
+    return ", ".join(part for part in parts if part)
+
+
+class AtsAdapter(abc.ABC):
+    """One ATS: how to spot its board on a careers page, where its JSON lives and how to read it."""
+    name = ""
+    # Key of the job list in the board's JSON object
+    jobs_key = "jobs"
+    # Matches a reference to a board in a page; group 1 is the board (company) token
+    board_pattern: re.Pattern
+    endpoint_pattern: re.Pattern
+
+    def detect(self, html: str) -> Optional[str]:
+        for match in self.board_pattern.finditer(html):
+            if match.group(1).lower() not in _NOT_BOARDS:
+                return match.group(1)
+        return None
+
+    @abc.abstractmethod
+    def endpoint(self, board: str) -> str:
+        """URL of the board's JSON API."""
+        pass
+
+    def board_of(self, endpoint: str) -> Optional[str]:
+        match = self.endpoint_pattern.match(endpoint)
+        return match.group(1) if match else None
+
+    def is_board(self, payload: Any) -> bool:
+        """Whether a decoded response is the board's job list rather than an error."""
+        return isinstance(payload, dict) and isinstance(payload.get(self.jobs_key), list)
+
+    @abc.abstractmethod
+    def postings(self, payload: Any, board: str) -> List[Dict[str, Any]]:
+        """Raw jobs ({title, location, url, type, posted_at}) from the decoded JSON response."""
+        pass
+
+
+class Greenhouse(AtsAdapter):
+    name = "greenhouse"
+    board_pattern = re.compile(
+        r"(?:boards|job-boards)(?:\.eu)?\.greenhouse\.io/(?:embed/job_board(?:/js)?\?for=)?([A-Za-z0-9_-]+)")
+    endpoint_pattern = re.compile(r"https://boards-api\.greenhouse\.io/v1/boards/([^/]+)/jobs")
+
+    def endpoint(self, board: str) -> str:
+        return f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs"
+
+    def postings(self, payload: Any, board: str) -> List[Dict[str, Any]]:
+        return [{
+            "title": job.get("title", ""),
+            "location": (job.get("location") or {}).get("name", ""),
+            "url": job.get("absolute_url", ""),
+            "posted_at": _iso(job.get("first_published") or job.get("updated_at")),
+        } for job in payload.get("jobs", [])]
+
+
+class Lever(AtsAdapter):
+    name = "lever"
+    board_pattern = re.compile(r"jobs\.lever\.co/([A-Za-z0-9_-]+)")
+    endpoint_pattern = re.compile(r"https://api\.lever\.co/v0/postings/([^/?]+)")
+
+    def endpoint(self, board: str) -> str:
+        return f"https://api.lever.co/v0/postings/{board}?mode=json"
+
+    def is_board(self, payload: Any) -> bool:
+        # A bare list; unknown boards get {"ok": false, "error": "Document not found"}
+        return isinstance(payload, list)
+
+    def postings(self, payload: Any, board: str) -> List[Dict[str, Any]]:
+        jobs = []
+        for job in payload:
+            categories = job.get("categories") or {}
+            jobs.append({
+                "title": job.get("text", ""),
+                "location": categories.get("location", ""),
+                "url": job.get("hostedUrl", ""),
+                "type": categories.get("commitment"),
+                "posted_at": _iso(job.get("createdAt")),
+            })
+        return jobs
+
+
+class Workable(AtsAdapter):
+    name = "workable"
+    board_pattern = re.compile(r"apply\.workable\.com/([A-Za-z0-9_-]+)")
+    endpoint_pattern = re.compile(r"https://apply\.workable\.com/api/v1/widget/accounts/([^/?]+)")
+
+    def endpoint(self, board: str) -> str:
+        return f"https://apply.workable.com/api/v1/widget/accounts/{board}"
+
+    def postings(self, payload: Any, board: str) -> List[Dict[str, Any]]:
+        return [{
+            "title": job.get("title", ""),
+            "location": _join(job.get("city"), job.get("country")),
+            "url": job.get("url") or f"https://apply.workable.com/{board}/j/{job.get('shortcode', '')}",
+            "type": job.get("employment_type"),
+            "posted_at": _iso(job.get("published_on") or job.get("created_at")),
+        } for job in payload.get("jobs", [])]
+
+
+class SmartRecruiters(AtsAdapter):
+    name = "smartrecruiters"
+    jobs_key = "content"
+    board_pattern = re.compile(r"(?:jobs|careers)\.smartrecruiters\.com/([A-Za-z0-9_-]+)")
+    endpoint_pattern = re.compile(r"https://api\.smartrecruiters\.com/v1/companies/([^/]+)/postings")
+
+    def endpoint(self, board: str) -> str:
+        return f"https://api.smartrecruiters.com/v1/companies/{board}/postings"
+
+    def postings(self, payload: Any, board: str) -> List[Dict[str, Any]]:
+        jobs = []
+        for job in payload.get("content", []):
+            location = job.get("location") or {}
+            jobs.append({
+                "title": job.get("name", ""),
+                "location": _join(location.get("city"), location.get("country", "").upper()),
+                "url": f"https://jobs.smartrecruiters.com/{board}/{job.get('id', '')}",
+                "type": (job.get("typeOfEmployment") or {}).get("label"),
+                "posted_at": _iso(job.get("releasedDate")),
+            })
+        return jobs
+
+
+# Adding an ATS means adding an adapter here; adding a company using one is a config entry
+ATS_ADAPTERS: Dict[str, AtsAdapter] = {adapter.name: adapter for adapter in (Greenhouse(), Lever(), Workable(), SmartRecruiters())}
+
+
+def get_adapter(name: str) -> AtsAdapter:
+    if name not in ATS_ADAPTERS:
+        raise ValueError(f"Unknown ATS {name!r}, expected one of {tuple(ATS_ADAPTERS)}")
+    return ATS_ADAPTERS[name]
+
+
+def detect_ats(html: str) -> Optional[Tuple[str, str]]:
+    """The (ats, board) a careers page embeds or links to, if any."""
+    for adapter in ATS_ADAPTERS.values():
+        board = adapter.detect(html)
+        if board:
+            return adapter.name, board
+    return None
+
+
+def parse_endpoint(url: str) -> Optional[Tuple[str, str]]:
+    """The (ats, board) an API URL built by `AtsAdapter.endpoint` belongs to."""
+    for adapter in ATS_ADAPTERS.values():
+        board = adapter.board_of(url)
+        if board:
+            return adapter.name, board
+    return None
+
+
+def _decode(body: str) -> Any:
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def is_board_response(ats: str, body: str) -> bool:
+    """
+    Whether an ATS response body is the board's job list. Error pages and error objects often
+    come with status 200, and parse to no jobs, as if the company had closed all its openings.
+    """
+    return get_adapter(ats).is_board(_decode(body))
+
+
+def parse_postings(ats: str, board: str, body: str) -> List[Dict[str, Any]]:
+    """Raw jobs from an ATS response body; a body that isn't the board's job list (e.g. an error page) yields none."""
+    adapter = get_adapter(ats)
+    payload = _decode(body)
+    if not adapter.is_board(payload):
+        return []
+    try:
+        return adapter.postings(payload, board)
+    except (AttributeError, TypeError):
+        # A job list of another shape
+        return []
@@ -1,11 +1,31 @@
 import abc
 import asyncio
+import datetime
 import logging
+import os
 import random
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Callable, Optional, AsyncIterator, Set
+from urllib.parse import urlparse
 import httpx
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+
+from .browser_pool import get_browser_pool
+from .fetch_strategy import RENDERED, STATIC, get_fetch_strategy
+from .http_cache import get_http_cache
+from .http_client import get_http_client_manager
+from .job_record import JobRecord
+from .pagination import Paginator, STOP_EMPTY
+from .page_archive import get_page_archive, page_digest
+from .metrics import (
+    FETCH_SECONDS, FETCH_BYTES, FETCH_RETRIES, FETCH_ERRORS, RATE_LIMIT_SLEEP, BACKOFF_SLEEP,
+    PARSE_SECONDS, NORMALIZE_SECONDS, JOBS_YIELDED, FETCH_STRATEGY, FETCH_GIVE_UPS,
+)
+from .parsing import DEFAULT_PARSER, matches_selector, run_parser
+from .rate_limiter import get_rate_limiter, parse_retry_after
+from .resource_policy import RequestInterceptor, ResourcePolicy, interception_enabled
+from .retry_policy import BLOCKED, GIVE_UP_CIRCUIT_OPEN, classify_error, classify_status, get_retry_policy
+from .recording import get_page_recorder, get_replay_transport
+from .tagging import get_tagger
 
 logger = logging.getLogger(__name__)
 
@@ -22,109 +42,400 @@ class BaseScraper(abc.ABC):
     Handles rate limiting, retry logic (exponential backoff), and standardizing output.
     """
     
-    def __init__(self, name: str, source: str, rate_limit: float = 2.0, max_retries: int = 3):
+    def __init__(self, name: str, source: str, rate_limit: float = 2.0, max_retries: int = 3,
+                 burst: int = 1, parser_backend: str = DEFAULT_PARSER, max_pages: int = 10, page_prefetch: int = 1,
+                 resource_policy: Optional[ResourcePolicy] = None, expected_selector: Optional[str] = None):
         self.name = name
         self.source = source
+        # Minimum average seconds between requests to a host; `burst` requests may go out back to back.
+        # Never 0: the limiter is also what slows a host down after a 429
+        if rate_limit <= 0:
+            raise ValueError(f"{name}: rate_limit must be positive seconds between requests, got {rate_limit}")
         self.rate_limit = rate_limit
+        self.burst = burst
+        # BeautifulSoup backend handed to this scraper's parse function, see parsing.PARSER_BACKENDS
+        self.parser_backend = parser_backend
         self.max_retries = max_retries
-        self.client = httpx.AsyncClient(headers={"User-Agent": random.choice(USER_AGENTS)}, timeout=30.0)
+        # Depth limit for `paginate`; SCRAPER_MAX_PAGES overrides it for catch-up crawls
+        self.max_pages = int(os.environ.get("SCRAPER_MAX_PAGES") or max_pages)
+        self.page_prefetch = page_prefetch
+        # Subresources rendered pages may load; sites that need more allow-list their domains
+        self.resource_policy = resource_policy or ResourcePolicy()
+        # CSS selector a page with results matches; lets pages that don't need JS skip the browser
+        self.expected_selector = expected_selector
+        # SCRAPER_KEEP_RAW=1 keeps each job's scraped fields on its record, e.g. to debug a parser
+        self.keep_raw = (os.environ.get("SCRAPER_KEEP_RAW") or "").lower() in ("1", "true", "yes")
+        # Set by the orchestrator to the deduplicator's lookup, so pagination stops once it reaches known jobs
+        self.is_known: Optional[Callable[[Dict[str, Any]], bool]] = None
+        self.paginator: Optional[Paginator] = None
+        # Whether the last stream saw the whole listing; only then can unseen postings count as removed
+        self.listing_complete = False
+        # Subset of `targets()` to scrape in the next stream (all when None), what it got through to,
+        # and the targets whose whole listing was streamed (so their unseen postings count as removed)
+        self.selected_targets: Optional[Set[str]] = None
+        self.fetched_targets: Set[str] = set()
+        self.completed_targets: Set[str] = set()
+        # Per-stream counters the orchestrator reports to the scheduler, blocks also per target
+        self.pages_streamed = 0
+        self.blocks = 0
+        self.target_blocks: Dict[str, int] = {}
+        self.http_cache = get_http_cache()
+        # Offline replay of a recorded corpus, and recording of live fetches into one
+        self.replay = get_replay_transport()
+        self.recorder = get_page_recorder()
+        # Compressed archive of every page fetched from the network, see `reparse_pages`
+        self.archive = get_page_archive()
+        # Pooled client shared by all scrapers; the orchestrator hands its own in and owns its lifecycle
+        self.http = get_http_client_manager()
+
+    def targets(self) -> List[str]:
+        """Parts of this source that can be scraped and scheduled on their own, e.g. one careers page per company."""
+        return []
+
+    def target_of(self, job: Dict[str, Any]) -> Optional[str]:
+        """Which of `targets()` a job came from."""
+        return None
+
+    def target_of_url(self, url: str) -> Optional[str]:
+        """Which of `targets()` a fetched URL belongs to, so a block holds back only that target."""
+        return None
 
     async def close(self):
-        await self.client.aclose()
+        """
+        Called when a stream ends, for per-run cleanup. The HTTP client is shared and not closed
+        here, so a scraper can run again.
+        """
         
+    def _keep(self, url: str, html: str, rendered: bool):
+        """Records a page fetched from the network into the corpus and the page archive, if enabled."""
+        if self.recorder:
+            self.recorder.record(self.name, url, html, rendered=rendered)
+        if self.archive:
+            self.archive.put(self.name, self.source, url, html, rendered)
+
     def _get_headers(self) -> Dict[str, str]:
         return {"User-Agent": random.choice(USER_AGENTS)}
 
-    async def fetch_html(self, url: str) -> Optional[str]:
-        """Fetch HTML content with retry and backoff logic using httpx."""
-        retries = 0
-        backoff = 1.0
-        while retries <= self.max_retries:
+    async def _throttle(self, url: str) -> str:
+        """Waits for the shared per-host rate limiter and returns the host that was throttled."""
+        host = urlparse(url).netloc
+        limiter = get_rate_limiter()
+        limiter.configure(host, rate=1.0 / self.rate_limit, burst=self.burst)
+        RATE_LIMIT_SLEEP.inc(await limiter.acquire(host), scraper=self.name)
+        return host
+
+    async def fetch_html(self, url: str, probe: bool = False) -> Optional[str]:
+        """
+        Fetch HTML content with retry and backoff logic using httpx.
+        When the HTTP cache is enabled, cached pages are revalidated with a conditional request
+        and 304 responses are served from the cache; in cache-only mode the network is never used.
+        A `probe` (see `fetch_static_first`) is tried once, and a 403 to it doesn't count as a block.
+        Which failures are retried, and for how long, is up to the shared `retry_policy`.
+        """
+        if self.replay:
+            return self.replay.fetch(self.name, url, rendered=False)
+        cached = self.http_cache.get(url) if self.http_cache else None
+        if self.http_cache and self.http_cache.cache_only:
+            if cached is None:
+                logger.warning(f"[{self.name}] Cache-only mode and no cached copy of {url}.")
+            return cached.body if cached else None
+
+        max_retries = 0 if probe else self.max_retries
+        host = urlparse(url).netloc
+        attempt = 0
+        while not self._circuit_open(url, host, "static"):
+            await self._throttle(url)
+            started = time.monotonic()
+            headers = self._get_headers()
+            if cached:
+                headers.update(self.http_cache.conditional_headers(cached))
             try:
-                await asyncio.sleep(self.rate_limit + random.uniform(0, 1)) # Rate limiting with jitter
-                response = await self.client.get(url, headers=self._get_headers())
-                response.raise_for_status()
-                return response.text
-            except (httpx.HTTPError, httpx.TimeoutException) as e:
-                logger.warning(f"[{self.name}] Error fetching {url}: {e}. Retry {retries}/{self.max_retries}")
-                retries += 1
-                if retries <= self.max_retries:
-                    await asyncio.sleep(backoff)
-                    backoff *= 2 # Exponential backoff
-        logger.error(f"[{self.name}] Max retries reached for {url}.")
+                async with self.http.host_slot(host):
+                    response = await self.http.client().get(url, headers=headers)
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                outcome, error, detail, status, retry_after = classify_error(e), type(e).__name__, str(e), None, None
+            else:
+                FETCH_SECONDS.observe(time.monotonic() - started, scraper=self.name, kind="static")
+                FETCH_BYTES.inc(len(response.content), scraper=self.name, kind="static")
+                if response.status_code == 304 and cached:
+                    self._fetch_succeeded(host)
+                    self.http_cache.revalidated(url)
+                    self._keep(url, cached.body, rendered=False)
+                    return cached.body
+                if response.is_success:
+                    self._fetch_succeeded(host)
+                    if self.http_cache:
+                        self.http_cache.store(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                    self._keep(url, response.text, rendered=False)
+                    return response.text
+                status = response.status_code
+                outcome, error, detail = classify_status(status), f"HTTP {status}", ""
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            # Sites that refuse plain HTTP clients may still serve the page rendered, so a probe's block doesn't count
+            if not await self._retry_after_failure(url, host, "static", outcome, error, detail, status, attempt, max_retries,
+                                                   retry_after, blocks_count=not probe):
+                return None
+            attempt += 1
         return None
 
     async def fetch_js_rendered_html(self, url: str, wait_selector: str = None) -> Optional[str]:
-        """Fetch JS rendered HTML using Playwright."""
-        retries = 0
-        backoff = 1.0
-        while retries <= self.max_retries:
+        """Fetch JS rendered HTML using a page from the shared Playwright browser pool."""
+        if self.replay:
+            return self.replay.fetch(self.name, url, rendered=True)
+        host = urlparse(url).netloc
+        attempt = 0
+        while not self._circuit_open(url, host, "rendered"):
+            await self._throttle(url)
+            started = time.monotonic()
+            status, retry_after, content = None, None, None
             try:
-                await asyncio.sleep(self.rate_limit + random.uniform(0, 1))
-                async with async_playwright() as p:
-                    # Launching chromium with specific args to bypass basic bot detection
-                    browser = await p.chromium.launch(args=["--disable-blink-features=AutomationControlled"])
-                    page = await browser.new_page(user_agent=random.choice(USER_AGENTS))
-                    
+                pool = get_browser_pool(user_agents=USER_AGENTS)
+                async with pool.page() as page:
+                    if interception_enabled():
+                        await RequestInterceptor(self.resource_policy, pool.asset_cache, self.name).install(page)
                     # Instead of 'networkidle' which hangs on tracking scripts, wait for 'domcontentloaded' with a shorter timeout
-                    await page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                    
-                    if wait_selector:
-                        # Wait for specific element, timeout after 5s if it doesn't appear
-                        await page.wait_for_selector(wait_selector, timeout=5000)
+                    response = await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+                    status = response.status if response is not None else None
+                    # Error statuses are handled below, outside the page: the browser context itself is fine
+                    if status is not None and status >= 400:
+                        retry_after = parse_retry_after(await response.header_value("retry-after"))
                     else:
-                        # Just give it 2 seconds to run client-side JS
-                        await page.wait_for_timeout(2000)
-                        
-                    content = await page.content()
-                    await browser.close()
-                    return content
+                        if wait_selector:
+                            # Wait for specific element, timeout after 5s if it doesn't appear
+                            await page.wait_for_selector(wait_selector, timeout=5000)
+                        else:
+                            # Just give it 2 seconds to run client-side JS
+                            await page.wait_for_timeout(2000)
+                        content = await page.content()
             except Exception as e:
-                logger.warning(f"[{self.name}] Playwright error fetching {url}: {e}. Retry {retries}/{self.max_retries}")
-                retries += 1
-                if retries <= self.max_retries:
-                    await asyncio.sleep(backoff)
-                    backoff *= 2
-        logger.error(f"[{self.name}] Max retries reached for JS rendering {url}.")
+                # A status already read is the page's, not the failure's (e.g. a selector that never showed up)
+                outcome, error, detail, status = classify_error(e), type(e).__name__, str(e), None
+            else:
+                if content is not None:
+                    FETCH_SECONDS.observe(time.monotonic() - started, scraper=self.name, kind="rendered")
+                    FETCH_BYTES.inc(len(content.encode("utf-8")), scraper=self.name, kind="rendered")
+                    self._fetch_succeeded(host)
+                    self._keep(url, content, rendered=True)
+                    return content
+                outcome, error, detail = classify_status(status), f"HTTP {status}", ""
+            if not await self._retry_after_failure(url, host, "rendered", outcome, error, detail, status, attempt,
+                                                   self.max_retries, retry_after):
+                return None
+            attempt += 1
         return None
 
+    def _circuit_open(self, url: str, host: str, kind: str) -> bool:
+        """Whether the host's circuit breaker is open, in which case the fetch fails without a request."""
+        if get_retry_policy().allow(host):
+            return False
+        FETCH_GIVE_UPS.inc(scraper=self.name, kind=kind, reason=GIVE_UP_CIRCUIT_OPEN)
+        logger.warning(f"[{self.name}] Skipping {url}: {host} keeps blocking us, its circuit is open.")
+        return True
+
+    def _fetch_succeeded(self, host: str):
+        get_rate_limiter().record_success(host)
+        get_retry_policy().record(host, None)
+
+    async def _retry_after_failure(self, url: str, host: str, kind: str, outcome: str, error: str, detail: str,
+                                   status: Optional[int], attempt: int, max_retries: int, retry_after: Optional[float],
+                                   blocks_count: bool = True) -> bool:
+        """
+        Records a failed attempt (`error` is the exception class or HTTP status, `detail` its
+        message, `status` the response's status code, None if there was no response) and asks
+        the retry policy what to do. Returns True, after backing off, if the fetch should be
+        tried again.
+        """
+        policy = get_retry_policy()
+        FETCH_ERRORS.inc(scraper=self.name, kind=kind, error=error, outcome=outcome)
+        if detail:
+            error = f"{error}: {detail}"
+        if outcome == BLOCKED and blocks_count:
+            self.blocks += 1
+            target = self.target_of_url(url)
+            if target is not None:
+                self.target_blocks[target] = self.target_blocks.get(target, 0) + 1
+            policy.record(host, outcome, retry_after)
+        else:
+            # Frees the host's half-open probe, if this was it: the failure says nothing about the block
+            policy.release(host)
+        if status == 429:
+            get_rate_limiter().penalize(host, retry_after)
+        decision = policy.retry_delay(outcome, attempt, max_retries, retry_after)
+        if decision.delay is None:
+            FETCH_GIVE_UPS.inc(scraper=self.name, kind=kind, reason=decision.reason)
+            log = logger.error if blocks_count else logger.info
+            log(f"[{self.name}] Giving up on {url} ({decision.reason}): {error}")
+            return False
+        logger.warning(f"[{self.name}] {error} fetching {url}. Retry {attempt + 1}/{max_retries} in {decision.delay:.1f}s")
+        FETCH_RETRIES.inc(scraper=self.name, kind=kind)
+        BACKOFF_SLEEP.inc(decision.delay, scraper=self.name)
+        await asyncio.sleep(decision.delay)
+        return True
+
+    async def looks_complete(self, html: str) -> bool:
+        """
+        Whether a page holds the content this scraper parses, i.e. matches `expected_selector`.
+        Building the tree is parsing too, so it runs in the parse executor.
+        """
+        return await run_parser(matches_selector, html, self.expected_selector, self.parser_backend)
+
+    async def fetch_static_first(self, url: str, wait_selector: str = None) -> Optional[str]:
+        """
+        Fetches a page that may need JS: plain HTTP first, and only when the result doesn't
+        `looks_complete` is the page rendered. Pages that turn out to need rendering go straight
+        to the browser until the strategy store re-probes them, see `fetch_strategy`.
+        Scrapers without an `expected_selector` can't tell and always render.
+        """
+        if self.expected_selector is None:
+            return await self.fetch_js_rendered_html(url, wait_selector)
+        strategy = get_fetch_strategy()
+        key = strategy.key(self.name, url)
+        probed = strategy.should_probe(key)
+        if probed:
+            html = await self.fetch_html(url, probe=True)
+            if html is not None and await self.looks_complete(html):
+                strategy.record(key, STATIC)
+                FETCH_STRATEGY.inc(scraper=self.name, mode=STATIC)
+                return html
+        rendered = await self.fetch_js_rendered_html(url, wait_selector)
+        FETCH_STRATEGY.inc(scraper=self.name, mode=RENDERED)
+        # A page that lacks the content even rendered (e.g. past the last result page) says
+        # nothing about whether it needs JS. Never hand on the static copy in its place: an
+        # empty-looking page would end pagination as if the listing were complete.
+        # Only a failed probe restarts the re-probe clock.
+        if probed and rendered is not None and await self.looks_complete(rendered):
+            strategy.record(key, RENDERED)
+        return rendered
+
+    async def paginate(self, page_url: Callable[[int], str], render: bool = False,
+                       wait_selector: str = None) -> AsyncIterator[str]:
+        """
+        Yields result pages 0, 1, 2, ... (URLs from `page_url`) until one is empty or fails, holds
+        only already-known jobs, or `max_pages` is reached; see `pagination.Paginator`.
+        Early stopping needs the parsed jobs, which `stream` reports back after each page.
+        """
+        async def fetch(url: str) -> Optional[str]:
+            if render:
+                return await self.fetch_static_first(url, wait_selector)
+            return await self.fetch_html(url)
+
+        self.paginator = Paginator(self.name, fetch, page_url, self.max_pages, self.page_prefetch, self.is_known)
+        try:
+            async for html in self.paginator.pages():
+                yield html
+        finally:
+            # Stopping on known jobs, at max depth or on an empty first page leaves the rest of the listing unseen
+            if self.paginator.stop_reason != STOP_EMPTY:
+                self.listing_complete = False
+            self.paginator = None
+
     @abc.abstractmethod
-    async def fetch(self) -> Any:
-        """Fetch raw data (HTML pages, JSON responses, etc.)."""
+    def fetch_pages(self) -> AsyncIterator[Any]:
+        """
+        Async generator yielding raw pages (HTML strings, dicts with HTML and metadata, etc.)
+        one at a time, as soon as each is fetched.
+        """
         pass
 
+    async def fetch(self) -> List[Any]:
+        """Fetch all raw pages into a list that `parse` accepts."""
+        return [page async for page in self.fetch_pages()]
+
+    def page_html(self, page: Any) -> str:
+        """The HTML of a raw page as yielded by `fetch_pages`. Override for pages that aren't plain strings."""
+        return page
+
+    def page_from_archive(self, url: str, html: str) -> Optional[Any]:
+        """
+        Rebuilds a raw page in the shape `fetch_pages` yields from an archived URL and HTML.
+        Return None to skip pages this scraper no longer fetches.
+        """
+        return html
+
+    async def reparse_pages(self) -> AsyncIterator[Any]:
+        """Yields the latest archived copy of each page this scraper fetched, without touching the network."""
+        if not self.archive:
+            raise RuntimeError("Reparsing needs a page archive, set SCRAPER_PAGE_ARCHIVE.")
+        for archived in self.archive.latest_pages(self.name):
+            html = self.archive.get(archived.digest)
+            if html is None:
+                logger.warning(f"[{self.name}] Archived page {archived.digest} for {archived.url} is missing.")
+                continue
+            page = self.page_from_archive(archived.url, html)
+            if page is not None:
+                yield page
+
     @abc.abstractmethod
-    async def parse(self, raw_data: Any) -> List[Dict[str, Any]]:
-        """Parse raw data into dictionaries representing jobs."""
+    async def parse(self, raw_data: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Parse a list of raw pages into dictionaries representing jobs.
+        Parsing is CPU-bound, so implementations should hand it to `parsing.run_parser`.
+        """
         pass
 
-    async def normalize(self, parsed_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def normalize(self, parsed_data: List[Dict[str, Any]]) -> List[JobRecord]:
         """
         Normalize the parsed data to canonical schema.
         Override if needed, else assumes parsed_data generally maps to schema, 
         but normalizer module handles the strict mapping.
+        The batch shares one fetch timestamp, and is tagged in one go (see tagging.py).
         """
         from .normalizer import normalize_job # Lazy import to avoid circular dependency
+        fetched_at = datetime.datetime.utcnow().isoformat()
+        get_tagger().tag_jobs(parsed_data)
         normalized = []
         for job in parsed_data:
             job['source'] = self.source
-            normalized.append(normalize_job(job))
+            normalized.append(normalize_job(job, fetched_at, self.keep_raw))
         return normalized
 
-    async def run(self) -> List[Dict[str, Any]]:
-        """Main execution flow for a scraper."""
-        logger.info(f"[{self.name}] Starting scrape.")
-        raw_data = await self.fetch()
-        if not raw_data:
-            logger.info(f"[{self.name}] No raw data fetched.")
-            await self.close()
-            return []
-            
-        parsed_data = await self.parse(raw_data)
-        logger.info(f"[{self.name}] Parsed {len(parsed_data)} raw items.")
-        
+    async def _parse_and_normalize(self, page: Any) -> List[JobRecord]:
+        """
+        Parses then normalizes one page, recording how long each step took and how many jobs came out.
+        Every job references the page it came from by its archive digest.
+        """
+        started = time.monotonic()
+        parsed_data = await self.parse([page])
+        parsed_at = time.monotonic()
+        PARSE_SECONDS.observe(parsed_at - started, scraper=self.name)
+        digest = page_digest(self.page_html(page))
+        for job in parsed_data:
+            job["page_digest"] = digest
         normalized_data = await self.normalize(parsed_data)
-        logger.info(f"[{self.name}] Normalized {len(normalized_data)} items.")
-        
-        await self.close()
+        NORMALIZE_SECONDS.observe(time.monotonic() - parsed_at, scraper=self.name)
+        JOBS_YIELDED.inc(len(normalized_data), scraper=self.name)
         return normalized_data
+
+    async def run(self, reparse: bool = False) -> List[JobRecord]:
+        """Main execution flow for a scraper. With `reparse`, archived pages are parsed instead of fetched."""
+        return [job async for job in self.stream(reparse)]
+
+    async def stream(self, reparse: bool = False) -> AsyncIterator[JobRecord]:
+        """
+        Streaming execution flow: parses and normalizes each page as soon as it is fetched and
+        yields jobs one by one, so only in-flight pages are held in memory.
+        With `reparse`, pages come from the page archive instead of the network.
+        """
+        logger.info(f"[{self.name}] Starting streaming {'reparse' if reparse else 'scrape'}.")
+        jobs = 0
+        # Archived pages may be a mix of runs, so a reparse never proves a posting disappeared;
+        # neither does a run over some targets only
+        self.listing_complete = not reparse and self.selected_targets is None
+        self.fetched_targets = set()
+        self.completed_targets = set()
+        self.pages_streamed = 0
+        self.blocks = 0
+        self.target_blocks = {}
+        try:
+            async for page in (self.reparse_pages() if reparse else self.fetch_pages()):
+                self.pages_streamed += 1
+                jobs_on_page = await self._parse_and_normalize(page)
+                # Before yielding: downstream dedup records these jobs, after which they would all look known
+                if self.paginator is not None:
+                    self.paginator.observe(jobs_on_page)
+                for job in jobs_on_page:
+                    jobs += 1
+                    yield job
+        finally:
+            logger.info(f"[{self.name}] Streamed {jobs} items from {self.pages_streamed} pages.")
+            await self.close()
@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+import logging
+import os
+import random
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+
+from .resource_policy import AssetCache
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+# Launching chromium with specific args to bypass basic bot detection
+CHROMIUM_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+
+class _PooledContext:
+    """A browser context plus the number of pages it has served so far."""
+
+    def __init__(self, context: "BrowserContext", user_agent: str):
+        self.context = context
+        self.user_agent = user_agent
+        self.pages_served = 0
+
+
+class BrowserPool:
+    """
+    Process-wide pool around a single long-lived Chromium instance.
+    Hands out pages from a bounded set of reusable browser contexts, recycles a context
+    after `max_pages_per_context` pages, and relaunches the browser if it crashes.
+    Scripts and stylesheets fetched during a browser session are kept in `asset_cache`
+    (SCRAPER_ASSET_CACHE_MB, default 64) and served to later pages, see resource_policy.
+    """
+
+    def __init__(self, max_contexts: int = 4, max_pages_per_context: int = 20, user_agents: Optional[List[str]] = None):
+        self.max_contexts = max_contexts
+        self.max_pages_per_context = max_pages_per_context
+        self.user_agents = user_agents or []
+        self._playwright: Optional["Playwright"] = None
+        self._browser: Optional["Browser"] = None
+        self._idle: List[_PooledContext] = []
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.asset_cache = AssetCache(int(float(os.environ.get("SCRAPER_ASSET_CACHE_MB") or 64) * 1024 * 1024))
+
+    def _is_healthy(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self) -> "Browser":
+        async with self._lock:
+            if self._is_healthy():
+                return self._browser
+            if self._browser is not None:
+                logger.warning("BrowserPool: Chromium disconnected, relaunching.")
+                await self._discard_browser()
+            if self._playwright is None:
+                # Imported on first launch: processes that never render don't pay for loading Playwright
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(args=CHROMIUM_ARGS)
+            logger.info("BrowserPool: launched Chromium.")
+            return self._browser
+
+    async def _discard_browser(self):
+        # Contexts die with their browser, so idle ones are simply dropped.
+        self._idle.clear()
+        self.asset_cache = AssetCache(self.asset_cache.max_bytes)
+        if self._browser is not None:
+            with contextlib.suppress(Exception):
+                await self._browser.close()
+            self._browser = None
+
+    async def _acquire_context(self) -> _PooledContext:
+        browser = await self._ensure_browser()
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.context.browser is browser:
+                return pooled
+            with contextlib.suppress(Exception):
+                await pooled.context.close()
+        user_agent = random.choice(self.user_agents) if self.user_agents else None
+        context = await browser.new_context(user_agent=user_agent)
+        return _PooledContext(context, user_agent)
+
+    async def _release_context(self, pooled: _PooledContext, healthy: bool):
+        if healthy and self._is_healthy() and pooled.pages_served < self.max_pages_per_context:
+            self._idle.append(pooled)
+            return
+        with contextlib.suppress(Exception):
+            await pooled.context.close()
+
+    @contextlib.asynccontextmanager
+    async def page(self) -> AsyncIterator["Page"]:
+        """
+        Yields a fresh page from a pooled context. At most `max_contexts` pages are open at once.
+        The page is always closed on exit; a context that errored is discarded rather than reused.
+        """
+        async with self._slots:
+            pooled = await self._acquire_context()
+            page = await pooled.context.new_page()
+            pooled.pages_served += 1
+            healthy = False
+            try:
+                yield page
+                healthy = True
+            finally:
+                with contextlib.suppress(Exception):
+                    await page.close()
+                await self._release_context(pooled, healthy)
+
+    async def close(self):
+        """Closes every pooled context, the browser and the Playwright driver."""
+        async with self._lock:
+            for pooled in self._idle:
+                with contextlib.suppress(Exception):
+                    await pooled.context.close()
+            await self._discard_browser()
+            if self._playwright is not None:
+                with contextlib.suppress(Exception):
+                    await self._playwright.stop()
+                self._playwright = None
+            logger.info("BrowserPool: closed.")
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool(**kwargs) -> BrowserPool:
+    """
+    Returns the process-wide BrowserPool, creating it on first use.
+    A pool is bound to the event loop it was created on, so a new loop (e.g. a fresh
+    `asyncio.run`) gets a new pool.
+    """
+    global _pool
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool._loop is not loop:
+        _pool = BrowserPool(**kwargs)
+        _pool._loop = loop
+    return _pool
+
+
+async def close_browser_pool():
+    """Shuts down the process-wide pool if one is running."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
@@ -0,0 +1,113 @@
+import logging
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+class ChangeSet(NamedTuple):
+    new: List[Dict[str, Any]]
+    changed: List[Dict[str, Any]]
+    unchanged: List[Dict[str, Any]]
+    disappeared: List[str]
+
+    @property
+    def emitted(self) -> List[Dict[str, Any]]:
+        """Only new and changed records go downstream."""
+        return self.new + self.changed
+
+
+class ChangeTracker:
+    """
+    Diff stage after normalization. Compares each job's stable `id` and content `fingerprint`
+    against the previous snapshot and classifies it as new, changed or unchanged; jobs from the
+    previous snapshot not seen again are reported as disappeared. The snapshot is kept in SQLite
+    (in memory unless a path is given). A run's updates are held in memory and written in one
+    short transaction by `finish`, so workers merging at the same time into a shared snapshot
+    file only wait for each other's commits, not each other's runs. Each job also records the
+    target it came from (e.g. a company's careers page), so runs over some targets only can still
+    tell which of their postings disappeared.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Concurrent merges on a shared file queue up for the write lock instead of failing
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        if path != ":memory:":
+            # Readers (`observe`) don't wait for a writer either
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS snapshot (id TEXT PRIMARY KEY, source TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                          "target TEXT)")
+        # Snapshots written before targets were tracked get the column; their rows fill it in as they are seen again
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(snapshot)")}
+        if "target" not in columns:
+            self.conn.execute("ALTER TABLE snapshot ADD COLUMN target TEXT")
+        self.conn.commit()
+        self.seen_ids: Set[str] = set()
+        # Snapshot rows to write at the end of the run: id -> (source, fingerprint, target)
+        self.pending: Dict[str, Tuple[str, str, Optional[str]]] = {}
+
+    def observe(self, job: Dict[str, Any], target: Optional[str] = None) -> str:
+        """
+        Classifies one job (from `target`, if its source has targets) against the snapshot and
+        records it. Returns NEW, CHANGED or UNCHANGED.
+        """
+        self.seen_ids.add(job["id"])
+        if job["id"] in self.pending:
+            row = self.pending[job["id"]][1:]
+        else:
+            row = self.conn.execute("SELECT fingerprint, target FROM snapshot WHERE id = ?", (job["id"],)).fetchone()
+        if row is not None and row[0] == job["fingerprint"]:
+            if row[1] != target:
+                self.pending[job["id"]] = (job["source"], job["fingerprint"], target)
+            return UNCHANGED
+        self.pending[job["id"]] = (job["source"], job["fingerprint"], target)
+        return NEW if row is None else CHANGED
+
+    def finish(self, completed_sources: Iterable[str], completed_targets: Iterable[Tuple[str, str]] = ()) -> List[str]:
+        """
+        Ends a run: writes the observed jobs to the snapshot, then drops and returns the IDs of jobs
+        that disappeared. Only sources that completed are considered, so a failed or partial crawl
+        does not make the postings it missed look removed; `completed_targets` are (source, target)
+        pairs completed by a run over part of a source.
+        """
+        disappeared = []
+        completed_sources = set(completed_sources)
+        for source in completed_sources:
+            rows = self.conn.execute("SELECT id FROM snapshot WHERE source = ?", (source,)).fetchall()
+            disappeared.extend(job_id for (job_id,) in rows if job_id not in self.seen_ids)
+        for source, target in set(completed_targets):
+            if source in completed_sources:
+                continue  # Already swept as a whole
+            rows = self.conn.execute("SELECT id FROM snapshot WHERE source = ? AND target = ?", (source, target)).fetchall()
+            disappeared.extend(job_id for (job_id,) in rows if job_id not in self.seen_ids)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO snapshot (id, source, fingerprint, target) VALUES (?, ?, ?, ?)",
+                [(job_id, *row) for job_id, row in self.pending.items()],
+            )
+            self.conn.executemany("DELETE FROM snapshot WHERE id = ?", [(job_id,) for job_id in disappeared])
+        self.seen_ids = set()
+        self.pending = {}
+        return disappeared
+
+    def classify(self, jobs: List[Dict[str, Any]], completed_sources: Iterable[str]) -> ChangeSet:
+        """Batch form of `observe` + `finish`."""
+        changes: Dict[str, List[Dict[str, Any]]] = {NEW: [], CHANGED: [], UNCHANGED: []}
+        for job in jobs:
+            changes[self.observe(job)].append(job)
+        disappeared = self.finish(completed_sources)
+        logger.info(
+            f"ChangeTracker: {len(changes[NEW])} new, {len(changes[CHANGED])} changed, "
+            f"{len(changes[UNCHANGED])} unchanged, {len(disappeared)} disappeared."
+        )
+        return ChangeSet(changes[NEW], changes[CHANGED], changes[UNCHANGED], disappeared)
+
+    def close(self):
+        self.conn.close()
@@ -1,54 +1,217 @@
 import asyncio
-from typing import List, Dict, Any
+import json
+import logging
+import os
+from typing import List, Dict, Any, AsyncIterator, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from .ats import detect_ats, get_adapter, is_board_response, parse_endpoint, parse_postings
 from .base_scraper import BaseScraper
+from .parsing import make_soup, run_parser
+from .tagging import get_tagger
+
+logger = logging.getLogger(__name__)
+
+# Companies to check; COMPANY_PAGES_CONFIG points at another list of the same shape
+DEFAULT_COMPANIES_CONFIG = os.path.join(os.path.dirname(__file__), "companies.json")
+
+
+class CompanyPage(NamedTuple):
+    url: str                      # Careers page, the fallback when there is no ATS to ask
+    ats: Optional[str] = None     # Name in ats.ATS_ADAPTERS, when known up front
+    board: Optional[str] = None   # The company's board token on that ATS
+
+
+def load_companies(path: str) -> Dict[str, CompanyPage]:
+    """
+    Reads [{"company", "url", "ats"?, "board"?}, ...]. Companies without an ATS entry still get
+    one detected from their careers page, so only adding a company is ever needed.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    companies = {}
+    for entry in entries:
+        if entry.get("ats"):
+            get_adapter(entry["ats"])  # Fail on typos at start-up rather than on every run
+        companies[entry["company"]] = CompanyPage(entry["url"], entry.get("ats"), entry.get("board"))
+    return companies
+
 
 class CompanyPagesScraper(BaseScraper):
-    def __init__(self):
-        super().__init__(name="CompanyPages", source="Direct Company")
-        # List of pages to check (expanding for tech companies requested)
-        self.companies = {
-            "Feedzai": "https://feedzai.com/careers/open-roles/?location=Portugal",
-            "Talkdesk": "https://www.talkdesk.com/careers/open-roles/",
-            "Unbabel": "https://unbabel.com/careers/open-roles/",
-            "Sword Health": "https://swordhealth.com/careers",
-            "Volkswagen Digital Solutions": "https://www.vwds.pt/careers/",
-            "Blip": "https://blip.pt/careers/",
-            "Critical TechWorks": "https://www.criticaltechworks.com/careers",
-            "Mindera": "https://mindera.com/careers/"
-        }
-
-    async def fetch(self) -> Any:
-        # Fetch directly since each is just 1 page
-        results = {}
-        for company, url in self.companies.items():
-            # Use JS render as many career pages use Greenhouse/Lever SPA
-            html = await self.fetch_js_rendered_html(url) 
-            if html:
-                results[company] = {"html": html, "url": url}
-        return results
-
-    async def parse(self, raw_data: Dict[str, Dict[str, str]]) -> List[Dict[str, Any]]:
-        jobs = []
-        for company, data in raw_data.items():
-            html = data["html"]
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Identify typical anchor tags that contain job references
-            for link in soup.find_all('a'):
-                text = link.get_text(strip=True).lower()
-                href = link.get('href', '')
-                if any(k in text for k in ['intern', 'trainee', 'estágio', 'junior', 'entry']):
-                    if href.startswith('/'):
-                        parsed = urlparse(data["url"])
-                        href = f"{parsed.scheme}://{parsed.netloc}{href}"
-                        
-                    jobs.append({
-                        "title": link.get_text(strip=True),
-                        "company": company,
-                        "location": "Portugal",
-                        "url": href,
-                        "type": "Trainee/Entry Level"
-                    })
-        return jobs
+    def __init__(self, config_path: Optional[str] = None):
+        super().__init__(name="CompanyPages", source="Direct Company", expected_selector="a[href]")
+        self.companies = load_companies(config_path or os.environ.get("COMPANY_PAGES_CONFIG") or DEFAULT_COMPANIES_CONFIG)
+        # (ats, board) found on careers pages, so later runs ask the ATS straight away
+        self.detected: Dict[str, Tuple[str, str]] = {}
+
+    def targets(self) -> List[str]:
+        return list(self.companies)
+
+    def target_of(self, job: Dict[str, Any]) -> Optional[str]:
+        return job.get("company")
+
+    def _board(self, company: str) -> Optional[Tuple[str, str]]:
+        page = self.companies[company]
+        if page.ats and page.board:
+            return page.ats, page.board
+        return self.detected.get(company)
+
+    async def _fetch_company(self, company: str) -> Optional[Dict[str, str]]:
+        """
+        The company's postings from its ATS's JSON API when it has one we know or can spot on
+        its careers page, otherwise the careers page itself (static first, rendered if need be).
+        """
+        page_url = self.companies[company].url
+        board = self._board(company)
+        if board is None:
+            html = await self.fetch_static_first(page_url)
+            if html is None:
+                return None
+            board = detect_ats(html)
+            if board is None:
+                return {"company": company, "html": html, "url": page_url}
+            logger.info(f"[{self.name}] {company} lists its jobs on {board[0]} ({board[1]}).")
+            self.detected[company] = board
+        ats, token = board
+        api_url = get_adapter(ats).endpoint(token)
+        body = await self.fetch_html(api_url)
+        if body is not None and is_board_response(ats, body):
+            return {"company": company, "html": body, "url": api_url, "ats": ats, "board": token}
+        if body is not None:
+            # Parsed, it would be an empty listing, and every posting of the company would be swept as gone
+            logger.warning(f"[{self.name}] {company}: {ats} board {token} did not answer with its job list.")
+        # Moved to another ATS or board: look at the page again next time, render it this time
+        self.detected.pop(company, None)
+        html = await self.fetch_js_rendered_html(page_url)
+        return {"company": company, "html": html, "url": page_url} if html else None
+
+    async def fetch_pages(self) -> AsyncIterator[Dict[str, str]]:
+        # Each company is one ATS request or careers page, mostly on different hosts: fetch them all in parallel
+        companies = [company for company in self.companies if self.selected_targets is None or company in self.selected_targets]
+        tasks = [asyncio.ensure_future(self._fetch_company(company)) for company in companies]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                page = await next_done
+                if page:
+                    self.fetched_targets.add(page["company"])
+                    yield page
+                    # Resumed once the page's jobs were streamed; a company's page or board is its whole listing
+                    self.completed_targets.add(page["company"])
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def looks_complete(self, html: str) -> bool:
+        return await run_parser(has_job_links, html, self.expected_selector, self.parser_backend)
+
+    def page_html(self, page: Dict[str, str]) -> str:
+        return page["html"]
+
+    def _company_of_board(self, ats: str, board: str) -> str:
+        for company in self.companies:
+            if self._board(company) == (ats, board):
+                return company
+        # Detections don't outlive the process; "swordhealth" still finds "Sword Health"
+        for company in self.companies:
+            if "".join(c for c in company.lower() if c.isalnum()) == board.lower():
+                return company
+        return board
+
+    def target_of_url(self, url: str) -> Optional[str]:
+        board = parse_endpoint(url)
+        if board is not None:
+            return self._company_of_board(*board)
+        for company, page in self.companies.items():
+            if page.url == url:
+                return company
+        return None
+
+    def page_from_archive(self, url: str, html: str) -> Optional[Dict[str, str]]:
+        board = parse_endpoint(url)
+        if board is not None:
+            ats, token = board
+            return {"company": self._company_of_board(ats, token), "html": html, "url": url, "ats": ats, "board": token}
+        companies_by_url = {page.url: company for company, page in self.companies.items()}
+        # A careers page pointing at an ATS was only fetched to find it; its jobs come from the ATS response
+        if url not in companies_by_url or detect_ats(html):
+            return None
+        return {"company": companies_by_url[url], "html": html, "url": url}
+
+    async def parse(self, raw_data: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        return await run_parser(parse_company_pages, raw_data, self.parser_backend)
+
+
+# Tags (see tagging.py) that make an opening worth keeping
+ENTRY_LEVEL_TAGS = ('level:internship', 'level:trainee', 'level:junior', 'level:entry-level')
+
+# ATS boards list a company's jobs worldwide; keep the ones in Portugal
+PORTUGAL_LOCATIONS = ('portugal', 'lisbon', 'lisboa', 'porto', 'coimbra', 'braga', 'aveiro', 'leiria', 'faro', ', pt')
+
+
+def is_entry_level(title: str) -> bool:
+    # Whole words only: "intern" no longer lets "Internal Auditor" or "International Sales" through
+    return get_tagger().has_any(title, ENTRY_LEVEL_TAGS)
+
+
+def is_job_link(link) -> bool:
+    """Whether an anchor looks like an entry-level opening."""
+    return is_entry_level(link.get_text(strip=True))
+
+
+def has_job_links(html: str, selector: str, parser: str) -> bool:
+    """
+    `looks_complete` for careers pages, which share no markup: what counts is whether the links
+    parsed for, or an ATS board, are there.
+    """
+    if detect_ats(html):
+        return True
+    return any(is_job_link(link) for link in make_soup(html, parser).select(selector))
+
+
+def parse_ats_postings(data: Dict[str, str]) -> List[Dict[str, Any]]:
+    jobs = []
+    for posting in parse_postings(data["ats"], data["board"], data["html"]):
+        location = posting.get("location") or ""
+        if not is_entry_level(posting["title"]):
+            continue
+        if location and not any(place in location.lower() for place in PORTUGAL_LOCATIONS):
+            continue
+        jobs.append({
+            "title": posting["title"],
+            "company": data["company"],
+            "location": location or "Portugal",
+            "url": posting["url"],
+            "type": posting.get("type") or "Trainee/Entry Level",
+            "posted_at": posting.get("posted_at"),
+            # Unlike the listings' fixed labels, an ATS gives each posting's own employment type
+            "tags": get_tagger().tags(posting["type"]) if posting.get("type") else [],
+        })
+    return jobs
+
+
+def parse_company_pages(raw_data: List[Dict[str, str]], parser: str) -> List[Dict[str, Any]]:
+    jobs = []
+    for data in raw_data:
+        if data.get("ats"):
+            jobs.extend(parse_ats_postings(data))
+            continue
+        company = data["company"]
+        html = data["html"]
+        soup = make_soup(html, parser)
+        
+        # Identify typical anchor tags that contain job references
+        for link in soup.find_all('a'):
+            href = link.get('href', '')
+            if is_job_link(link):
+                if href.startswith('/'):
+                    parsed = urlparse(data["url"])
+                    href = f"{parsed.scheme}://{parsed.netloc}{href}"
+                    
+                jobs.append({
+                    "title": link.get_text(strip=True),
+                    "company": company,
+                    "location": "Portugal",
+                    "url": href,
+                    "type": "Trainee/Entry Level"
+                })
+    return jobs
@@ -0,0 +1,204 @@
+import abc
+import collections
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import time
+from typing import Any, Iterator, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 30 * 24 * 3600  # Postings not seen again for 30 days are forgotten
+
+
+class DedupStore(abc.ABC):
+    """
+    Storage backend for `Deduplicator`. Holds compact binary job digests, each of which
+    expires `ttl` seconds after it was last seen so postings that disappear age out.
+    """
+    # Whether other processes may add digests behind this one's back (a file or server they share)
+    shared = False
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+
+    @abc.abstractmethod
+    def check_and_add(self, digest: bytes) -> bool:
+        """Records the digest (refreshing its expiry) and returns True if it was already known."""
+        pass
+
+    @abc.abstractmethod
+    def contains(self, digest: bytes) -> bool:
+        """Returns True if the digest is known and unexpired, without recording it."""
+        pass
+
+    @abc.abstractmethod
+    def add(self, digest: bytes):
+        """Records the digest without checking for it first."""
+        pass
+
+    @abc.abstractmethod
+    def iter_digests(self) -> Iterator[bytes]:
+        """Iterates over every unexpired digest, used to warm up a Bloom filter."""
+        pass
+
+    def flush(self):
+        """Persists buffered writes. Called at the end of each dedup batch or stream."""
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryDedupStore(DedupStore):
+    """In-process store bounded to `max_entries`; the least recently seen digests are evicted first."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = 500_000):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.entries: "collections.OrderedDict[bytes, float]" = collections.OrderedDict()
+
+    def check_and_add(self, digest: bytes) -> bool:
+        expires_at = self.entries.pop(digest, None)
+        known = expires_at is not None and expires_at > time.time()
+        self.add(digest)
+        return known
+
+    def contains(self, digest: bytes) -> bool:
+        expires_at = self.entries.get(digest)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, digest: bytes):
+        self.entries.pop(digest, None)
+        self.entries[digest] = time.time() + self.ttl
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def iter_digests(self) -> Iterator[bytes]:
+        now = time.time()
+        return (digest for digest, expires_at in list(self.entries.items()) if expires_at > now)
+
+
+class SQLiteDedupStore(DedupStore):
+    """Local file store. Writes are committed in batches on `flush` or every `commit_every` writes."""
+    shared = True
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, commit_every: int = 1000):
+        super().__init__(ttl)
+        self.commit_every = commit_every
+        self._pending = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS dedup (digest BLOB PRIMARY KEY, expires_at REAL NOT NULL) WITHOUT ROWID")
+        purged = self.conn.execute("DELETE FROM dedup WHERE expires_at <= ?", (time.time(),)).rowcount
+        self.conn.commit()
+        if purged:
+            logger.info(f"SQLiteDedupStore: purged {purged} expired digests.")
+
+    def check_and_add(self, digest: bytes) -> bool:
+        row = self.conn.execute("SELECT expires_at FROM dedup WHERE digest = ?", (digest,)).fetchone()
+        self.add(digest)
+        return row is not None and row[0] > time.time()
+
+    def contains(self, digest: bytes) -> bool:
+        row = self.conn.execute("SELECT expires_at FROM dedup WHERE digest = ?", (digest,)).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def add(self, digest: bytes):
+        self.conn.execute("INSERT OR REPLACE INTO dedup (digest, expires_at) VALUES (?, ?)", (digest, time.time() + self.ttl))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+
+    def iter_digests(self) -> Iterator[bytes]:
+        rows = self.conn.execute("SELECT digest FROM dedup WHERE expires_at > ?", (time.time(),))
+        return (bytes(row[0]) for row in rows)
+
+    def flush(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+class RedisDedupStore(DedupStore):
+    """
+    Store for any Redis-compatible client (redis-py or an in-process fake exposing
+    `set(name, value, ex=..., get=...)`, `exists(name)` and `scan_iter(match=...)`). Expiry is native Redis TTL.
+    """
+    shared = True
+
+    def __init__(self, client: Any, ttl: float = DEFAULT_TTL, prefix: str = "dedup:"):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix.encode("utf-8")
+
+    def _key(self, digest: bytes) -> bytes:
+        return self.prefix + digest
+
+    def check_and_add(self, digest: bytes) -> bool:
+        # SET ... GET writes and returns the previous value in a single round trip
+        return self.client.set(self._key(digest), 1, ex=int(self.ttl), get=True) is not None
+
+    def contains(self, digest: bytes) -> bool:
+        return bool(self.client.exists(self._key(digest)))
+
+    def add(self, digest: bytes):
+        self.client.set(self._key(digest), 1, ex=int(self.ttl))
+
+    def iter_digests(self) -> Iterator[bytes]:
+        offset = len(self.prefix)
+        return (key[offset:] for key in self.client.scan_iter(match=self.prefix + b"*"))
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close:
+            close()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over digests that are already uniformly distributed, so the
+    k probe positions are derived from the digest bytes by double hashing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        if len(digest) < 16:
+            digest = hashlib.sha256(digest).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, digest: bytes):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+
+def dedup_store_from_url(url: Optional[str] = None, ttl: float = DEFAULT_TTL) -> DedupStore:
+    """
+    Builds a store from a URL: "memory://" (default), "sqlite:///path/to/dedup.sqlite3"
+    or "redis://host:port/db".
+    """
+    url = url or "memory://"
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        return MemoryDedupStore(ttl)
+    if scheme == "sqlite":
+        return SQLiteDedupStore(url[len("sqlite://"):], ttl)
+    if scheme in ("redis", "rediss"):
+        import redis  # Only needed when a Redis store is configured
+        return RedisDedupStore(redis.Redis.from_url(url), ttl)
+    raise ValueError(f"Unsupported dedup store URL: {url}")
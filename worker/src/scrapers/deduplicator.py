@@ -1,37 +1,155 @@
-import hashlib
 import logging
-from typing import List, Dict, Any, Set
+import os
+from typing import List, Dict, Any, Optional
+
+from .dedup_store import DedupStore, BloomFilter, dedup_store_from_url, DEFAULT_TTL
+from .job_record import JobRecord, dedup_key
+from .near_dedup import NearDuplicateIndex, NearDuplicateMatch, choose_winner, summarize
 
 logger = logging.getLogger(__name__)
 
 class Deduplicator:
-    def __init__(self):
-        self.seen_hashes: Set[str] = set()
-        
-    def _generate_hash(self, job: Dict[str, Any]) -> str:
-        """Hashes (title + company + location) to detect duplicates."""
-        title = job.get("title", "").lower().strip()
-        company = job.get("company", "").lower().strip()
-        location = job.get("location", "").lower().strip()
-        
-        raw_string = f"{title}_{company}_{location}"
-        return hashlib.sha256(raw_string.encode('utf-8')).hexdigest()
+    """
+    Drops jobs already seen, in this run or (with a persistent store) in earlier ones.
+    An optional Bloom filter in front of the store answers most lookups for new jobs without a
+    store round trip. It is rebuilt from the store at the start of every run, so with a store
+    other workers write to, their digests count from the next run on; a posting they added
+    meanwhile may go downstream twice, which the sink's upsert on the stable id absorbs.
+    Jobs that pass the exact check are then matched against a MinHash/LSH index to catch the
+    same posting listed slightly differently on another source.
+    """
+
+    def __init__(self, store: Optional[DedupStore] = None, bloom_capacity: Optional[int] = None,
+                 near_threshold: Optional[float] = None, near_max_entries: Optional[int] = None):
+        self.store = store or dedup_store_from_url(
+            os.environ.get("DEDUP_STORE_URL"),
+            ttl=float(os.environ.get("DEDUP_TTL_DAYS") or DEFAULT_TTL / 86400) * 86400,
+        )
+        if bloom_capacity is None:
+            bloom_capacity = int(os.environ.get("DEDUP_BLOOM_CAPACITY") or 0)
+        self.bloom_capacity = bloom_capacity
+        self.bloom: Optional[BloomFilter] = None
+        self._warm_bloom()
+        if near_threshold is None:
+            near_threshold = float(os.environ.get("NEAR_DEDUP_THRESHOLD") or 0.8)
+        if near_max_entries is None:
+            near_max_entries = int(os.environ.get("NEAR_DEDUP_MAX_ENTRIES") or 100_000)
+        # A threshold of 0 disables near-duplicate detection
+        self.near_index: Optional[NearDuplicateIndex] = (
+            NearDuplicateIndex(near_threshold, max_entries=near_max_entries) if near_threshold else None
+        )
+        # Which record won each near-duplicate match of the current run and why
+        self.near_duplicate_report: List[Dict[str, Any]] = []
+
+    def _warm_bloom(self):
+        if not self.bloom_capacity:
+            return
+        # The filter only short-circuits lookups if it knows every digest in the store
+        self.bloom = BloomFilter(self.bloom_capacity)
+        for digest in self.store.iter_digests():
+            self.bloom.add(digest)
+
+    def start_run(self):
+        """
+        Starts a new run's near-duplicate report (the index itself carries over between runs)
+        and, in front of a store other workers write to, reloads the Bloom filter from it.
+        """
+        self.near_duplicate_report = []
+        if self.store.shared:
+            self._warm_bloom()
+
+    def _generate_hash(self, job: Dict[str, Any]) -> bytes:
+        """Hashes (title + company + location) into a compact 16-byte digest; records cache theirs."""
+        if isinstance(job, JobRecord):
+            return job.dedup_key
+        return dedup_key(job.get("title"), job.get("company"), job.get("location"))
+
+    def _is_new_exact(self, job: Dict[str, Any]) -> bool:
+        job_hash = self._generate_hash(job)
+        if self.bloom is not None:
+            if job_hash not in self.bloom:
+                # Definitely unseen: write without asking the store first
+                self.bloom.add(job_hash)
+                self.store.add(job_hash)
+                return True
+        return not self.store.check_and_add(job_hash)
+
+    def is_known(self, job: Dict[str, Any]) -> bool:
+        """Whether the exact job was seen before (unlike `is_new`, nothing is recorded)."""
+        job_hash = self._generate_hash(job)
+        if self.bloom is not None and job_hash not in self.bloom:
+            return False
+        return self.store.contains(job_hash)
+
+    def _report(self, match: NearDuplicateMatch, kept: Dict[str, Any], dropped: Dict[str, Any], reason: str):
+        self.near_duplicate_report.append({
+            "kept": summarize(kept),
+            "dropped": summarize(dropped),
+            "similarity": round(match.similarity, 3),
+            "reason": reason,
+        })
+
+    def is_new(self, job: Dict[str, Any]) -> bool:
+        """
+        Records the job and returns True the first time it is seen, False for duplicates.
+        Lets streaming consumers deduplicate incrementally, one job at a time. Since earlier
+        jobs have already been handed on, the first-seen record wins a near-duplicate match.
+        """
+        if not self._is_new_exact(job):
+            return False
+        if self.near_index is None:
+            return True
+        signature = self.near_index.signature(job)
+        match = self.near_index.query(job, signature)
+        if match is not None:
+            self._report(match, self.near_index.records[match.key], job, "first seen (already emitted)")
+            return False
+        self.near_index.add(job, signature)
+        return True
+
+    def flush(self):
+        self.store.flush()
 
     def process_and_deduplicate(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Removes duplicates from the given list of jobs.
+        Near-duplicates within the batch keep whichever record `choose_winner` prefers.
         Logs deduplication stats.
         """
         initial_count = len(jobs)
         unique_jobs = []
-        
+        positions: Dict[int, int] = {}  # near-index key -> position in unique_jobs
+        near_removed = 0
+
         for job in jobs:
-            job_hash = self._generate_hash(job)
-            if job_hash not in self.seen_hashes:
-                self.seen_hashes.add(job_hash)
+            if not self._is_new_exact(job):
+                continue
+            if self.near_index is None:
+                unique_jobs.append(job)
+                continue
+            signature = self.near_index.signature(job)
+            match = self.near_index.query(job, signature)
+            if match is None:
+                positions[self.near_index.add(job, signature)] = len(unique_jobs)
                 unique_jobs.append(job)
-                
+                continue
+            near_removed += 1
+            existing = self.near_index.records[match.key]
+            candidate_wins, reason = choose_winner(existing, job)
+            position = positions.get(match.key)
+            if candidate_wins and position is not None:
+                self._report(match, job, unique_jobs[position], reason)
+                unique_jobs[position] = job
+                self.near_index.replace(match.key, job)
+            else:
+                # Matches from earlier batches were already returned, so they stay the winner
+                self._report(match, existing, job, reason if position is not None else "first seen (earlier batch)")
+        self.flush()
+
         duplicates_removed = initial_count - len(unique_jobs)
-        logger.info(f"Deduplicator: processed {initial_count}, removed {duplicates_removed} duplicates, returned {len(unique_jobs)} unique.")
-        
+        logger.info(
+            f"Deduplicator: processed {initial_count}, removed {duplicates_removed} duplicates "
+            f"({near_removed} near-duplicates), returned {len(unique_jobs)} unique."
+        )
+
         return unique_jobs
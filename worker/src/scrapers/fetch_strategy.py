@@ -0,0 +1,88 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+STATIC = "static"
+RENDERED = "rendered"
+
+
+class FetchDecision(NamedTuple):
+    key: str
+    mode: str           # STATIC or RENDERED
+    decided_at: float
+    fallbacks: int      # Times plain HTTP came back without the expected content
+
+
+class FetchStrategyStore:
+    """
+    Remembers, per scraper and page (host + path, so every page of a paginated listing shares
+    one decision), whether plain HTTP returns the content or the page has to be rendered.
+    Pages decided STATIC are always fetched over HTTP first; pages decided RENDERED go straight
+    to the browser until `reprobe_interval` has passed, when plain HTTP gets another try.
+    State lives in SQLite (in memory unless a path is given) so it survives restarts.
+    """
+
+    def __init__(self, path: str = ":memory:", reprobe_interval: float = 24 * 3600):
+        self.reprobe_interval = reprobe_interval
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS decisions ("
+            " key TEXT PRIMARY KEY, mode TEXT NOT NULL, decided_at REAL NOT NULL, fallbacks INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def key(scraper: str, url: str) -> str:
+        parsed = urlparse(url)
+        return f"{scraper} {parsed.netloc}{parsed.path}"
+
+    def get(self, key: str) -> Optional[FetchDecision]:
+        row = self.conn.execute("SELECT key, mode, decided_at, fallbacks FROM decisions WHERE key = ?", (key,)).fetchone()
+        return FetchDecision(*row) if row else None
+
+    def should_probe(self, key: str, now: Optional[float] = None) -> bool:
+        """Whether to try plain HTTP first: always, unless the page recently turned out to need rendering."""
+        decision = self.get(key)
+        if decision is None or decision.mode == STATIC:
+            return True
+        now = time.time() if now is None else now
+        return decision.decided_at + self.reprobe_interval <= now
+
+    def record(self, key: str, mode: str, now: Optional[float] = None) -> FetchDecision:
+        now = time.time() if now is None else now
+        previous = self.get(key)
+        fallbacks = (previous.fallbacks if previous else 0) + (mode == RENDERED)
+        decision = FetchDecision(key, mode, now, fallbacks)
+        if previous is None or previous.mode != mode:
+            logger.info(f"FetchStrategy: {key} is fetched {mode} from now on.")
+        self.conn.execute("INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?)", decision)
+        self.conn.commit()
+        return decision
+
+    def decisions(self) -> List[FetchDecision]:
+        rows = self.conn.execute("SELECT key, mode, decided_at, fallbacks FROM decisions ORDER BY key").fetchall()
+        return [FetchDecision(*row) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+_store: Optional[FetchStrategyStore] = None
+
+
+def get_fetch_strategy() -> FetchStrategyStore:
+    """Process-wide store, persisted at FETCH_STRATEGY_PATH (in memory when unset)."""
+    global _store
+    if _store is None:
+        _store = FetchStrategyStore(
+            os.environ.get("FETCH_STRATEGY_PATH") or ":memory:",
+            reprobe_interval=float(os.environ.get("FETCH_REPROBE_INTERVAL") or 24 * 3600),
+        )
+    return _store
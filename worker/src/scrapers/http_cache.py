@@ -0,0 +1,127 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+MODE_DEFAULT = "default"        # Revalidate with If-None-Match / If-Modified-Since, serve 304s from cache
+MODE_CACHE_ONLY = "cache-only"  # Replay: never touch the network, serve whatever is cached
+
+
+class CacheEntry(NamedTuple):
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class HttpCache:
+    """
+    On-disk HTTP cache for `BaseScraper.fetch_html`, keyed by URL and backed by SQLite.
+    Stores bodies with their ETag / Last-Modified validators so unchanged pages can be
+    revalidated with a conditional request. Entries expire after `ttl` seconds and the
+    least recently used ones are evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_bytes: int = 200 * 1024 * 1024, mode: str = MODE_DEFAULT):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.mode = mode
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            " url TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT,"
+            " size INTEGER NOT NULL, stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS http_cache_last_access ON http_cache (last_access)")
+        self.conn.commit()
+
+    @property
+    def cache_only(self) -> bool:
+        return self.mode == MODE_CACHE_ONLY
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        row = self.conn.execute(
+            "SELECT url, body, etag, last_modified, stored_at FROM http_cache WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        # Replay mode serves stale entries too: there is no network to refresh them from
+        if not self.cache_only and time.time() - entry.stored_at > self.ttl:
+            self.conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            self.conn.commit()
+            return None
+        self.conn.execute("UPDATE http_cache SET last_access = ? WHERE url = ?", (time.time(), url))
+        self.conn.commit()
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidated(self, url: str):
+        """Marks an entry as fresh again after the server answered 304 Not Modified."""
+        now = time.time()
+        self.conn.execute("UPDATE http_cache SET stored_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+        self.conn.commit()
+
+    def store(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO http_cache (url, body, etag, last_modified, size, stored_at, last_access)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, body, etag, last_modified, len(body.encode("utf-8")), now, now),
+        )
+        self._evict(now)
+        self.conn.commit()
+
+    def _evict(self, now: float):
+        self.conn.execute("DELETE FROM http_cache WHERE stored_at < ?", (now - self.ttl,))
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for url, size in self.conn.execute("SELECT url, size FROM http_cache ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            total -= size
+            evicted += 1
+        logger.info(f"HttpCache: evicted {evicted} least recently used entries.")
+
+    def close(self):
+        self.conn.close()
+
+
+_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """
+    Returns the process-wide HttpCache, or None when caching is disabled.
+    Configured through SCRAPER_HTTP_CACHE_PATH (enables the cache), SCRAPER_HTTP_CACHE_MODE
+    ("default" or "cache-only"), SCRAPER_HTTP_CACHE_TTL (seconds) and SCRAPER_HTTP_CACHE_MAX_MB.
+    """
+    global _cache
+    path = os.environ.get("SCRAPER_HTTP_CACHE_PATH")
+    if not path:
+        return None
+    if _cache is None:
+        _cache = HttpCache(
+            path,
+            ttl=float(os.environ.get("SCRAPER_HTTP_CACHE_TTL") or 7 * 24 * 3600),
+            max_bytes=int(float(os.environ.get("SCRAPER_HTTP_CACHE_MAX_MB") or 200) * 1024 * 1024),
+            mode=os.environ.get("SCRAPER_HTTP_CACHE_MODE") or MODE_DEFAULT,
+        )
+    return _cache
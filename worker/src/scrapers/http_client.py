@@ -0,0 +1,220 @@
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import os
+import socket
+import contextlib
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class CachingDnsBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that resolves hostnames through a cache kept for `ttl` seconds and then
+    connects by address. TLS still uses the hostname (httpcore passes it separately for SNI and
+    certificate checks), so only the lookup is skipped. Addresses that all fail to connect
+    are dropped from the cache.
+    """
+
+    def __init__(self, ttl: float = 300.0, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        if _is_ip(host):
+            return [host]
+        now = time.monotonic()
+        cached = self._cache.get((host, port))
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[(host, port)] = (now + self.ttl, addresses)
+        return addresses
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None, local_address: Optional[str] = None,
+                          socket_options=None) -> httpcore.AsyncNetworkStream:
+        error: Optional[Exception] = None
+        for address in await self.resolve(host, port):
+            try:
+                return await self._backend.connect_tcp(address, port, timeout=timeout, local_address=local_address,
+                                                       socket_options=socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        self._cache.pop((host, port), None)
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                                  socket_options=None) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+# httpcore's errors as the httpx ones callers (and `retry_policy.classify_error`) expect
+_HTTPX_ERRORS = [
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+]
+
+
+@contextlib.contextmanager
+def _httpx_errors() -> Iterator[None]:
+    try:
+        yield
+    except Exception as e:
+        for core_error, httpx_error in _HTTPX_ERRORS:
+            if isinstance(e, core_error):
+                raise httpx_error(str(e)) from e
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _httpx_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self):
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an httpcore connection pool of our own, which httpx's built-in transport
+    doesn't take a network backend for: the pool connects through `network_backend` (the DNS
+    cache). Requests and responses are translated the way httpx does it for its own pool.
+    """
+
+    def __init__(self, limits: httpx.Limits, http2: bool, network_backend: httpcore.AsyncNetworkBackend):
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(scheme=request.url.raw_scheme, host=request.url.raw_host, port=request.url.port,
+                             target=request.url.raw_path),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _httpx_errors():
+            response = await self._pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._pool.aclose()
+
+
+class HttpClientManager:
+    """
+    One pooled httpx client shared by every scraper in the process, so connections (HTTP/2 where
+    the `h2` package is installed, keep-alive otherwise) and TLS sessions are reused across
+    scrapers and runs. Responses are decompressed from gzip, and brotli when `brotli` is installed.
+    `max_per_host` bounds the requests in flight to one host, see `host_slot`.
+    Like the browser pool, a client is bound to its event loop; a new loop gets a new client.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, keepalive_expiry: float = 60.0,
+                 max_per_host: int = 6, http2: Optional[bool] = None, dns_ttl: float = 300.0, timeout: float = 30.0):
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                                   keepalive_expiry=keepalive_expiry)
+        self.max_per_host = max_per_host
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self.timeout = timeout
+        self.dns = CachingDnsBackend(dns_ttl)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _new_client(self) -> httpx.AsyncClient:
+        transport = PooledTransport(self.limits, self.http2, self.dns)
+        logger.info(f"HttpClientManager: new client ({'HTTP/2' if self.http2 else 'HTTP/1.1'}).")
+        return httpx.AsyncClient(transport=transport, timeout=self.timeout)
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # A client from a finished loop can't be closed from this one; its connections go with it
+            self._client = self._new_client()
+            self._loop = loop
+            self._host_slots = {}
+        return self._client
+
+    def host_slot(self, host: str) -> asyncio.Semaphore:
+        """Semaphore bounding the requests in flight to `host` across all scrapers."""
+        self.client()
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
+    async def aclose(self):
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+        self._host_slots = {}
+
+
+_manager: Optional[HttpClientManager] = None
+
+
+def get_http_client_manager() -> HttpClientManager:
+    """Process-wide client manager, tuned by HTTP_MAX_CONNECTIONS, HTTP_MAX_PER_HOST, HTTP2, DNS_CACHE_TTL etc."""
+    global _manager
+    if _manager is None:
+        http2 = (os.environ.get("HTTP2") or "").lower()
+        _manager = HttpClientManager(
+            max_connections=int(os.environ.get("HTTP_MAX_CONNECTIONS") or 100),
+            max_keepalive=int(os.environ.get("HTTP_MAX_KEEPALIVE") or 20),
+            keepalive_expiry=float(os.environ.get("HTTP_KEEPALIVE_EXPIRY") or 60),
+            max_per_host=int(os.environ.get("HTTP_MAX_PER_HOST") or 6),
+            http2=None if not http2 else http2 in ("1", "true", "yes"),
+            dns_ttl=float(os.environ.get("DNS_CACHE_TTL") or 300),
+        )
+    return _manager
@@ -1,48 +1,55 @@
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, AsyncIterator
 from .base_scraper import BaseScraper
+from .parsing import make_soup, run_parser
 
 class IndeedScraper(BaseScraper):
     def __init__(self):
-        super().__init__(name="Indeed", source="Indeed", rate_limit=5.0)
+        super().__init__(name="Indeed", source="Indeed", rate_limit=5.0, expected_selector="div.job_seen_beacon h2.jobTitle")
 
-    async def fetch(self) -> Any:
+    def page_url(self, page: int) -> str:
+        # 10 results per page
+        return f"https://pt.indeed.com/jobs?q=internship+OR+trainee+OR+%22entry+level%22&l=Portugal&start={page * 10}"
+
+    async def fetch_pages(self) -> AsyncIterator[str]:
         # Indeed frequently blocks simple HTTP requests; Playwright JS rendering helps bypass basic blocks
-        url = "https://pt.indeed.com/jobs?q=internship+OR+trainee+OR+%22entry+level%22&l=Portugal"
-        html = await self.fetch_js_rendered_html(url)
-        return [html] if html else []
+        async for html in self.paginate(self.page_url, render=True):
+            yield html
 
     async def parse(self, raw_data: List[str]) -> List[Dict[str, Any]]:
-        jobs = []
-        for html in raw_data:
-            soup = BeautifulSoup(html, 'html.parser')
-            cards = soup.find_all("div", class_="job_seen_beacon")
-            for card in cards:
-                try:
-                    title_elem = card.find("h2", class_="jobTitle")
-                    if not title_elem:
-                        continue
-                        
-                    title = title_elem.get_text(strip=True)
-                    company_elem = card.find("span", {"data-testid": "company-name"})
-                    company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-                    
-                    location_elem = card.find("div", {"data-testid": "text-location"})
-                    location = location_elem.get_text(strip=True) if location_elem else "Portugal"
-                    
-                    url_elem = title_elem.find("a")
-                    url = "https://pt.indeed.com" + url_elem['href'] if url_elem and 'href' in url_elem.attrs else ""
-                    
-                    # Remove hidden visually-hidden text from Indeed titles
-                    title = title.replace("new", "").replace("nova", "").strip()
+        return await run_parser(parse_indeed_pages, raw_data, self.parser_backend)
 
-                    jobs.append({
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "url": url,
-                        "type": "Entry Level/Internship"
-                    })
-                except Exception as e:
+
+def parse_indeed_pages(raw_data: List[str], parser: str) -> List[Dict[str, Any]]:
+    jobs = []
+    for html in raw_data:
+        soup = make_soup(html, parser)
+        cards = soup.find_all("div", class_="job_seen_beacon")
+        for card in cards:
+            try:
+                title_elem = card.find("h2", class_="jobTitle")
+                if not title_elem:
                     continue
-        return jobs
+                    
+                title = title_elem.get_text(strip=True)
+                company_elem = card.find("span", {"data-testid": "company-name"})
+                company = company_elem.get_text(strip=True) if company_elem else "Unknown"
+                
+                location_elem = card.find("div", {"data-testid": "text-location"})
+                location = location_elem.get_text(strip=True) if location_elem else "Portugal"
+                
+                url_elem = title_elem.find("a")
+                url = "https://pt.indeed.com" + url_elem['href'] if url_elem and 'href' in url_elem.attrs else ""
+                
+                # Remove hidden visually-hidden text from Indeed titles
+                title = title.replace("new", "").replace("nova", "").strip()
+
+                jobs.append({
+                    "title": title,
+                    "company": company,
+                    "location": location,
+                    "url": url,
+                    "type": "Entry Level/Internship"
+                })
+            except Exception as e:
+                continue
+    return jobs
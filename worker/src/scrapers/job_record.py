@@ -0,0 +1,81 @@
+import hashlib
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+# The canonical schema, in order; see normalizer.normalize_job
+FIELDS = ("id", "title", "company", "location", "type", "source", "url", "posted_at", "fetched_at", "tags",
+          "fingerprint", "page_digest")
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # The same few sources, companies, places and types repeat across thousands of records
+    return sys.intern(value) if type(value) is str else value
+
+
+def dedup_key(title: Optional[str], company: Optional[str], location: Optional[str]) -> bytes:
+    """Hashes (title + company + location) into a compact 16-byte digest to detect duplicates."""
+    raw_string = f"{(title or '').lower().strip()}_{(company or '').lower().strip()}_{(location or '').lower().strip()}"
+    return hashlib.sha256(raw_string.encode("utf-8")).digest()[:16]
+
+
+class JobRecord(Mapping):
+    """
+    A normalized job. Slotted rather than a dict, with repeated strings interned, so that deep
+    crawls and corpora held in memory cost far less per record. It is also a read-only Mapping
+    over the schema fields, so consumers keep reading `job["id"]` or `job.get("title")` without
+    a copy; `to_dict` is for the JSON edges. `raw`, the scraped fields, is only set when retained
+    and is not part of the mapping.
+    """
+    __slots__ = FIELDS + ("raw", "_dedup_key")
+
+    def __init__(self, id: Optional[str] = None, title: str = "", company: str = "", location: str = "",
+                 type: str = "", source: str = "", url: str = "", posted_at: Optional[str] = None,
+                 fetched_at: Optional[str] = None, tags: Optional[List[str]] = None, fingerprint: Optional[str] = None,
+                 page_digest: Optional[str] = None, raw: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.title = title
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.type = _intern(type)
+        self.source = _intern(source)
+        self.url = url
+        self.posted_at = posted_at
+        self.fetched_at = fetched_at
+        self.tags = tags if tags is not None else []
+        self.fingerprint = fingerprint
+        self.page_digest = page_digest
+        self.raw = raw
+        self._dedup_key: Optional[bytes] = None
+
+    @classmethod
+    def from_dict(cls, job: Dict[str, Any]) -> "JobRecord":
+        """Rebuilds a record from `to_dict` output, e.g. jobs coming back from another worker."""
+        return cls(**{field: job[field] for field in FIELDS + ("raw",) if field in job})
+
+    @property
+    def dedup_key(self) -> bytes:
+        """The deduplicator's key, computed on first use and cached."""
+        if self._dedup_key is None:
+            self._dedup_key = dedup_key(self.title, self.company, self.location)
+        return self._dedup_key
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return f"JobRecord(id={self.id!r}, title={self.title!r}, company={self.company!r}, source={self.source!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        job = {field: getattr(self, field) for field in FIELDS}
+        if self.raw is not None:
+            job["raw"] = self.raw
+        return job
@@ -0,0 +1,200 @@
+import http.server
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock):
+        self.name = name
+        self.help = help_text
+        self._lock = lock
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def snapshot(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self.values)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(key)} {value}" for key, value in sorted(self.snapshot().items())]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self._lock = lock
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: (count per bucket, sum, count)
+        self.values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = _label_key(labels)
+        with self._lock:
+            counts, total, count = self.values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self.values[key] = (counts, total + value, count + 1)
+
+    def snapshot(self) -> Dict[LabelKey, Tuple[float, int]]:
+        """(sum, count) per label set, which is what run reports need."""
+        with self._lock:
+            return {key: (total, count) for key, (_, total, count) in self.values.items()}
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self.values.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', str(bound)))} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide, cumulative metrics, rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, Any] = {}
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self.metrics.setdefault(name, Counter(name, help_text, self._lock))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.metrics.setdefault(name, Histogram(name, help_text, self._lock, buckets))
+
+    def snapshot(self) -> Dict[str, Dict[LabelKey, Any]]:
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Writes the text format atomically, e.g. for node_exporter's textfile collector."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+FETCH_SECONDS = REGISTRY.histogram("scraper_fetch_seconds", "Latency of a single fetch attempt, by scraper and kind (static or rendered).")
+FETCH_BYTES = REGISTRY.counter("scraper_fetch_bytes_total", "Bytes of page content downloaded.")
+FETCH_RETRIES = REGISTRY.counter("scraper_fetch_retries_total", "Fetch attempts that were retried.")
+FETCH_ERRORS = REGISTRY.counter("scraper_fetch_errors_total", "Failed fetch attempts, by error and how it was classified (retryable, blocked or permanent).")
+FETCH_GIVE_UPS = REGISTRY.counter("scraper_fetch_give_ups_total", "Fetches abandoned, by reason (permanent, blocked, max_retries, retry_budget, circuit_open).")
+RATE_LIMIT_SLEEP = REGISTRY.counter("scraper_rate_limit_sleep_seconds_total", "Seconds spent waiting on the per-host rate limiter.")
+BACKOFF_SLEEP = REGISTRY.counter("scraper_backoff_sleep_seconds_total", "Seconds spent in retry backoff.")
+PARSE_SECONDS = REGISTRY.histogram("scraper_parse_seconds", "Duration of a parse call.")
+NORMALIZE_SECONDS = REGISTRY.histogram("scraper_normalize_seconds", "Duration of a normalize call.")
+JOBS_YIELDED = REGISTRY.counter("scraper_jobs_total", "Normalized jobs produced by a scraper.")
+PAGINATION_STOPS = REGISTRY.counter("scraper_pagination_stops_total", "Paginated crawls ended, by stop reason.")
+FETCH_STRATEGY = REGISTRY.counter("scraper_fetch_strategy_total", "Pages that may need JS, by how they were finally fetched (static or rendered).")
+RENDER_BLOCKED = REGISTRY.counter("scraper_render_blocked_requests_total", "Subrequests of rendered pages aborted by the resource policy, by resource type.")
+RENDER_ASSET_BYTES = REGISTRY.counter("scraper_render_asset_bytes_total", "Bytes of scripts and stylesheets downloaded for rendered pages.")
+RENDER_CACHE_BYTES_SAVED = REGISTRY.counter("scraper_render_cache_bytes_saved_total", "Bytes of scripts and stylesheets served from the browser's asset cache instead of the network.")
+DUPLICATES_DROPPED = REGISTRY.counter("scraper_duplicates_dropped_total", "Jobs dropped by the deduplicator.")
+RUNS_TRUNCATED = REGISTRY.counter("scraper_runs_truncated_total", "Scraper runs cut short by the run deadline or the scraper's time budget.")
+RUN_SECONDS = REGISTRY.histogram("orchestrator_run_seconds", "Duration of a full orchestrator run.", buckets=(10, 30, 60, 120, 300, 600, 1200))
+
+
+def run_report(before: Dict[str, Dict[LabelKey, Any]], after: Dict[str, Dict[LabelKey, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-scraper view of what changed between two registry snapshots, i.e. during one run.
+    Counters become totals, histograms become "<name>_sum" / "<name>_count".
+    """
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, values in after.items():
+        for key, value in values.items():
+            labels = dict(key)
+            scraper = labels.pop("scraper", "_orchestrator")
+            suffix = "".join(f".{labels[label]}" for label in sorted(labels))
+            previous = before.get(name, {}).get(key)
+            entry = report.setdefault(scraper, {})
+            if isinstance(value, tuple):
+                total, count = value
+                prev_total, prev_count = previous or (0.0, 0)
+                if count - prev_count:
+                    entry[f"{name}_sum{suffix}"] = round(total - prev_total, 4)
+                    entry[f"{name}_count{suffix}"] = count - prev_count
+            elif value - (previous or 0.0):
+                entry[f"{name}{suffix}"] = round(value - (previous or 0.0), 4)
+    return {scraper: entry for scraper, entry in report.items() if entry}
+
+
+def export_run(report: Dict[str, Any]):
+    """Writes the run report (JSON) and the Prometheus text file when SCRAPER_METRICS_DIR is set."""
+    directory = os.environ.get("SCRAPER_METRICS_DIR")
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "run_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    REGISTRY.write_prometheus(os.path.join(directory, "scraper_metrics.prom"))
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[http.server.ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: Optional[int] = None) -> Optional[http.server.ThreadingHTTPServer]:
+    """Serves /metrics in a background thread on `port` (or SCRAPER_METRICS_PORT). Idempotent."""
+    global _server
+    port = port or int(os.environ.get("SCRAPER_METRICS_PORT") or 0)
+    if _server is None and port:
+        _server = http.server.ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"Serving Prometheus metrics on port {port}.")
+    return _server
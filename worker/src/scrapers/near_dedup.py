@@ -0,0 +1,166 @@
+import hashlib
+import random
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+# Mersenne prime used for the universal hash family that simulates the permutations
+_PRIME = (1 << 61) - 1
+
+_LOCATION_ALIASES = {
+    "lisbon": "lisboa",
+    "oporto": "porto",
+}
+# Tokens that vary between sources without changing which posting it is
+_LOCATION_NOISE = {"portugal", "pt", "distrito", "district", "area", "metropolitana", "de", "do", "da", "region"}
+_TITLE_NOISE = {"new", "nova", "m", "f", "h", "w", "d", "x", "mf", "fm", "hm", "mwd", "the", "a", "o", "de", "do", "da", "em", "e", "and", "of", "for", "para"}
+_COMPANY_NOISE = {"lda", "sa", "s", "unipessoal", "inc", "ltd", "limited", "gmbh", "group", "grupo", "portugal", "pt"}
+_SOURCE_PRIORITY = {"Direct Company": 0, "LinkedIn": 1, "Indeed": 2, "SAPO Emprego": 3, "Expresso Emprego": 4}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _tokens(text: Optional[str], noise: Set[str], aliases: Optional[Dict[str, str]] = None) -> List[str]:
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    tokens = _NON_ALNUM.sub(" ", text).split()
+    if aliases:
+        tokens = [aliases.get(t, t) for t in tokens]
+    return [t for t in tokens if t not in noise]
+
+
+def shingles(job: Dict[str, Any], k: int = 3) -> Set[str]:
+    """
+    Normalized features of a job: character k-grams of the title plus whole-token company and
+    location features, after folding accents, city aliases and source-specific noise.
+    """
+    title = " ".join(_tokens(job.get("title"), _TITLE_NOISE))
+    features = {title[i:i + k] for i in range(max(1, len(title) - k + 1))}
+    features.update("c:" + t for t in _tokens(job.get("company"), _COMPANY_NOISE))
+    features.update("l:" + t for t in _tokens(job.get("location"), _LOCATION_NOISE, _LOCATION_ALIASES))
+    return features
+
+
+def _compatible(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """
+    Same title at two different employers (or cities) is two postings, however similar the text.
+    Companies and locations must share a token unless one side is unknown.
+    """
+    for field, noise, aliases in (("company", _COMPANY_NOISE | {"unknown"}, None), ("location", _LOCATION_NOISE, _LOCATION_ALIASES)):
+        tokens_a = set(_tokens(a.get(field), noise, aliases))
+        tokens_b = set(_tokens(b.get(field), noise, aliases))
+        if tokens_a and tokens_b and not tokens_a & tokens_b:
+            return False
+    return True
+
+
+class NearDuplicateMatch(NamedTuple):
+    key: int
+    similarity: float
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index of jobs. Each job's shingles are reduced to a MinHash signature that is
+    split into `bands` bands of `rows` rows; jobs sharing any band bucket become candidates and
+    only those are compared, so lookups stay sublinear in the size of the index. It holds at most
+    `max_entries` jobs; past that the oldest are forgotten, keeping a long-lived worker's memory flat.
+    """
+
+    def __init__(self, threshold: float = 0.8, bands: int = 16, rows: int = 4, seed: int = 1,
+                 max_entries: int = 100_000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        num_perm = bands * rows
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        self.signatures: Dict[int, Tuple[int, ...]] = {}
+        self.records: Dict[int, Dict[str, Any]] = {}
+        self._next_key = 0
+
+    def signature(self, job: Dict[str, Any]) -> Tuple[int, ...]:
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles(job)]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in zip(self._a, self._b))
+
+    def _bands(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity: the fraction of matching MinHash slots."""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def query(self, job: Dict[str, Any], signature: Optional[Tuple[int, ...]] = None) -> Optional[NearDuplicateMatch]:
+        """Returns the most similar indexed job at or above the threshold, if any."""
+        signature = signature or self.signature(job)
+        candidates = {key for band in self._bands(signature) for key in self.buckets.get(band, ())}
+        best = None
+        for key in candidates:
+            score = self.similarity(signature, self.signatures[key])
+            if score < self.threshold or (best is not None and score <= best.similarity):
+                continue
+            if _compatible(self.records[key], job):
+                best = NearDuplicateMatch(key, score)
+        return best
+
+    def add(self, job: Dict[str, Any], signature: Optional[Tuple[int, ...]] = None) -> int:
+        signature = signature or self.signature(job)
+        key = self._next_key
+        self._next_key += 1
+        self.signatures[key] = signature
+        self.records[key] = summarize(job)
+        for band in self._bands(signature):
+            self.buckets[band].append(key)
+        while len(self.signatures) > self.max_entries:
+            self._evict(next(iter(self.signatures)))
+        return key
+
+    def _evict(self, key: int):
+        signature = self.signatures.pop(key)
+        del self.records[key]
+        for band in self._bands(signature):
+            bucket = self.buckets[band]
+            bucket.remove(key)
+            if not bucket:
+                del self.buckets[band]
+
+    def replace(self, key: int, job: Dict[str, Any]):
+        """Swaps the record kept for `key` (the winner changed) without re-bucketing it."""
+        self.records[key] = summarize(job)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+
+def summarize(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: job.get(field) for field in ("source", "title", "company", "location", "url", "posted_at")}
+
+
+def _completeness(job: Dict[str, Any]) -> Tuple[int, int, int]:
+    return (
+        1 if job.get("posted_at") else 0,
+        1 if job.get("company") not in (None, "", "Unknown", "Unknown Company") else 0,
+        1 if job.get("location") not in (None, "", "Portugal") else 0,
+    )
+
+
+def choose_winner(existing: Dict[str, Any], candidate: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Decides which of two near-duplicates to keep. Returns (candidate_wins, reason).
+    Prefers the more complete record, then the source closest to the employer, then the first seen.
+    """
+    existing_score, candidate_score = _completeness(existing), _completeness(candidate)
+    if candidate_score != existing_score:
+        wins = candidate_score > existing_score
+        return wins, "more complete record (posted date, company, specific location)"
+    existing_rank = _SOURCE_PRIORITY.get(existing.get("source"), len(_SOURCE_PRIORITY))
+    candidate_rank = _SOURCE_PRIORITY.get(candidate.get("source"), len(_SOURCE_PRIORITY))
+    if candidate_rank != existing_rank:
+        return candidate_rank < existing_rank, "preferred source"
+    return False, "first seen"
@@ -1,22 +1,78 @@
 import uuid
+import hashlib
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
-def normalize_job(raw_job: Dict[str, Any]) -> Dict[str, Any]:
+from .job_record import JobRecord
+
+# Fixed namespace so the same posting always maps to the same job ID across runs and workers
+JOB_ID_NAMESPACE = uuid.UUID("6f1c2d0e-8a4b-5c7d-9e3f-2b1a0c9d8e7f")
+
+# Query parameters that track the click rather than identify the posting (compared lowercased)
+TRACKING_PARAMS = {
+    "trk", "trackingid", "refid", "position", "pagenum",  # LinkedIn
+    "bb", "xkcb", "tk", "from", "vjs", "fccid", "advn", "ad", "sjdu",  # Indeed
+    "gclid", "fbclid", "ref", "source",
+}
+
+# Fields that make up a posting's content; a change in any of them is a change worth emitting
+FINGERPRINT_FIELDS = ("title", "company", "location", "type", "url", "posted_at", "tags")
+
+
+def canonical_url(url: str) -> str:
+    """Lowercases scheme and host, drops fragments, tracking parameters and trailing slashes."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def job_id(job: Dict[str, Any]) -> str:
+    """
+    Deterministic ID from the source plus the canonical posting URL, falling back to the
+    title/company/location when a source gives no URL.
+    """
+    key = canonical_url(job.get("url", ""))
+    if not key:
+        key = "|".join(str(job.get(field, "")).lower().strip() for field in ("title", "company", "location"))
+    return str(uuid.uuid5(JOB_ID_NAMESPACE, f"{job.get('source', 'Unknown')}|{key}"))
+
+
+def content_fingerprint(job: Dict[str, Any]) -> str:
+    """Hash of the posting's content, ignoring per-run fields such as fetched_at."""
+    content = "\x1f".join(
+        canonical_url(job.get(field) or "") if field == "url" else repr(job.get(field))
+        for field in FINGERPRINT_FIELDS
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+def normalize_job(raw_job: Dict[str, Any], fetched_at: Optional[str] = None, keep_raw: bool = False) -> JobRecord:
     """
     Maps scraped fields to canonical schema:
-    {id, title, company, location, type, source, url, posted_at, fetched_at, tags, raw}
+    {id, title, company, location, type, source, url, posted_at, fetched_at, tags, fingerprint, page_digest}
+    The scraped page itself is not copied into each job; `page_digest` points at it in the page archive.
+    Callers normalizing a batch pass its single `fetched_at`; `keep_raw` retains the scraped fields.
     """
-    return {
-        "id": str(uuid.uuid4()),
-        "title": raw_job.get("title", "Unknown Title"),
-        "company": raw_job.get("company", "Unknown Company"),
-        "location": raw_job.get("location", "Portugal"),
-        "type": raw_job.get("type", "Full-Time"), # "Internship", "Trainee" etc
-        "source": raw_job.get("source", "Unknown"),
-        "url": raw_job.get("url", ""),
-        "posted_at": raw_job.get("posted_at", None),
-        "fetched_at": datetime.datetime.utcnow().isoformat(),
-        "tags": raw_job.get("tags", []),
-        "raw": raw_job  # Keep raw data for audit/debugging
-    }
+    job = JobRecord(
+        title=raw_job.get("title", "Unknown Title"),
+        company=raw_job.get("company", "Unknown Company"),
+        location=raw_job.get("location", "Portugal"),
+        type=raw_job.get("type", "Full-Time"), # "Internship", "Trainee" etc
+        source=raw_job.get("source", "Unknown"),
+        url=raw_job.get("url", ""),
+        posted_at=raw_job.get("posted_at", None),
+        fetched_at=fetched_at or datetime.datetime.utcnow().isoformat(),
+        tags=raw_job.get("tags", []),
+        page_digest=raw_job.get("page_digest"),  # Source page, for audit/debugging and reparsing
+        raw=raw_job if keep_raw else None,
+    )
+    job.id = job_id(job)
+    job.fingerprint = content_fingerprint(job)
+    return job
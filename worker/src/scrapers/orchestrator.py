@@ -1,58 +1,389 @@
 import asyncio
+import contextlib
 import logging
 import datetime
-from typing import List, Dict, Any
+import os
+import time
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Awaitable, Callable, NamedTuple, Optional, Sequence, Set
 
+from .browser_pool import close_browser_pool
+from .http_client import get_http_client_manager
+from .change_tracker import ChangeTracker, NEW, CHANGED, UNCHANGED
+from .metrics import REGISTRY, DUPLICATES_DROPPED, RUN_SECONDS, RUNS_TRUNCATED, run_report, export_run, start_metrics_server
 from .deduplicator import Deduplicator
-from .linkedin import LinkedInScraper
-from .indeed import IndeedScraper
-from .sapo import SapoScraper
-from .expresso import ExpressoScraper
-from .company_pages import CompanyPagesScraper
+from .job_record import JobRecord
+from .registry import ScraperRegistry
+from .retry_policy import get_retry_policy
+from .scheduling import SourceOutcome
+
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
-class ScraperOrchestrator:
+# Marks the end of one scraper's stream on the shared queue
+_DONE = object()
+
+# Near-duplicate matches listed in the run report; the count covers all of them
+NEAR_DUPLICATES_REPORTED = 100
+
+
+def parse_budgets(value: Optional[str]) -> Dict[str, float]:
+    """Per-scraper time budgets in seconds from "Indeed=300,CompanyPages=600"."""
+    budgets = {}
+    for entry in (value or "").split(","):
+        name, _, seconds = entry.partition("=")
+        if name.strip() and seconds.strip():
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+class ScraperRun(NamedTuple):
+    """How one scraper's stream went, as far as change tracking and scheduling need to know."""
+    name: str
+    source: str
+    targets: List[str]          # Targets covered by the run, empty for scrapers without targets
+    fetched_targets: List[str]
+    pages: int
+    blocks: int
+    listing_complete: bool
+    failed: bool
+    truncated: bool = False     # Stopped by the deadline or its time budget; what it scraped until then still counts
+    completed_targets: Sequence[str] = ()   # Targets whose whole listing was streamed
+    target_blocks: Optional[Dict[str, int]] = None   # `blocks` of the targets they hit
+
+    @classmethod
+    def of(cls, scraper: "BaseScraper", failed: bool, truncated: bool = False) -> "ScraperRun":
+        # A truncated listing proves nothing about the postings it didn't get to
+        return cls(scraper.name, scraper.source, sorted(scraper.selected_targets or scraper.targets()),
+                   sorted(scraper.fetched_targets), scraper.pages_streamed, scraper.blocks,
+                   scraper.listing_complete and not truncated, failed, truncated, sorted(scraper.completed_targets),
+                   dict(scraper.target_blocks))
+
+
+class _RunState:
+    """Counters of one run while its jobs are merged."""
+
     def __init__(self):
-        self.scrapers = [
-            LinkedInScraper(),
-            IndeedScraper(),
-            SapoScraper(),
-            ExpressoScraper(),
-            CompanyPagesScraper()
-        ]
+        self.counts = {NEW: 0, CHANGED: 0, UNCHANGED: 0}
+        self.seen: Dict[str, int] = {}
+        self.changed: Dict[str, int] = {}
+        self.emitted = 0
+        self.started_at = datetime.datetime.utcnow()
+        self.started = time.monotonic()
+        self.metrics_before = REGISTRY.snapshot()
+
+
+class ScraperOrchestrator:
+    def __init__(self, queue_size: int = 100, registry: Optional[ScraperRegistry] = None):
+        # Scrapers are created when a run first selects them, see `scraper`
+        self.registry = registry or ScraperRegistry()
+        # One pooled HTTP client for every scraper, kept open across runs; see `close`
+        self.http = get_http_client_manager()
+        # Failing fetches of one run share a retry budget, see retry_policy
+        self.retry_policy = get_retry_policy()
         self.deduplicator = Deduplicator()
-        
-    async def run_all(self) -> List[Dict[str, Any]]:
+        # Snapshot of previously emitted jobs; in memory unless CHANGE_SNAPSHOT_PATH is set
+        self.change_tracker = ChangeTracker(os.environ.get("CHANGE_SNAPSHOT_PATH") or ":memory:")
+        self.last_changes: Dict[str, Any] = {}
+        # Machine-readable summary of the latest run, see metrics.run_report
+        self.last_report: Dict[str, Any] = {}
+        # Per source of the latest scrape run, for the adaptive scheduler
+        self.last_outcomes: Dict[str, SourceOutcome] = {}
+        # Seconds a run may take (RUN_DEADLINE), and single scrapers within it (SCRAPER_BUDGETS); unbounded when unset
+        self.deadline = float(os.environ.get("RUN_DEADLINE") or 0) or None
+        self.budgets = parse_budgets(os.environ.get("SCRAPER_BUDGETS"))
+        start_metrics_server()
+        # Bounds how many scraped-but-unconsumed jobs can pile up when the consumer is slow
+        self.queue_size = queue_size
+        self.total_fetched = 0
+
+    def scraper(self, name: str) -> "BaseScraper":
+        """The scraper registered as `name`, instantiated on first use."""
+        scraper = self.registry.get(name)
+        scraper.http = self.http
+        return scraper
+
+    @property
+    def scrapers(self) -> List["BaseScraper"]:
+        """Every registered scraper, instantiating the ones not used yet."""
+        return [self.scraper(name) for name in self.registry.names()]
+
+    async def close(self):
+        """
+        Closes the shared HTTP client and the browser pool. Runs leave both open, so a long-lived
+        worker keeps one Chromium across runs; call this before the process (or its event loop) ends.
+        """
+        await self.http.aclose()
+        await close_browser_pool()
+
+    def units(self) -> List[str]:
+        """
+        Every independently runnable source: a scraper's name, or "<scraper>:<target>" for each
+        target of scrapers that have them (e.g. "CompanyPages:Feedzai").
+        """
+        units = []
+        for scraper in self.scrapers:
+            targets = scraper.targets()
+            if targets:
+                units.extend(f"{scraper.name}:{target}" for target in targets)
+            else:
+                units.append(scraper.name)
+        return units
+
+    def _select(self, sources: Optional[List[str]]) -> List["BaseScraper"]:
+        """The scrapers to run for a list of `units()` (all when None), with their targets selected."""
+        selected: Dict[str, Optional[Set[str]]] = {}
+        for unit in sources if sources is not None else self.registry.names():
+            name, _, target = unit.partition(":")
+            if name not in self.registry or (target and target not in self.scraper(name).targets()):
+                raise ValueError(f"Unknown source: {unit}")
+            if not target:
+                selected[name] = None
+            elif selected.get(name, set()) is not None:
+                # Naming the whole scraper as well wins over single targets
+                selected[name] = selected.get(name, set()) | {target}
+        for scraper in self.registry.loaded():
+            scraper.selected_targets = selected.get(scraper.name)
+        return [self.scraper(name) for name in selected]
+
+    @staticmethod
+    def _unit(scraper: "BaseScraper", job: JobRecord) -> str:
+        target = scraper.target_of(job)
+        return f"{scraper.name}:{target}" if target else scraper.name
+
+    def _outcomes(self, runs: List[ScraperRun], seen: Dict[str, int], changed: Dict[str, int]) -> Dict[str, SourceOutcome]:
+        outcomes = {}
+        for run in runs:
+            blocked = run.blocks > 0
+            if not run.targets:
+                nothing_fetched = run.failed or run.pages == 0
+                outcomes[run.name] = SourceOutcome(seen.get(run.name, 0), changed.get(run.name, 0), nothing_fetched, blocked)
+            for target in run.targets:
+                unit = f"{run.name}:{target}"
+                nothing_fetched = run.failed or target not in run.fetched_targets
+                # One company's careers page refusing us says nothing about the others in its batch
+                target_blocked = run.target_blocks.get(target, 0) > 0 if run.target_blocks is not None else blocked
+                outcomes[unit] = SourceOutcome(seen.get(unit, 0), changed.get(unit, 0), nothing_fetched, target_blocked)
+        return outcomes
+
+    def _run_deadline(self, deadline: Optional[float]) -> Optional[float]:
+        """The loop time by which a run started now must end, from `deadline` seconds or RUN_DEADLINE."""
+        seconds = deadline if deadline is not None else self.deadline
+        return asyncio.get_running_loop().time() + seconds if seconds else None
+
+    def _scraper_deadline(self, scraper: "BaseScraper", run_deadline: Optional[float]) -> Optional[float]:
+        budget = self.budgets.get(scraper.name)
+        if budget is None:
+            return run_deadline
+        budget_deadline = asyncio.get_running_loop().time() + budget
+        return budget_deadline if run_deadline is None else min(run_deadline, budget_deadline)
+
+    async def _scrape(self, scraper: "BaseScraper", deadline: Optional[float], reparse: bool,
+                      emit: Callable[[JobRecord], Awaitable[None]]) -> ScraperRun:
+        """
+        Hands one scraper's jobs to `emit` until it is done or `deadline` (loop time) passes. Out of
+        time, its fetches are cancelled (closing their browser pages) and the jobs emitted so far stand.
+        """
+        failed = truncated = False
+        timeout = asyncio.timeout_at(deadline)
+        try:
+            async with timeout:
+                async with contextlib.aclosing(scraper.stream(reparse=reparse)) as jobs:
+                    async for job in jobs:
+                        # A job already scraped isn't lost to the deadline while it waits for the consumer
+                        timeout.reschedule(None)
+                        await emit(job)
+                        timeout.reschedule(deadline)
+        except Exception as e:
+            if isinstance(e, TimeoutError) and timeout.expired():
+                truncated = True
+                RUNS_TRUNCATED.inc(scraper=scraper.name)
+                logger.warning(f"Scraper {scraper.name} ran out of time after {scraper.pages_streamed} pages, "
+                               f"keeping the jobs scraped so far.")
+            else:
+                failed = True
+                logger.error(f"Scraper {scraper.name} failed with error: {e}")
+        return ScraperRun.of(scraper, failed, truncated)
+
+    async def _produce(self, scraper: "BaseScraper", queue: asyncio.Queue, runs: List[ScraperRun],
+                       deadline: Optional[float], reparse: bool = False):
+        async def emit(job: JobRecord):
+            await queue.put((scraper, job))
+
+        runs.append(await self._scrape(scraper, deadline, reparse, emit))
+        # Not in a `finally`: a cancelled producer must not block on a full queue
+        await queue.put(_DONE)
+
+    def _start_run(self) -> _RunState:
+        self.total_fetched = 0
+        self.deduplicator.start_run()
+        return _RunState()
+
+    def _accept(self, state: _RunState, scraper: "BaseScraper", job: JobRecord) -> bool:
+        """Dedups and change-tracks one scraped job; returns whether it goes downstream."""
+        self.total_fetched += 1
+        # Deduplicate jobs by title+company+location; always consulted so the dedup store stays current
+        is_new = self.deduplicator.is_new(job)
+        status = self.change_tracker.observe(job, scraper.target_of(job))
+        state.counts[status] += 1
+        unit = self._unit(scraper, job)
+        state.seen[unit] = state.seen.get(unit, 0) + 1
+        if status != UNCHANGED:
+            state.changed[unit] = state.changed.get(unit, 0) + 1
+        if not is_new:
+            DUPLICATES_DROPPED.inc(scraper=scraper.name)
+        # A changed posting is an update to a job already downstream (same stable id), so it
+        # goes out even though the deduplicator has seen it before
+        if status == CHANGED or (status == NEW and is_new):
+            state.emitted += 1
+            return True
+        return False
+
+    def _finish_run(self, state: _RunState, runs: List[ScraperRun], reparse: bool, sources: Optional[List[str]],
+                    scraper_metrics: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.deduplicator.flush()
+        completed = [run.source for run in runs if run.listing_complete and not run.failed]
+        # Runs over some targets (e.g. one batch of companies) still complete the targets they streamed
+        completed_targets = [(run.source, target) for run in runs if not run.failed for target in run.completed_targets]
+        disappeared = self.change_tracker.finish(completed, completed_targets)
+        self.last_changes = {**state.counts, "disappeared": disappeared}
+        if not reparse:
+            self.last_outcomes = self._outcomes(runs, state.seen, state.changed)
+        duration = time.monotonic() - state.started
+        RUN_SECONDS.observe(duration)
+        self.last_report = {
+            "started_at": state.started_at.isoformat(),
+            "mode": "reparse" if reparse else "scrape",
+            "sources": sources,
+            "duration_s": round(duration, 3),
+            "total_fetched": self.total_fetched,
+            "emitted": state.emitted,
+            "changes": {**state.counts, "disappeared": len(disappeared)},
+            "near_duplicates": len(self.deduplicator.near_duplicate_report),
+            # Which record won each match and why
+            "near_duplicate_matches": self.deduplicator.near_duplicate_report[:NEAR_DUPLICATES_REPORTED],
+            # Sources cut short by the deadline or their budget, whose results are partial
+            "truncated": sorted(run.name for run in runs if run.truncated),
+            "scrapers": scraper_metrics if scraper_metrics is not None else run_report(state.metrics_before, REGISTRY.snapshot()),
+        }
+        export_run(self.last_report)
+
+    async def stream_all(self, reparse: bool = False, sources: Optional[List[str]] = None,
+                         deadline: Optional[float] = None) -> AsyncIterator[JobRecord]:
+        """
+        Runs all scrapers concurrently and yields unique jobs as soon as any scraper produces
+        them, deduplicating incrementally instead of waiting for every scraper to finish.
+        Only jobs that are new or changed since the previous snapshot are yielded.
+        With `reparse`, scrapers parse their archived pages instead of fetching, so a selector
+        fix is backfilled without touching the network.
+        `sources` restricts the run to some of `units()`, e.g. the ones the scheduler says are due.
+        Scraping stops after `deadline` seconds (RUN_DEADLINE by default), or a scraper's budget
+        (SCRAPER_BUDGETS); jobs scraped until then are still yielded, see `last_report["truncated"]`.
+        """
+        scrapers = self._select(sources)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        runs: List[ScraperRun] = []
+        state = self._start_run()
+        self.retry_policy.start_run()
+        run_deadline = self._run_deadline(deadline)
+        for scraper in scrapers:
+            scraper.is_known = self.deduplicator.is_known
+        producers = [asyncio.ensure_future(self._produce(scraper, queue, runs, self._scraper_deadline(scraper, run_deadline), reparse))
+                     for scraper in scrapers]
+        remaining = len(producers)
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                scraper, job = item
+                if self._accept(state, scraper, job):
+                    yield job
+        finally:
+            # The consumer may stop early; cancel whatever is still scraping
+            for producer in producers:
+                producer.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+            self._finish_run(state, runs, reparse, sources)
+
+    async def collect(self, sources: Optional[List[str]] = None, reparse: bool = False,
+                      deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Scrapes without deduplicating, for a distributed run where another process merges the
+        results (see `merge` and src.tasks). Returns one JSON-serializable result per scraper:
+        {"scraper", "run" (ScraperRun fields), "jobs", "metrics" (this process' run_report)}.
+        `deadline` and budgets bound the scraping as in `stream_all`.
+        """
+        scrapers = self._select(sources)
+        before = REGISTRY.snapshot()
+        # Pagination asks the deduplicator what is known; let it catch up with the other workers' merges
+        self.deduplicator.start_run()
+        self.retry_policy.start_run()
+        run_deadline = self._run_deadline(deadline)
+
+        async def scrape(scraper: "BaseScraper") -> Dict[str, Any]:
+            scraper.is_known = self.deduplicator.is_known
+            jobs: List[Dict[str, Any]] = []
+
+            async def keep(job: JobRecord):
+                # Plain dicts: results travel between workers as JSON
+                jobs.append(job.to_dict())
+
+            run = await self._scrape(scraper, self._scraper_deadline(scraper, run_deadline), reparse, keep)
+            return {"scraper": scraper.name, "run": run._asdict(), "jobs": jobs}
+
+        results = await asyncio.gather(*(scrape(scraper) for scraper in scrapers))
+        metrics = run_report(before, REGISTRY.snapshot())
+        for result in results:
+            result["metrics"] = metrics.get(result["scraper"], {})
+        return results
+
+    async def merge(self, results: List[Dict[str, Any]], reparse: bool = False,
+                    sources: Optional[List[str]] = None) -> AsyncIterator[JobRecord]:
+        """
+        Dedups and change-tracks the output of `collect` calls (possibly made on other workers),
+        yielding what `stream_all` would have yielded for the same scrape.
+        """
+        runs: List[ScraperRun] = []
+        state = self._start_run()
+        try:
+            for result in results:
+                runs.append(ScraperRun(**result["run"]))
+                scraper = self.scraper(result["scraper"])
+                for job in map(JobRecord.from_dict, result["jobs"]):
+                    if self._accept(state, scraper, job):
+                        yield job
+        finally:
+            # A scraper's targets may have been collected in several batches: add their metrics up
+            metrics: Dict[str, Dict[str, Any]] = {}
+            for result in results:
+                totals = metrics.setdefault(result["scraper"], {})
+                for key, value in (result.get("metrics") or {}).items():
+                    totals[key] = round(totals.get(key, 0) + value, 4)
+            metrics = {scraper: totals for scraper, totals in metrics.items() if totals}
+            self._finish_run(state, runs, reparse, sources, metrics)
+
+    async def run_all(self, reparse: bool = False, sources: Optional[List[str]] = None,
+                      deadline: Optional[float] = None) -> List[JobRecord]:
         start_time = datetime.datetime.utcnow()
         logger.info(f"Orchestrator started at {start_time.isoformat()}")
-        
-        # Run all scrapers concurrently
-        results = await asyncio.gather(
-            *(scraper.run() for scraper in self.scrapers),
-            return_exceptions=True
-        )
-        
-        all_jobs = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Scraper {self.scrapers[i].name} failed with error: {result}")
-            else:
-                all_jobs.extend(result)
-                
-        total_fetched = len(all_jobs)
-        
-        # Deduplicate jobs by title+company+location
-        unique_jobs = self.deduplicator.process_and_deduplicate(all_jobs)
-        
+
+        unique_jobs = [job async for job in self.stream_all(reparse, sources, deadline)]
+        total_fetched = self.total_fetched
+
         end_time = datetime.datetime.utcnow()
         duration = (end_time - start_time).total_seconds()
         
         logger.info(
             f"Orchestrator finished in {duration:.2f} seconds.\n"
             f"Total fetched: {total_fetched}\n"
-            f"Duplicates removed: {total_fetched - len(unique_jobs)}\n"
-            f"New candidates to insert: {len(unique_jobs)}"
+            f"Duplicates or unchanged removed: {total_fetched - len(unique_jobs)}\n"
+            f"Changes: {self.last_changes[NEW]} new, {self.last_changes[CHANGED]} changed, "
+            f"{self.last_changes[UNCHANGED]} unchanged, {len(self.last_changes['disappeared'])} disappeared\n"
+            f"New candidates to insert: {len(unique_jobs)}\n"
+            f"Truncated by the deadline: {', '.join(self.last_report['truncated']) or 'none'}"
         )
         
         return unique_jobs
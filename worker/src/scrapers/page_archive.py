@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from typing import List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard  # Optional: better ratio and much faster than gzip on HTML
+except ImportError:
+    zstandard = None
+
+CODEC_ZSTD = "zst"
+CODEC_GZIP = "gz"
+
+
+class ArchivedPage(NamedTuple):
+    digest: str
+    scraper: str
+    source: str
+    url: str
+    rendered: bool
+    fetched_at: float
+
+
+def page_digest(html: str) -> str:
+    """Content address of a page: the same HTML always maps to the same archive object."""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class PageArchive:
+    """
+    Compressed, content-addressed archive of fetched pages. Each distinct page body is stored
+    once under <root>/objects/<digest[:2]>/<digest>.<codec>; a SQLite manifest records every
+    fetch (scraper, source, URL, rendered or not, fetch time) pointing at its object. Jobs keep
+    only the `page_digest`, and `latest_pages` lets a scraper reparse what it last fetched.
+    """
+
+    def __init__(self, root: str, codec: Optional[str] = None):
+        self.root = root
+        self.codec = codec or (CODEC_ZSTD if zstandard else CODEC_GZIP)
+        if self.codec == CODEC_ZSTD and zstandard is None:
+            logger.warning("zstandard is not installed, archiving pages with gzip instead.")
+            self.codec = CODEC_GZIP
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "manifest.sqlite3"))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fetches ("
+            " digest TEXT NOT NULL, scraper TEXT NOT NULL, source TEXT NOT NULL, url TEXT NOT NULL,"
+            " rendered INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS fetches_scraper_url ON fetches (scraper, url, rendered, fetched_at)")
+        self.conn.commit()
+
+    def _object_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.{codec}")
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == CODEC_ZSTD:
+            return zstandard.ZstdCompressor(level=9).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def put(self, scraper: str, source: str, url: str, html: str, rendered: bool) -> str:
+        """Archives one fetch and returns the page digest. Bodies already in the archive are not rewritten."""
+        digest = page_digest(html)
+        if not self.has(digest):
+            path = self._object_path(digest, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self._compress(html.encode("utf-8")))
+            os.replace(tmp_path, path)
+        self.conn.execute(
+            "INSERT INTO fetches (digest, scraper, source, url, rendered, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, scraper, source, url, int(rendered), time.time()),
+        )
+        self.conn.commit()
+        return digest
+
+    def has(self, digest: str) -> bool:
+        return any(os.path.exists(self._object_path(digest, codec)) for codec in (CODEC_ZSTD, CODEC_GZIP))
+
+    def get(self, digest: str) -> Optional[str]:
+        path = self._object_path(digest, CODEC_ZSTD)
+        if os.path.exists(path):
+            if zstandard is None:
+                raise RuntimeError(f"Archived page {digest} is zstd-compressed but zstandard is not installed.")
+            with open(path, "rb") as f:
+                return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+        path = self._object_path(digest, CODEC_GZIP)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return gzip.decompress(f.read()).decode("utf-8")
+        return None
+
+    def latest_pages(self, scraper: str) -> List[ArchivedPage]:
+        """The most recent fetch of each URL (static and rendered separately) archived for a scraper."""
+        rows = self.conn.execute(
+            "SELECT digest, scraper, source, url, rendered, MAX(fetched_at) FROM fetches"
+            " WHERE scraper = ? GROUP BY url, rendered ORDER BY url",
+            (scraper,),
+        ).fetchall()
+        return [ArchivedPage(digest, scraper_name, source, url, bool(rendered), fetched_at)
+                for digest, scraper_name, source, url, rendered, fetched_at in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+_archive: Optional[PageArchive] = None
+
+
+def set_page_archive(archive: Optional[PageArchive]):
+    global _archive
+    _archive = archive
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """Process-wide archive, set explicitly or through SCRAPER_PAGE_ARCHIVE (disabled when unset)."""
+    global _archive
+    if _archive is None and os.environ.get("SCRAPER_PAGE_ARCHIVE"):
+        _archive = PageArchive(os.environ["SCRAPER_PAGE_ARCHIVE"], os.environ.get("SCRAPER_PAGE_ARCHIVE_CODEC") or None)
+    return _archive
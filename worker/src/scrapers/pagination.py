@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, AsyncIterator, Set
+
+from .metrics import PAGINATION_STOPS
+
+logger = logging.getLogger(__name__)
+
+STOP_FETCH_FAILED = "fetch failed"
+STOP_EMPTY = "empty page"
+STOP_EMPTY_FIRST = "empty first page"
+STOP_ALL_KNOWN = "all known"
+STOP_MAX_DEPTH = "max depth"
+
+
+class Paginator:
+    """
+    Walks numbered result pages (0, 1, 2, ...) until a page fails to fetch, parses to no jobs,
+    contains only jobs already known, or `max_pages` is reached. Up to `prefetch` pages beyond
+    the one being parsed are fetched concurrently, so the network stays busy while parsing.
+
+    The consumer reports each page's jobs through `observe` before asking for the next page;
+    a page is "all known" when every job on it was on an earlier page of this crawl or
+    `is_known` says so (the dedup store), i.e. the crawl has caught up with the previous run.
+    Only an empty page after one with jobs is the end of the listing: an empty first page is
+    as likely a block page or changed markup as a search with no results.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[str], Awaitable[Optional[str]]], page_url: Callable[[int], str],
+                 max_pages: int, prefetch: int = 1, is_known: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        self.name = name
+        self.fetch = fetch
+        self.page_url = page_url
+        self.max_pages = max_pages
+        self.prefetch = prefetch
+        self.is_known = is_known
+        self.seen_ids: Set[str] = set()
+        self.pages_fetched = 0
+        self.pages_with_jobs = 0
+        self.stop_reason: Optional[str] = None
+
+    def observe(self, jobs: List[Dict[str, Any]]):
+        """Reports the normalized jobs of the page just yielded, which may end the crawl."""
+        if not jobs:
+            self.stop_reason = STOP_EMPTY if self.pages_with_jobs else STOP_EMPTY_FIRST
+            return
+        self.pages_with_jobs += 1
+        unseen = [job for job in jobs if job["id"] not in self.seen_ids and not (self.is_known and self.is_known(job))]
+        self.seen_ids.update(job["id"] for job in jobs)
+        if not unseen:
+            self.stop_reason = STOP_ALL_KNOWN
+
+    async def pages(self) -> AsyncIterator[str]:
+        tasks: Dict[int, asyncio.Future] = {}
+        scheduled = 0
+        try:
+            for number in range(self.max_pages):
+                while scheduled < min(number + 1 + self.prefetch, self.max_pages):
+                    tasks[scheduled] = asyncio.ensure_future(self.fetch(self.page_url(scheduled)))
+                    scheduled += 1
+                html = await tasks.pop(number)
+                if html is None:
+                    self.stop_reason = STOP_FETCH_FAILED
+                    break
+                self.pages_fetched += 1
+                yield html
+                if self.stop_reason:
+                    break
+            else:
+                self.stop_reason = STOP_MAX_DEPTH
+        finally:
+            # Pages fetched ahead of a stop are not needed
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            if self.stop_reason:
+                PAGINATION_STOPS.inc(scraper=self.name, reason=self.stop_reason)
+                logger.info(f"[{self.name}] Pagination stopped after {self.pages_fetched} pages: {self.stop_reason}.")
@@ -0,0 +1,93 @@
+import asyncio
+import concurrent.futures
+import functools
+import importlib.util
+import logging
+import multiprocessing
+import os
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup tree builders we allow scrapers to pick from; lxml is the fast C-backed one
+PARSER_BACKENDS = ("lxml", "html.parser")
+DEFAULT_PARSER = "lxml"
+
+EXECUTOR_PROCESS = "process"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_INLINE = "inline"
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_parser(backend: str) -> str:
+    """Returns the backend to use, falling back to the stdlib parser if lxml is not installed."""
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, expected one of {PARSER_BACKENDS}")
+    if backend == "lxml" and importlib.util.find_spec("lxml") is None:
+        logger.warning("lxml is not installed, falling back to html.parser.")
+        return "html.parser"
+    return backend
+
+
+def make_soup(html: str, backend: str = DEFAULT_PARSER) -> "BeautifulSoup":
+    # Imported on first parse, which is usually in a parser process rather than the one scheduling fetches
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, resolve_parser(backend))
+
+
+def matches_selector(html: str, selector: str, backend: str = DEFAULT_PARSER) -> bool:
+    """Whether a page has an element matching the CSS `selector`; run it through `run_parser`."""
+    return make_soup(html, backend).select_one(selector) is not None
+
+
+_executor: Optional[concurrent.futures.Executor] = None
+
+
+def _executor_kind() -> str:
+    kind = os.environ.get("SCRAPER_PARSE_EXECUTOR") or EXECUTOR_PROCESS
+    # Celery prefork children are daemonic and may not spawn their own processes
+    if kind == EXECUTOR_PROCESS and multiprocessing.current_process().daemon:
+        return EXECUTOR_THREAD
+    return kind
+
+
+def get_parse_executor() -> Optional[concurrent.futures.Executor]:
+    """
+    Returns the process-wide executor used for parsing, or None to parse inline.
+    Configured through SCRAPER_PARSE_EXECUTOR ("process", "thread" or "inline") and
+    SCRAPER_PARSE_WORKERS (defaults to the number of CPUs).
+    """
+    global _executor
+    kind = _executor_kind()
+    if kind == EXECUTOR_INLINE:
+        return None
+    if _executor is None:
+        workers = int(os.environ.get("SCRAPER_PARSE_WORKERS") or os.cpu_count() or 1)
+        if kind == EXECUTOR_THREAD:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+        else:
+            _executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        logger.info(f"Parsing with a {kind} pool of {workers} workers.")
+    return _executor
+
+
+async def run_parser(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs a CPU-bound parse function off the event loop.
+    `fn` must be a module-level function and its arguments picklable when a process pool is used.
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return fn(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, fn, *args)
+
+
+def shutdown_parse_executor():
+    global _executor
+    if _executor is not None:
+        executor, _executor = _executor, None
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,134 @@
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header (delta-seconds or HTTP-date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    """
+    Token bucket for a single host. Refills at `rate` tokens per second up to `burst`.
+    Callers reserve a token up front and are told how long to wait for it, so concurrent
+    callers queue up fairly without holding a lock across the sleep.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate or rate / 8
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if now <= self.updated:
+            return
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Takes one token and returns how many seconds the caller must wait before using it."""
+        now = time.monotonic()
+        # While a host is blocked (Retry-After), no tokens accrue
+        start = max(now, self.blocked_until)
+        self._refill(start)
+        self.tokens -= 1
+        wait = start - now
+        if self.tokens < 0:
+            wait += -self.tokens / self.rate
+        return wait
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Slows the host down after a 429: halves the rate and honors Retry-After."""
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            self.updated = self.blocked_until
+
+    def record_success(self):
+        """Lets a penalized host gradually recover towards its configured rate."""
+        if self.rate < self.base_rate:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = min(self.base_rate, self.rate * 1.25)
+
+
+class HostRateLimiter:
+    """
+    Rate limiter shared by every scraper in the process, with one token bucket per host.
+    Hosts are configured by the first scraper that uses them; when several sources hit
+    the same host the most conservative limit wins.
+    """
+
+    def __init__(self, default_rate: float = 0.5, default_burst: int = 1, jitter: float = 1.0):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.jitter = jitter
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def configure(self, host: str, rate: Optional[float] = None, burst: Optional[int] = None):
+        rate = rate or self.default_rate
+        burst = burst or self.default_burst
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            self.buckets[host] = TokenBucket(rate, burst)
+        elif rate < bucket.base_rate or burst < bucket.burst:
+            bucket.base_rate = min(bucket.base_rate, rate)
+            bucket.rate = min(bucket.rate, bucket.base_rate)
+            bucket.burst = min(bucket.burst, burst)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            self.configure(host)
+        return self.buckets[host]
+
+    async def acquire(self, host: str) -> float:
+        """Waits until a request to `host` is allowed. Returns the seconds spent waiting."""
+        wait = self._bucket(host).reserve()
+        if wait <= 0:
+            return 0.0
+        # Only add jitter when we actually have to wait, so the first requests go out immediately
+        wait += random.uniform(0, self.jitter)
+        await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, host: str, retry_after: Optional[float] = None):
+        logger.warning(f"RateLimiter: slowing down {host} (Retry-After: {retry_after}).")
+        self._bucket(host).penalize(retry_after)
+
+    def record_success(self, host: str):
+        self._bucket(host).record_success()
+
+
+_limiter: Optional[HostRateLimiter] = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Returns the process-wide HostRateLimiter."""
+    global _limiter
+    if _limiter is None:
+        _limiter = HostRateLimiter()
+    return _limiter
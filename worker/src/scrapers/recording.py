@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+
+class PageCorpus:
+    """
+    Versioned on-disk corpus of fetched pages, one directory per scraper:
+    <root>/<scraper>/manifest.json maps "static|url" / "rendered|url" keys to page files.
+    The root usually ends in a version directory (e.g. fixtures/corpus/v1) so markup
+    changes on a site can be captured as a new corpus without losing the old one.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._manifests: Dict[str, Dict[str, Dict[str, str]]] = {}
+
+    @staticmethod
+    def _key(url: str, rendered: bool) -> str:
+        return f"{'rendered' if rendered else 'static'}|{url}"
+
+    def _manifest(self, scraper: str) -> Dict[str, Dict[str, str]]:
+        if scraper not in self._manifests:
+            path = os.path.join(self.root, scraper, MANIFEST)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self._manifests[scraper] = json.load(f)
+            else:
+                self._manifests[scraper] = {}
+        return self._manifests[scraper]
+
+    def scrapers(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.exists(os.path.join(self.root, name, MANIFEST)))
+
+    def load(self, scraper: str, url: str, rendered: bool) -> Optional[str]:
+        entry = self._manifest(scraper).get(self._key(url, rendered))
+        if entry is None:
+            return None
+        with open(os.path.join(self.root, scraper, entry["file"]), encoding="utf-8") as f:
+            return f.read()
+
+    def save(self, scraper: str, url: str, rendered: bool, html: str):
+        directory = os.path.join(self.root, scraper)
+        os.makedirs(directory, exist_ok=True)
+        key = self._key(url, rendered)
+        filename = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] + ".html"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            f.write(html)
+        manifest = self._manifest(scraper)
+        manifest[key] = {"file": filename, "url": url, "rendered": rendered}
+        with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+class PageRecorder:
+    """Saves every page a scraper fetches into a corpus."""
+
+    def __init__(self, corpus: PageCorpus):
+        self.corpus = corpus
+
+    def record(self, scraper: str, url: str, html: str, rendered: bool):
+        self.corpus.save(scraper, url, rendered, html)
+
+
+class ReplayTransport:
+    """
+    Serves pages from a corpus instead of the network. Plugs into `BaseScraper.fetch_html`
+    and `fetch_js_rendered_html`; URLs missing from the corpus come back as None, as a
+    failed fetch would.
+    """
+
+    def __init__(self, corpus: PageCorpus):
+        self.corpus = corpus
+
+    def fetch(self, scraper: str, url: str, rendered: bool) -> Optional[str]:
+        html = self.corpus.load(scraper, url, rendered)
+        if html is None:
+            logger.warning(f"[{scraper}] Replay corpus has no {'rendered' if rendered else 'static'} copy of {url}.")
+        return html
+
+
+_recorder: Optional[PageRecorder] = None
+_replay: Optional[ReplayTransport] = None
+
+
+def set_page_recorder(recorder: Optional[PageRecorder]):
+    global _recorder
+    _recorder = recorder
+
+
+def set_replay_transport(transport: Optional[ReplayTransport]):
+    global _replay
+    _replay = transport
+
+
+def get_page_recorder() -> Optional[PageRecorder]:
+    """Process-wide recorder, set explicitly or through SCRAPER_RECORD_CORPUS."""
+    global _recorder
+    if _recorder is None and os.environ.get("SCRAPER_RECORD_CORPUS"):
+        _recorder = PageRecorder(PageCorpus(os.environ["SCRAPER_RECORD_CORPUS"]))
+    return _recorder
+
+
+def get_replay_transport() -> Optional[ReplayTransport]:
+    """Process-wide replay transport, set explicitly or through SCRAPER_REPLAY_CORPUS."""
+    global _replay
+    if _replay is None and os.environ.get("SCRAPER_REPLAY_CORPUS"):
+        _replay = ReplayTransport(PageCorpus(os.environ["SCRAPER_REPLAY_CORPUS"]))
+    return _replay
@@ -0,0 +1,73 @@
+import importlib
+import logging
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+# Built-in scrapers by name, as "module:Class" (modules relative to this package). A scraper's
+# module, and what it pulls in, is only imported once the scraper is first used
+BUILTIN_SCRAPERS = {
+    "LinkedIn": ".linkedin:LinkedInScraper",
+    "Indeed": ".indeed:IndeedScraper",
+    "Sapo": ".sapo:SapoScraper",
+    "Expresso": ".expresso:ExpressoScraper",
+    "CompanyPages": ".company_pages:CompanyPagesScraper",
+}
+
+# Installed packages can add scrapers under this entry point group, e.g. in their pyproject.toml:
+#   [project.entry-points."ptjobs.scrapers"]
+#   ItJobs = "ptjobs_itjobs:ItJobsScraper"
+ENTRY_POINT_GROUP = "ptjobs.scrapers"
+
+
+def declared_scrapers() -> Dict[str, str]:
+    """The built-in scrapers plus any registered under ENTRY_POINT_GROUP; built-in names can't be taken over."""
+    specs = dict(BUILTIN_SCRAPERS)
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name in specs:
+            logger.warning(f"ScraperRegistry: ignoring entry point {entry_point.value}, {entry_point.name} is already declared.")
+            continue
+        specs[entry_point.name] = entry_point.value
+    return specs
+
+
+def load_scraper_class(spec: str) -> type:
+    module_name, _, class_name = spec.partition(":")
+    module = importlib.import_module(module_name, package=__package__ if module_name.startswith(".") else None)
+    return getattr(module, class_name)
+
+
+class ScraperRegistry:
+    """
+    Scrapers by name, each imported and instantiated on first use, so a process that only
+    runs LinkedIn never loads the others (nor, unless LinkedIn needs them, Playwright or
+    the HTML parsers).
+    """
+
+    def __init__(self, specs: Optional[Dict[str, str]] = None):
+        self.specs = dict(specs) if specs is not None else declared_scrapers()
+        self._scrapers: Dict[str, "BaseScraper"] = {}
+
+    def names(self) -> List[str]:
+        return list(self.specs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def get(self, name: str) -> "BaseScraper":
+        if name not in self._scrapers:
+            if name not in self.specs:
+                raise KeyError(name)
+            scraper = load_scraper_class(self.specs[name])()
+            if scraper.name != name:
+                raise ValueError(f"Scraper declared as {name} is named {scraper.name}")
+            self._scrapers[name] = scraper
+        return self._scrapers[name]
+
+    def loaded(self) -> List["BaseScraper"]:
+        """The scrapers instantiated so far."""
+        return list(self._scrapers.values())
@@ -0,0 +1,148 @@
+import collections
+import contextlib
+import logging
+import os
+from typing import Dict, Iterable, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from .metrics import RENDER_BLOCKED, RENDER_ASSET_BYTES, RENDER_CACHE_BYTES_SAVED
+
+logger = logging.getLogger(__name__)
+
+# Only the DOM is read, so nothing that is just painted or played needs to load
+DEFAULT_BLOCKED_TYPES = frozenset({"image", "media", "font", "texttrack", "manifest"})
+
+# Analytics, ads, session replay and chat widgets: never needed to render a job listing
+TRACKER_DOMAINS = frozenset({
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "facebook.com", "connect.facebook.net", "hotjar.com",
+    "clarity.ms", "bat.bing.com", "snap.licdn.com", "ads.linkedin.com", "segment.io", "segment.com",
+    "mixpanel.com", "amplitude.com", "fullstory.com", "newrelic.com", "nr-data.net", "optimizely.com",
+    "hs-analytics.net", "hs-banner.com", "hubspot.com", "intercom.io", "intercomcdn.com", "tiktok.com",
+    "twitter.com", "ads-twitter.com", "criteo.com", "taboola.com", "outbrain.com", "quantserve.com",
+    "scorecardresearch.com", "sentry.io", "datadoghq-browser-agent.com", "onetrust.com", "cookiebot.com",
+})
+
+# Static assets worth keeping across pages of one browser session
+CACHEABLE_TYPES = frozenset({"script", "stylesheet"})
+
+
+def _matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class ResourcePolicy:
+    """
+    Which subresources a scraper's rendered pages may load. Requests of `blocked_types` or to
+    `blocked_domains` (and their subdomains) are aborted unless their host is in
+    `allowed_domains`, which a site can use to let through whatever it needs to render listings.
+    With `cache_assets`, scripts and stylesheets are served from the browser pool's asset cache.
+    """
+
+    def __init__(self, blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES, blocked_domains: Iterable[str] = TRACKER_DOMAINS,
+                 allowed_domains: Iterable[str] = (), cache_assets: bool = True):
+        self.blocked_types = frozenset(blocked_types)
+        self.blocked_domains = frozenset(blocked_domains)
+        self.allowed_domains = frozenset(allowed_domains)
+        self.cache_assets = cache_assets
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        if _matches(host, self.allowed_domains):
+            return False
+        return resource_type in self.blocked_types or _matches(host, self.blocked_domains)
+
+
+class CachedAsset(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class AssetCache:
+    """In-memory LRU of static assets for one browser session, bounded to `max_bytes`."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: "collections.OrderedDict[str, CachedAsset]" = collections.OrderedDict()
+
+    @staticmethod
+    def cacheable(status: int, headers: Dict[str, str]) -> bool:
+        cache_control = headers.get("cache-control", "").lower()
+        return status == 200 and "no-store" not in cache_control and "private" not in cache_control
+
+    def get(self, url: str) -> Optional[CachedAsset]:
+        asset = self.entries.get(url)
+        if asset is not None:
+            self.entries.move_to_end(url)
+        return asset
+
+    def put(self, url: str, asset: CachedAsset):
+        if len(asset.body) > self.max_bytes:
+            return
+        previous = self.entries.pop(url, None)
+        if previous is not None:
+            self.size -= len(previous.body)
+        self.entries[url] = asset
+        self.size += len(asset.body)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted.body)
+
+
+class RequestInterceptor:
+    """Applies a scraper's ResourcePolicy to every request of a Playwright page, see `install`."""
+
+    def __init__(self, policy: ResourcePolicy, cache: Optional[AssetCache], scraper: str):
+        self.policy = policy
+        self.cache = cache if policy.cache_assets else None
+        self.scraper = scraper
+
+    async def install(self, page):
+        await page.route("**/*", self.handle)
+
+    async def handle(self, route):
+        try:
+            await self._serve(route)
+        except Exception as e:
+            # An unanswered route stalls the page: a render-blocking script would hold navigation until the timeout
+            logger.debug(f"[{self.scraper}] Intercepting {route.request.url} failed ({e}), letting it through.")
+            await self._let_through(route)
+
+    async def _serve(self, route):
+        request = route.request
+        if self.policy.blocks(request.resource_type, request.url):
+            RENDER_BLOCKED.inc(scraper=self.scraper, type=request.resource_type)
+            await route.abort("blockedbyclient")
+            return
+        if self.cache is None or request.method != "GET" or request.resource_type not in CACHEABLE_TYPES:
+            await route.continue_()
+            return
+        asset = self.cache.get(request.url)
+        if asset is not None:
+            RENDER_CACHE_BYTES_SAVED.inc(len(asset.body), scraper=self.scraper)
+            await route.fulfill(status=asset.status, headers=asset.headers, body=asset.body)
+            return
+        response = await route.fetch()
+        body = await response.body()
+        RENDER_ASSET_BYTES.inc(len(body), scraper=self.scraper)
+        headers = response.headers
+        if AssetCache.cacheable(response.status, headers):
+            self.cache.put(request.url, CachedAsset(response.status, headers, body))
+        await route.fulfill(response=response, body=body)
+
+    @staticmethod
+    async def _let_through(route):
+        """Continues a route that couldn't be served as intended, or aborts it if even that fails."""
+        try:
+            await route.continue_()
+        except Exception:
+            # The page may be closed while requests are still in flight; there is nothing left to answer then
+            with contextlib.suppress(Exception):
+                await route.abort()
+
+
+def interception_enabled() -> bool:
+    """SCRAPER_BLOCK_RESOURCES=0 turns interception off, e.g. to debug a page that renders differently."""
+    return (os.environ.get("SCRAPER_BLOCK_RESOURCES") or "1").lower() not in ("0", "false", "no")
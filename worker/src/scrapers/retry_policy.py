@@ -0,0 +1,188 @@
+import logging
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# How a failed fetch is treated
+RETRYABLE = "retryable"   # Transient: timeouts, connection errors, 5xx
+BLOCKED = "blocked"       # The site refuses us (403, 429); retrying right away only digs deeper
+PERMANENT = "permanent"   # Retrying can't help: 404, bad URL, certificate errors
+
+RETRYABLE_STATUSES = {408, 425, 500, 502, 503, 504}
+BLOCKED_STATUSES = {403, 429}
+
+# Permanent failures Chromium reports as navigation errors
+_PERMANENT_NET_ERRORS = ("ERR_NAME_NOT_RESOLVED", "ERR_CERT_", "ERR_INVALID_URL", "ERR_UNSAFE_", "ERR_TOO_MANY_REDIRECTS")
+
+# Reasons a fetch gives up, as reported in scraper_fetch_give_ups_total
+GIVE_UP_PERMANENT = "permanent"
+GIVE_UP_BLOCKED = "blocked"
+GIVE_UP_EXHAUSTED = "max_retries"
+GIVE_UP_BUDGET = "retry_budget"
+GIVE_UP_CIRCUIT_OPEN = "circuit_open"
+
+# A half-open circuit's probe that hasn't reported back by then (e.g. its task was cancelled) is given up on
+PROBE_TIMEOUT = 120.0
+
+
+def classify_status(status: int) -> str:
+    if status in BLOCKED_STATUSES:
+        return BLOCKED
+    if status in RETRYABLE_STATUSES:
+        return RETRYABLE
+    return PERMANENT
+
+
+def classify_error(error: Exception) -> str:
+    """Classifies an exception raised by httpx or Playwright."""
+    if isinstance(error, (httpx.InvalidURL, httpx.UnsupportedProtocol, httpx.TooManyRedirects, httpx.DecodingError)):
+        return PERMANENT
+    if isinstance(error, httpx.HTTPError):
+        return RETRYABLE
+    # Playwright is matched by message so this module doesn't need to import it
+    if any(code in str(error) for code in _PERMANENT_NET_ERRORS):
+        return PERMANENT
+    return RETRYABLE
+
+
+class RetryDecision(NamedTuple):
+    delay: Optional[float]   # Seconds to wait before retrying, or None to give up
+    reason: str              # Why it gives up (GIVE_UP_*), "" when retrying
+
+
+class _HostCircuit:
+    def __init__(self):
+        self.consecutive_blocks = 0
+        self.open_until = 0.0
+        self.half_open = False
+        self.probe_started = 0.0   # When the half-open circuit's one request went out, 0 if none is out
+        self.cooldown = 0.0
+
+
+class RetryPolicy:
+    """
+    Decides which failed fetches are retried, shared by every scraper in the process.
+
+    Retryable failures back off exponentially from `backoff` seconds (longer if the server
+    sent a Retry-After); blocked ones are only retried when Retry-After asks for at most
+    `max_wait` seconds (the rate limiter holds the host until then); permanent ones never are.
+    After `breaker_threshold` consecutive blocks a host's circuit opens for `breaker_cooldown`
+    seconds (or the Retry-After, if longer), and its remaining URLs fail without a request.
+    When the cooldown has passed a single request may try again while the others keep failing
+    fast: success closes the circuit, a block reopens it for twice as long. Retries across the whole run draw on one budget of
+    `retry_budget`, reset by the orchestrator at the start of every run.
+    """
+
+    def __init__(self, retry_budget: int = 30, breaker_threshold: int = 3, breaker_cooldown: float = 300.0,
+                 max_wait: float = 60.0, backoff: float = 1.0):
+        self.retry_budget = retry_budget
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.max_wait = max_wait
+        self.backoff = backoff
+        self.retries_left = retry_budget
+        self.circuits: Dict[str, _HostCircuit] = {}
+
+    def start_run(self):
+        self.retries_left = self.retry_budget
+
+    def _circuit(self, host: str) -> _HostCircuit:
+        if host not in self.circuits:
+            self.circuits[host] = _HostCircuit()
+        return self.circuits[host]
+
+    def allow(self, host: str) -> bool:
+        """
+        Whether a request to `host` may go out: its circuit is closed, or it is half-open and no
+        other request is probing it. The probe's `record` (or `release`) decides what comes next.
+        """
+        circuit = self._circuit(host)
+        now = time.monotonic()
+        if circuit.half_open:
+            if circuit.probe_started and now - circuit.probe_started < PROBE_TIMEOUT:
+                return False
+        elif not circuit.open_until:
+            return True
+        elif now < circuit.open_until:
+            return False
+        circuit.open_until = 0.0
+        circuit.half_open = True
+        circuit.probe_started = now
+        return True
+
+    def release(self, host: str):
+        """
+        Ends a half-open circuit's probe that failed for another reason than a block (a timeout,
+        a 404), which says nothing either way: the next request probes again.
+        """
+        self._circuit(host).probe_started = 0.0
+
+    def record(self, host: str, outcome: Optional[str], retry_after: Optional[float] = None):
+        """Feeds a fetch's outcome (None for success) to the host's circuit."""
+        circuit = self._circuit(host)
+        if outcome is None:
+            if circuit.half_open:
+                logger.info(f"RetryPolicy: {host} answers again, closing its circuit.")
+            circuit.consecutive_blocks = 0
+            circuit.half_open = False
+            circuit.probe_started = 0.0
+            circuit.cooldown = 0.0
+            return
+        if outcome != BLOCKED:
+            self.release(host)
+            return
+        circuit.consecutive_blocks += 1
+        if circuit.half_open or circuit.consecutive_blocks >= self.breaker_threshold:
+            circuit.cooldown = circuit.cooldown * 2 if circuit.half_open else self.breaker_cooldown
+            circuit.cooldown = max(circuit.cooldown, retry_after or 0.0)
+            circuit.open_until = time.monotonic() + circuit.cooldown
+            circuit.half_open = False
+            circuit.probe_started = 0.0
+            logger.warning(
+                f"RetryPolicy: {host} blocked {circuit.consecutive_blocks} times in a row, "
+                f"failing its requests fast for {circuit.cooldown:.0f}s."
+            )
+
+    def retry_delay(self, outcome: str, attempt: int, max_retries: int, retry_after: Optional[float] = None) -> RetryDecision:
+        """Whether and after how long attempt number `attempt` (from 0) of a fetch is retried."""
+        if outcome == PERMANENT:
+            return RetryDecision(None, GIVE_UP_PERMANENT)
+        if attempt >= max_retries:
+            return RetryDecision(None, GIVE_UP_EXHAUSTED)
+        if outcome == BLOCKED:
+            if retry_after is None or retry_after > self.max_wait:
+                return RetryDecision(None, GIVE_UP_BLOCKED)
+            # The rate limiter already holds the host until Retry-After has passed
+            delay = 0.0
+        else:
+            delay = self.backoff * 2 ** attempt
+            if retry_after is not None:
+                if retry_after > self.max_wait:
+                    return RetryDecision(None, GIVE_UP_EXHAUSTED)
+                delay = max(delay, retry_after)
+        if self.retries_left <= 0:
+            return RetryDecision(None, GIVE_UP_BUDGET)
+        self.retries_left -= 1
+        if self.retries_left == 0:
+            logger.warning("RetryPolicy: retry budget for this run used up, failed fetches are no longer retried.")
+        return RetryDecision(delay, "")
+
+
+_policy: Optional[RetryPolicy] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Process-wide policy, tuned by RETRY_BUDGET, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN and RETRY_MAX_WAIT."""
+    global _policy
+    if _policy is None:
+        _policy = RetryPolicy(
+            retry_budget=int(os.environ.get("RETRY_BUDGET") or 30),
+            breaker_threshold=int(os.environ.get("CIRCUIT_BREAKER_THRESHOLD") or 3),
+            breaker_cooldown=float(os.environ.get("CIRCUIT_BREAKER_COOLDOWN") or 300),
+            max_wait=float(os.environ.get("RETRY_MAX_WAIT") or 60),
+        )
+    return _policy
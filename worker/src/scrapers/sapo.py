@@ -1,45 +1,55 @@
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, AsyncIterator
 from .base_scraper import BaseScraper
+from .parsing import make_soup, run_parser
+from .resource_policy import DEFAULT_BLOCKED_TYPES, ResourcePolicy
 
 class SapoScraper(BaseScraper):
     def __init__(self):
-        super().__init__(name="Sapo", source="SAPO Emprego")
+        # Offers are plain server-rendered markup, so not even stylesheets are needed
+        super().__init__(name="Sapo", source="SAPO Emprego",
+                         resource_policy=ResourcePolicy(blocked_types=DEFAULT_BLOCKED_TYPES | {"stylesheet"}),
+                         expected_selector="div.offer-list-item h2.title")
 
-    async def fetch(self) -> Any:
-        url = "https://emprego.sapo.pt/offers?q=trainee%20OR%20estagio"
-        html = await self.fetch_js_rendered_html(url)
-        return [html] if html else []
+    def page_url(self, page: int) -> str:
+        return f"https://emprego.sapo.pt/offers?q=trainee%20OR%20estagio&page={page + 1}"
+
+    async def fetch_pages(self) -> AsyncIterator[str]:
+        async for html in self.paginate(self.page_url, render=True):
+            yield html
 
     async def parse(self, raw_data: List[str]) -> List[Dict[str, Any]]:
-        jobs = []
-        for html in raw_data:
-            soup = BeautifulSoup(html, 'html.parser')
-            # Their list item blocks often use class 'offer-list-item'
-            cards = soup.find_all("div", class_="offer-list-item")
-            for card in cards:
-                try:
-                    title_elem = card.find("h2", class_="title")
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    company_elem = card.find("div", class_="company")
-                    company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-                    
-                    location_elem = card.find("div", class_="location")
-                    location = location_elem.get_text(strip=True) if location_elem else "Portugal"
-                    
-                    link_elem = title_elem.find("a")
-                    url = "https://emprego.sapo.pt" + link_elem['href'] if link_elem and 'href' in link_elem.attrs else ""
-                    
-                    jobs.append({
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "url": url,
-                        "type": "Internship/Trainee"
-                    })
-                except Exception:
+        return await run_parser(parse_sapo_pages, raw_data, self.parser_backend)
+
+
+def parse_sapo_pages(raw_data: List[str], parser: str) -> List[Dict[str, Any]]:
+    jobs = []
+    for html in raw_data:
+        soup = make_soup(html, parser)
+        # Their list item blocks often use class 'offer-list-item'
+        cards = soup.find_all("div", class_="offer-list-item")
+        for card in cards:
+            try:
+                title_elem = card.find("h2", class_="title")
+                if not title_elem:
                     continue
-        return jobs
+                
+                title = title_elem.get_text(strip=True)
+                company_elem = card.find("div", class_="company")
+                company = company_elem.get_text(strip=True) if company_elem else "Unknown"
+                
+                location_elem = card.find("div", class_="location")
+                location = location_elem.get_text(strip=True) if location_elem else "Portugal"
+                
+                link_elem = title_elem.find("a")
+                url = "https://emprego.sapo.pt" + link_elem['href'] if link_elem and 'href' in link_elem.attrs else ""
+                
+                jobs.append({
+                    "title": title,
+                    "company": company,
+                    "location": location,
+                    "url": url,
+                    "type": "Internship/Trainee"
+                })
+            except Exception:
+                continue
+    return jobs
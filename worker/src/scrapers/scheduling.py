@@ -0,0 +1,174 @@
+import datetime
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest run in the smoothed change and failure rates
+SMOOTHING = 0.3
+
+
+class SourceOutcome(NamedTuple):
+    """What one run of a source (a scraper, or one target of it such as a company page) observed."""
+    seen: int        # Jobs scraped
+    changed: int     # Of those, new or changed since the previous snapshot
+    failed: bool     # Nothing could be fetched
+    blocked: bool    # The site answered 429 / 403 at least once
+
+
+class SourceSchedule(NamedTuple):
+    key: str
+    interval: float
+    next_run_at: float
+    last_run_at: Optional[float]
+    change_rate: float     # Smoothed new/changed postings per hour
+    failure_rate: float    # Smoothed share of runs that failed or were blocked
+    consecutive_failures: int
+    runs: int
+
+
+class AdaptiveScheduler:
+    """
+    Learns how often each source actually changes and schedules it accordingly.
+
+    After every run a source's smoothed change rate (new or changed postings per hour) is
+    updated, and its next interval is chosen so that a run finds about `target_changes`
+    changes: listings that churn hourly get short intervals, a careers page that changes
+    monthly backs off (x `backoff` per run without changes) up to `max_interval`. Failed or
+    blocked runs back off exponentially from `min_interval` regardless of churn.
+    State lives in SQLite (in memory unless a path is given) so it survives restarts.
+    """
+
+    def __init__(self, path: str = ":memory:", min_interval: float = 15 * 60, max_interval: float = 7 * 24 * 3600,
+                 target_changes: float = 5.0, backoff: float = 1.5):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_changes = target_changes
+        self.backoff = backoff
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS schedule ("
+            " key TEXT PRIMARY KEY, interval REAL NOT NULL, next_run_at REAL NOT NULL, last_run_at REAL,"
+            " change_rate REAL NOT NULL, failure_rate REAL NOT NULL, consecutive_failures INTEGER NOT NULL,"
+            " runs INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[SourceSchedule]:
+        row = self.conn.execute(
+            "SELECT key, interval, next_run_at, last_run_at, change_rate, failure_rate, consecutive_failures, runs"
+            " FROM schedule WHERE key = ?", (key,)
+        ).fetchone()
+        return SourceSchedule(*row) if row else None
+
+    def due(self, keys: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """The sources among `keys` whose next run is due; sources never run before always are."""
+        now = time.time() if now is None else now
+        due = []
+        for key in keys:
+            schedule = self.get(key)
+            if schedule is None or schedule.next_run_at <= now:
+                due.append(key)
+        return due
+
+    def claim(self, keys: Iterable[str], lease: float = 3600, now: Optional[float] = None):
+        """
+        Pushes the next run of sources that were just dispatched `lease` seconds out, so they are
+        not due again while the run is in flight; `record` replaces this once the run reports back.
+        """
+        now = time.time() if now is None else now
+        for key in keys:
+            previous = self.get(key)
+            if previous is None:
+                previous = SourceSchedule(key, self.min_interval, now, None, 0.0, 0.0, 0, 0)
+            self.conn.execute("INSERT OR REPLACE INTO schedule VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                              previous._replace(next_run_at=now + lease))
+        self.conn.commit()
+
+    def _next_interval(self, previous: Optional[SourceSchedule], outcome: SourceOutcome, change_rate: float,
+                       consecutive_failures: int) -> float:
+        if consecutive_failures:
+            return min(self.max_interval, self.min_interval * 2 ** consecutive_failures)
+        if outcome.changed and change_rate > 0:
+            interval = self.target_changes / change_rate * 3600
+        else:
+            interval = (previous.interval if previous else self.min_interval) * self.backoff
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def record(self, key: str, outcome: SourceOutcome, now: Optional[float] = None) -> SourceSchedule:
+        """Updates a source's statistics with the outcome of a run and schedules its next run."""
+        now = time.time() if now is None else now
+        previous = self.get(key)
+        if outcome.failed or outcome.blocked:
+            consecutive_failures = (previous.consecutive_failures if previous else 0) + 1
+            # A failed run says nothing about how often the listing changes
+            change_rate = previous.change_rate if previous else 0.0
+        else:
+            consecutive_failures = 0
+            # Changes accumulated since the previous run (or over one minimum interval on the first run)
+            elapsed = now - previous.last_run_at if previous and previous.last_run_at else self.min_interval
+            rate = outcome.changed / max(elapsed, 60) * 3600
+            change_rate = rate if previous is None else SMOOTHING * rate + (1 - SMOOTHING) * previous.change_rate
+        failed = 1.0 if outcome.failed or outcome.blocked else 0.0
+        failure_rate = failed if previous is None else SMOOTHING * failed + (1 - SMOOTHING) * previous.failure_rate
+        interval = self._next_interval(previous, outcome, change_rate, consecutive_failures)
+        schedule = SourceSchedule(key, interval, now + interval, now, change_rate, failure_rate, consecutive_failures,
+                                  (previous.runs if previous else 0) + 1)
+        self.conn.execute("INSERT OR REPLACE INTO schedule VALUES (?, ?, ?, ?, ?, ?, ?, ?)", schedule)
+        self.conn.commit()
+        logger.info(
+            f"Scheduler: {key} seen {outcome.seen}, changed {outcome.changed}"
+            f"{', failed' if outcome.failed else ''}{', blocked' if outcome.blocked else ''}; "
+            f"next run in {interval / 60:.0f} min."
+        )
+        return schedule
+
+    def record_run(self, outcomes: Dict[str, SourceOutcome], now: Optional[float] = None):
+        for key, outcome in outcomes.items():
+            self.record(key, outcome, now)
+
+    def schedules(self) -> List[SourceSchedule]:
+        rows = self.conn.execute(
+            "SELECT key, interval, next_run_at, last_run_at, change_rate, failure_rate, consecutive_failures, runs"
+            " FROM schedule ORDER BY next_run_at"
+        ).fetchall()
+        return [SourceSchedule(*row) for row in rows]
+
+    def beat_schedule(self, task: str, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Celery beat entries running `task` with one source per entry at its learned interval
+        (sources never run before get `min_interval`). Beat reads its schedule at start-up, so
+        this suits a periodic regeneration; a beat tick dispatching `due` sources adapts immediately.
+        """
+        entries = {}
+        for key in keys:
+            schedule = self.get(key)
+            entries[f"scrape {key}"] = {
+                "task": task,
+                "schedule": datetime.timedelta(seconds=schedule.interval if schedule else self.min_interval),
+                "args": ([key],),
+            }
+        return entries
+
+    def close(self):
+        self.conn.close()
+
+
+_scheduler: Optional[AdaptiveScheduler] = None
+
+
+def get_scheduler() -> AdaptiveScheduler:
+    """Process-wide scheduler, persisted at SCHEDULE_STATE_PATH (in memory when unset)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = AdaptiveScheduler(
+            os.environ.get("SCHEDULE_STATE_PATH") or ":memory:",
+            min_interval=float(os.environ.get("SCHEDULE_MIN_INTERVAL") or 15 * 60),
+            max_interval=float(os.environ.get("SCHEDULE_MAX_INTERVAL") or 7 * 24 * 3600),
+        )
+    return _scheduler
@@ -0,0 +1,174 @@
+import asyncio
+import csv
+import datetime
+import functools
+import io
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
+
+from sqlalchemy import Column, DateTime, JSON, MetaData, String, Table, Text, create_engine
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+jobs_table = Table(
+    "jobs",
+    metadata,
+    Column("id", String(36), primary_key=True),  # Stable content-addressed job ID from normalize_job
+    Column("title", Text, nullable=False),
+    Column("company", Text),
+    Column("location", Text),
+    Column("type", Text),
+    Column("source", Text, index=True),
+    Column("url", Text),
+    Column("posted_at", Text),
+    Column("fetched_at", DateTime),
+    Column("tags", JSON),
+    Column("fingerprint", String(32)),
+    Column("page_digest", String(64)),  # Key of the source page in the page archive
+)
+
+_engines: Dict[str, Engine] = {}
+
+
+def get_engine(database_url: str) -> Engine:
+    """Returns a pooled engine per database URL, reused across runs in a long-lived worker."""
+    if database_url not in _engines:
+        options: Dict[str, Any] = {"pool_pre_ping": True}
+        if not database_url.startswith("sqlite"):
+            options.update(pool_size=5, max_overflow=5, pool_recycle=1800)
+        _engines[database_url] = create_engine(database_url, **options)
+    return _engines[database_url]
+
+
+# A batch of jobs shares one fetch timestamp, so parse each distinct one once
+_parse_timestamp = functools.lru_cache(maxsize=256)(datetime.datetime.fromisoformat)
+
+
+class JobSink:
+    """
+    Writes orchestrator output as batched upserts keyed on the stable job `id`.
+    Jobs are buffered and flushed every `batch_size` jobs or `flush_interval` seconds.
+    PostgreSQL gets a COPY into a temporary staging table followed by one INSERT ... ON CONFLICT;
+    SQLite uses an executemany upsert, and other databases a delete + insert per batch.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, batch_size: int = 500, flush_interval: float = 5.0,
+                 table: Table = jobs_table, create_tables: bool = False):
+        self.database_url = database_url or os.environ["DATABASE_URL"]
+        self.engine = get_engine(self.database_url)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.table = table
+        self.buffer: List[Dict[str, Any]] = []
+        self.last_flush = time.monotonic()
+        self.written = 0
+        if create_tables:
+            metadata.create_all(self.engine, tables=[table])
+
+    def _row(self, job: Mapping[str, Any]) -> Dict[str, Any]:
+        row = {column.name: job.get(column.name) for column in self.table.columns}
+        if isinstance(row.get("fetched_at"), str):
+            row["fetched_at"] = _parse_timestamp(row["fetched_at"])
+        return row
+
+    def add(self, job: Dict[str, Any]) -> int:
+        """Buffers a job, flushing if the batch is full or the flush interval elapsed. Returns rows written."""
+        self.buffer.append(self._row(job))
+        if len(self.buffer) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    def add_many(self, jobs: List[Dict[str, Any]]) -> int:
+        return sum(self.add(job) for job in jobs) + self.flush()
+
+    def flush(self) -> int:
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return 0
+        # One row per id: a single upsert statement may not touch the same row twice
+        batch = list({row["id"]: row for row in self.buffer}.values())
+        self.buffer = []
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql" and self.engine.dialect.driver == "psycopg2":
+            self._copy_upsert(batch)
+        elif dialect in ("postgresql", "sqlite"):
+            self._executemany_upsert(batch, dialect)
+        else:
+            self._replace(batch)
+        self.written += len(batch)
+        logger.info(f"JobSink: upserted {len(batch)} jobs ({self.written} total).")
+        return len(batch)
+
+    def _update_columns(self) -> List[str]:
+        return [column.name for column in self.table.columns if not column.primary_key]
+
+    def _executemany_upsert(self, batch: List[Dict[str, Any]], dialect: str):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(self.table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.table.c.id],
+            set_={name: stmt.excluded[name] for name in self._update_columns()},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt, batch)
+
+    def _replace(self, batch: List[Dict[str, Any]]):
+        """Generic path for databases without an upsert dialect."""
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.id.in_([row["id"] for row in batch])))
+            conn.execute(self.table.insert(), batch)
+
+    def _copy_upsert(self, batch: List[Dict[str, Any]]):
+        columns = [column.name for column in self.table.columns]
+        json_columns = {column.name for column in self.table.columns if isinstance(column.type, JSON)}
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_ALL)
+        for row in batch:
+            writer.writerow([
+                "\\N" if row[name] is None else json.dumps(row[name], ensure_ascii=False, default=str) if name in json_columns else row[name]
+                for name in columns
+            ])
+        buf.seek(0)
+        column_list = ", ".join(columns)
+        updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in self._update_columns())
+        stage = f"{self.table.name}_stage"
+        raw = self.engine.raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                cursor.execute(f"CREATE TEMP TABLE {stage} (LIKE {self.table.name} INCLUDING DEFAULTS) ON COMMIT DROP")
+                # Every field is quoted, so FORCE_NULL is what turns \N back into NULL
+                cursor.copy_expert(
+                    f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N', FORCE_NULL ({column_list}))",
+                    buf,
+                )
+                cursor.execute(
+                    f"INSERT INTO {self.table.name} ({column_list}) SELECT {column_list} FROM {stage} "
+                    f"ON CONFLICT (id) DO UPDATE SET {updates}"
+                )
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+    async def consume(self, jobs: AsyncIterator[Dict[str, Any]]) -> int:
+        """
+        Writes a stream of jobs (e.g. `ScraperOrchestrator.stream_all()`) as they arrive.
+        Flushes run in a thread so database round trips don't stall the scrapers.
+        """
+        async for job in jobs:
+            self.buffer.append(self._row(job))
+            if len(self.buffer) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+                await asyncio.to_thread(self.flush)
+        await asyncio.to_thread(self.flush)
+        return self.written
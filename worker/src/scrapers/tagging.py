@@ -0,0 +1,118 @@
+import collections
+import json
+import os
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Categories -> tags -> the terms that mean them; TAG_VOCABULARY points at another file of this shape
+DEFAULT_VOCABULARY = os.path.join(os.path.dirname(__file__), "tag_vocabulary.json")
+
+# Job fields tagged by `Tagger.tag_jobs`. Not `type`: most scrapers fill it with the same label for
+# every job of their search, which says nothing about the posting
+TAGGED_FIELDS = ("title", "location")
+
+
+def fold(text: str) -> str:
+    """Lowercases and strips accents, so "Estágio" and "estagio" are the same term."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+class _Node:
+    __slots__ = ("next", "fail", "out")
+
+    def __init__(self):
+        self.next: Dict[str, "_Node"] = {}
+        self.fail: Optional["_Node"] = None
+        self.out: List[Tuple[int, str, bool, bool]] = []  # (length, tag, needs boundary before, after)
+
+
+class Tagger:
+    """
+    Multi-term matcher built once from a vocabulary: an Aho-Corasick automaton over every term,
+    so a text is scanned in one pass however many thousands of terms there are. Terms match
+    whole words only ("java" doesn't match "javascript", "intern" doesn't match "internal")
+    on case- and accent-folded text. A match yields its tag as "category:tag".
+    """
+
+    def __init__(self, vocabulary: Dict[str, Dict[str, List[str]]]):
+        self.root = _Node()
+        self.size = 0
+        for category, tags in vocabulary.items():
+            for tag, terms in tags.items():
+                for term in terms:
+                    self._add(fold(term).strip(), f"{category}:{tag}")
+        self._link()
+
+    def _add(self, term: str, tag: str):
+        if not term:
+            return
+        node = self.root
+        for char in term:
+            node = node.next.setdefault(char, _Node())
+        node.out.append((len(term), tag, term[0].isalnum(), term[-1].isalnum()))
+        self.size += 1
+
+    def _link(self):
+        """Failure links, breadth first: the longest proper suffix of each node that is also in the trie."""
+        queue = collections.deque()
+        for child in self.root.next.values():
+            child.fail = self.root
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in node.next.items():
+                fail = node.fail
+                while fail is not None and char not in fail.next:
+                    fail = fail.fail
+                child.fail = fail.next[char] if fail is not None else self.root
+                # Terms ending at the suffix also end here
+                child.out.extend(child.fail.out)
+                queue.append(child)
+
+    def matches(self, text: str) -> Set[str]:
+        """The tags whose terms occur in `text` as whole words."""
+        text = fold(text)
+        found: Set[str] = set()
+        node = self.root
+        last = len(text) - 1
+        for i, char in enumerate(text):
+            while node is not self.root and char not in node.next:
+                node = node.fail
+            node = node.next.get(char, self.root)
+            for length, tag, bounded_start, bounded_end in node.out:
+                start = i - length + 1
+                if bounded_start and start > 0 and text[start - 1].isalnum():
+                    continue
+                if bounded_end and i < last and text[i + 1].isalnum():
+                    continue
+                found.add(tag)
+        return found
+
+    def tags(self, text: str) -> List[str]:
+        return sorted(self.matches(text))
+
+    def has_any(self, text: str, tags: Iterable[str]) -> bool:
+        return not self.matches(text).isdisjoint(tags)
+
+    def tag_jobs(self, jobs: List[Dict[str, Any]], fields: Tuple[str, ...] = TAGGED_FIELDS):
+        """Fills the `tags` of a batch of scraped jobs in place, keeping tags a scraper already set."""
+        for job in jobs:
+            text = "\n".join(str(job.get(field) or "") for field in fields)
+            job["tags"] = sorted(self.matches(text).union(job.get("tags") or ()))
+
+
+def load_vocabulary(path: str) -> Dict[str, Dict[str, List[str]]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_tagger: Optional[Tagger] = None
+
+
+def get_tagger() -> Tagger:
+    """Process-wide tagger over the vocabulary at TAG_VOCABULARY (the bundled one when unset), built on first use."""
+    global _tagger
+    if _tagger is None:
+        _tagger = Tagger(load_vocabulary(os.environ.get("TAG_VOCABULARY") or DEFAULT_VOCABULARY))
+    return _tagger
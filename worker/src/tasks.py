@@ -0,0 +1,109 @@
+"""
+Distributed scraping: every source is scraped by its own task on a per-scraper queue
+(scrape.linkedin, scrape.indeed, ...), and a chord merges the results into one dedup +
+change tracking + upsert step, so Playwright-heavy sources can run on dedicated workers.
+
+    celery -A src.worker.app call src.tasks.run_full_scraping_pipeline
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from celery import chord
+from celery.signals import worker_process_shutdown, worker_shutdown
+
+from src.pipeline import close_orchestrator, get_orchestrator, persist
+from src.scrapers.scheduling import get_scheduler
+from src.worker import app
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_QUEUE_PREFIX = "scrape."
+
+# One event loop per worker process rather than one per task: the orchestrator's pooled HTTP
+# connections and DNS cache are bound to it and would otherwise be rebuilt on every task
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro):
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_loop(**kwargs):
+    """Closes the orchestrator's Chromium and connections on the loop they belong to, then the loop."""
+    if _loop is None or _loop.is_closed():
+        return
+    try:
+        run_async(close_orchestrator())
+    finally:
+        _loop.close()
+
+
+def queue_for(unit: str) -> str:
+    """The queue scraping a source goes to: one per scraper, e.g. "CompanyPages:Blip" -> scrape.companypages."""
+    return SCRAPE_QUEUE_PREFIX + unit.partition(":")[0].lower()
+
+
+def fan_out(units: List[str], targets_per_task: Optional[int] = None) -> List[List[str]]:
+    """
+    Splits sources into task batches: one per scraper, and targets of the same scraper (such as
+    company pages) in batches of `targets_per_task`. Paginated listings stay in one task because
+    early termination depends on the pages before.
+    """
+    targets_per_task = targets_per_task or int(os.environ.get("SCRAPE_TARGETS_PER_TASK") or 4)
+    batches: List[List[str]] = []
+    targets: Dict[str, List[str]] = {}
+    for unit in units:
+        name, _, target = unit.partition(":")
+        if target:
+            targets.setdefault(name, []).append(unit)
+        else:
+            batches.append([unit])
+    for grouped in targets.values():
+        batches.extend(grouped[i:i + targets_per_task] for i in range(0, len(grouped), targets_per_task))
+    return batches
+
+
+@app.task(name="src.tasks.scrape_sources")
+def scrape_sources(sources: List[str], reparse: bool = False) -> List[Dict[str, Any]]:
+    """Scrapes some sources without deduplicating; see `ScraperOrchestrator.collect`."""
+    return run_async(get_orchestrator().collect(sources, reparse))
+
+
+@app.task(name="src.tasks.merge_and_persist")
+def merge_and_persist(batches: List[List[Dict[str, Any]]], reparse: bool = False,
+                      sources: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Chord callback: dedups, change-tracks and upserts what the scrape tasks collected."""
+    results = [result for batch in batches for result in batch]
+    summary = run_async(persist(get_orchestrator().merge(results, reparse, sources), reparse=reparse))
+    # Task results should stay small; the IDs themselves are in the change tracker's log
+    summary["disappeared"] = len(summary["disappeared"])
+    return summary
+
+
+@app.task(name="src.tasks.run_full_scraping_pipeline")
+def run_full_scraping_pipeline(sources: Optional[List[str]] = None, reparse: bool = False) -> str:
+    """Fans the sources (all by default) out to scrape tasks joined by a merge chord. Returns the chord's ID."""
+    units = sources or get_orchestrator().units()
+    header = [scrape_sources.s(batch, reparse).set(queue=queue_for(batch[0])) for batch in fan_out(units)]
+    result = chord(header)(merge_and_persist.s(reparse=reparse, sources=sources))
+    logger.info(f"Dispatched {len(header)} scrape tasks for {len(units)} sources.")
+    return result.id
+
+
+@app.task(name="src.tasks.run_due_sources")
+def run_due_sources() -> Optional[str]:
+    """Beat tick: dispatches the sources whose adaptive schedule is due."""
+    scheduler = get_scheduler()
+    due = scheduler.due(get_orchestrator().units())
+    if not due:
+        return None
+    # Don't dispatch them again on the next tick while this run is still going
+    scheduler.claim(due)
+    return run_full_scraping_pipeline(sources=due)
@@ -7,6 +7,7 @@ from src.scrapers.indeed import IndeedScraper
 from src.scrapers.sapo import SapoScraper
 from src.scrapers.expresso import ExpressoScraper
 from src.scrapers.company_pages import CompanyPagesScraper
+from src.scrapers.browser_pool import close_browser_pool
 
 # Configure logging to see the output in the terminal
 logging.basicConfig(
@@ -26,13 +27,19 @@ async def test_scraper(scraper_class, scraper_name):
         
         if jobs:
             logger.info(f"First 2 jobs from {scraper_name}:")
-            print(json.dumps(jobs[:2], indent=2, ensure_ascii=False))
+            print(json.dumps([job.to_dict() for job in jobs[:2]], indent=2, ensure_ascii=False))
         else:
             logger.warning(f"No jobs were found by {scraper_name}.")
     except Exception as e:
         logger.error(f"Error running {scraper_name}: {e}")
 
 async def main():
+    try:
+        await run_targets()
+    finally:
+        await close_browser_pool()
+
+async def run_targets():
     if len(sys.argv) > 1:
         target = sys.argv[1].lower()
         if target == "indeed":
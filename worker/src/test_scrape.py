@@ -16,14 +16,17 @@ async def main():
     orchestrator = ScraperOrchestrator()
     
     # Run the orchestrator
-    jobs = await orchestrator.run_all()
+    try:
+        jobs = await orchestrator.run_all()
+    finally:
+        await orchestrator.close()
     
     logger.info(f"Test run completed. Total unique jobs found: {len(jobs)}")
     
     # Print the first 5 jobs nicely formatted
     if jobs:
         logger.info("Here are the first 5 jobs scraped:")
-        print(json.dumps(jobs[:5], indent=2, ensure_ascii=False))
+        print(json.dumps([job.to_dict() for job in jobs[:5]], indent=2, ensure_ascii=False))
     else:
         logger.info("No jobs were found during this run.")
 
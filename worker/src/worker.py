@@ -0,0 +1,31 @@
+import os
+
+from celery import Celery
+
+app = Celery(
+    "portugaltech",
+    # In-memory broker and results when unset, e.g. for local runs in eager mode
+    broker=os.environ.get("CELERY_BROKER_URL") or "memory://",
+    backend=os.environ.get("CELERY_RESULT_BACKEND") or "cache+memory://",
+    include=["src.tasks"],
+)
+
+app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="UTC",
+    # CELERY_TASK_ALWAYS_EAGER=1 runs the whole fan-out and chord in-process, without a broker
+    task_always_eager=(os.environ.get("CELERY_TASK_ALWAYS_EAGER") or "").lower() in ("1", "true", "yes"),
+    task_eager_propagates=True,
+    # Scrape tasks are long and uneven; don't let one worker reserve several while others idle
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    beat_schedule={
+        # Sources run on their own adaptive intervals; beat only ticks the dispatcher
+        "dispatch-due-sources": {
+            "task": "src.tasks.run_due_sources",
+            "schedule": float(os.environ.get("SCHEDULE_TICK") or 300),
+        },
+    },
+)
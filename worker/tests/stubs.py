@@ -0,0 +1,72 @@
+"""
+Scrapers serving canned jobs instead of fetching, for orchestrator and task tests. Registered
+by spec like the built-in ones (e.g. ScraperRegistry({"Board": "stubs:Board"})); set `pages`
+on the instance a run will use to choose what it streams.
+"""
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src.scrapers.base_scraper import BaseScraper
+
+
+def posting(title: str, company: str = "Acme Tecnologia", location: str = "Lisboa", **fields: Any) -> Dict[str, Any]:
+    return {"title": title, "company": company, "location": location, "url": f"https://jobs.test/{title}", **fields}
+
+
+class StubScraper(BaseScraper):
+    """Streams `pages`, lists of scraped job dicts, waiting `delay` seconds before each one."""
+
+    def __init__(self, name: str, source: str, pages: Optional[List[List[Dict[str, Any]]]] = None, delay: float = 0.0):
+        super().__init__(name=name, source=source)
+        self.pages = pages or []
+        self.delay = delay
+
+    async def fetch_pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        for page in self.pages:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield page
+
+    def page_html(self, page: List[Dict[str, Any]]) -> str:
+        return json.dumps(page, sort_keys=True)
+
+    async def parse(self, raw_data: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return [dict(job) for page in raw_data for job in page]
+
+
+class Board(StubScraper):
+    def __init__(self):
+        super().__init__("Board", "Job Board")
+
+
+class OtherBoard(StubScraper):
+    def __init__(self):
+        super().__init__("OtherBoard", "Other Board")
+
+
+class Careers(StubScraper):
+    """Careers pages of several companies, one target each; `pages` maps a company to its jobs."""
+
+    def __init__(self):
+        super().__init__("Careers", "Direct Company")
+        self.pages: Dict[str, List[Dict[str, Any]]] = {}
+        self.blocked: List[str] = []
+
+    def targets(self) -> List[str]:
+        return sorted(self.pages)
+
+    def target_of(self, job: Dict[str, Any]) -> Optional[str]:
+        return job.get("company")
+
+    async def fetch_pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        for company in self.targets():
+            if self.selected_targets is not None and company not in self.selected_targets:
+                continue
+            if company in self.blocked:
+                self.blocks += 1
+                self.target_blocks[company] = self.target_blocks.get(company, 0) + 1
+                continue
+            self.fetched_targets.add(company)
+            yield self.pages[company]
+            self.completed_targets.add(company)
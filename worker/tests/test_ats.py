@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+
+from src.scrapers.ats import detect_ats, is_board_response, parse_endpoint, parse_postings
+from src.scrapers.company_pages import CompanyPagesScraper
+
+GREENHOUSE = json.dumps({"jobs": [{
+    "title": "Junior Developer", "location": {"name": "Lisbon"},
+    "absolute_url": "https://boards.greenhouse.io/acme/jobs/1", "first_published": "2024-05-01T10:00:00Z",
+}]})
+LEVER = json.dumps([{
+    "text": "Trainee Analyst", "categories": {"location": "Porto", "commitment": "Internship"},
+    "hostedUrl": "https://jobs.lever.co/acme/1", "createdAt": 1714557600000,
+}])
+WORKABLE = json.dumps({"jobs": [{
+    "title": "Junior Designer", "city": "Braga", "country": "Portugal", "shortcode": "AB12", "published_on": "2024-05-01",
+}]})
+SMARTRECRUITERS = json.dumps({"content": [{
+    "id": "99", "name": "Graduate Engineer", "location": {"city": "Aveiro", "country": "pt"},
+    "typeOfEmployment": {"label": "Full-time"}, "releasedDate": "2024-05-01T10:00:00Z",
+}]})
+
+ERROR_PAGE = "<html><body><h1>Something went wrong</h1></body></html>"
+
+
+@pytest.mark.parametrize("ats, body, expected", [
+    ("greenhouse", GREENHOUSE, {"title": "Junior Developer", "location": "Lisbon",
+                                "url": "https://boards.greenhouse.io/acme/jobs/1", "posted_at": "2024-05-01T10:00:00Z"}),
+    ("lever", LEVER, {"title": "Trainee Analyst", "location": "Porto", "url": "https://jobs.lever.co/acme/1",
+                      "type": "Internship", "posted_at": "2024-05-01T10:00:00"}),
+    ("workable", WORKABLE, {"title": "Junior Designer", "location": "Braga, Portugal",
+                            "url": "https://apply.workable.com/acme/j/AB12", "type": None, "posted_at": "2024-05-01"}),
+    ("smartrecruiters", SMARTRECRUITERS, {"title": "Graduate Engineer", "location": "Aveiro, PT",
+                                          "url": "https://jobs.smartrecruiters.com/acme/99", "type": "Full-time",
+                                          "posted_at": "2024-05-01T10:00:00Z"}),
+])
+def test_parses_board(ats, body, expected):
+    assert is_board_response(ats, body)
+    assert parse_postings(ats, "acme", body) == [expected]
+
+
+@pytest.mark.parametrize("ats, body", [
+    ("lever", '{"ok": false, "error": "Document not found"}'),
+    ("lever", ERROR_PAGE),
+    ("greenhouse", '{"status": 404, "error": "Job board not found"}'),
+    ("greenhouse", "[]"),
+    ("workable", ERROR_PAGE),
+    ("smartrecruiters", '{"message": "Company not found"}'),
+    ("smartrecruiters", ""),
+])
+def test_rejects_bad_body(ats, body):
+    assert not is_board_response(ats, body)
+    assert parse_postings(ats, "acme", body) == []
+
+
+def test_empty_board_is_still_a_board():
+    assert is_board_response("greenhouse", '{"jobs": []}')
+    assert is_board_response("lever", "[]")
+
+
+def test_detects_board_and_endpoint():
+    html = '<script src="https://boards.greenhouse.io/embed/job_board/js?for=acme"></script>'
+    assert detect_ats(html) == ("greenhouse", "acme")
+    assert detect_ats('<a href="https://jobs.lever.co/embed">x</a>') is None
+    assert parse_endpoint("https://api.lever.co/v0/postings/acme?mode=json") == ("lever", "acme")
+    assert parse_endpoint("https://acme.com/careers") is None
+
+
+@pytest.fixture
+def careers(tmp_path, monkeypatch):
+    """Acme on Lever, whose board answers with `body`; its careers page renders to `rendered`."""
+    config = tmp_path / "companies.json"
+    config.write_text(json.dumps([{"company": "Acme", "url": "https://acme.com/careers"}]))
+    scraper = CompanyPagesScraper(str(config))
+    scraper.detected["Acme"] = ("lever", "acme")
+    scraper.body = LEVER
+    scraper.rendered = None
+
+    async def fetch_html(url, probe=False):
+        return scraper.body
+
+    async def fetch_js_rendered_html(url, wait_selector=None):
+        return scraper.rendered
+
+    monkeypatch.setattr(scraper, "fetch_html", fetch_html)
+    monkeypatch.setattr(scraper, "fetch_js_rendered_html", fetch_js_rendered_html)
+    return scraper
+
+
+async def fetch_all(scraper):
+    return [page async for page in scraper.fetch_pages()]
+
+
+def test_board_response_completes_the_company(careers):
+    pages = asyncio.run(fetch_all(careers))
+    assert [page["ats"] for page in pages] == ["lever"]
+    assert careers.completed_targets == {"Acme"}
+
+
+def test_bad_board_response_falls_back_to_the_careers_page(careers):
+    careers.body = '{"ok": false, "error": "Document not found"}'
+    careers.rendered = '<a href="/jobs/1">Junior Developer</a>'
+    pages = asyncio.run(fetch_all(careers))
+    assert pages == [{"company": "Acme", "html": careers.rendered, "url": "https://acme.com/careers"}]
+    assert "Acme" not in careers.detected
+
+
+def test_bad_board_response_does_not_complete_the_company(careers):
+    careers.body = ERROR_PAGE
+    assert asyncio.run(fetch_all(careers)) == []
+    assert careers.completed_targets == set()
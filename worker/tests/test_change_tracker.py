@@ -0,0 +1,65 @@
+import sqlite3
+
+from src.scrapers.change_tracker import CHANGED, NEW, UNCHANGED, ChangeTracker
+
+
+def job(job_id, fingerprint="v1", source="Direct Company"):
+    return {"id": job_id, "fingerprint": fingerprint, "source": source}
+
+
+def test_classifies_new_changed_unchanged_and_disappeared():
+    tracker = ChangeTracker()
+    first = tracker.classify([job("a"), job("b"), job("c")], ["Direct Company"])
+    assert [j["id"] for j in first.new] == ["a", "b", "c"]
+    second = tracker.classify([job("a"), job("b", "v2")], ["Direct Company"])
+    assert [j["id"] for j in second.unchanged] == ["a"]
+    assert [j["id"] for j in second.changed] == ["b"]
+    assert second.disappeared == ["c"]
+    assert [j["id"] for j in second.emitted] == ["b"]
+
+
+def test_incomplete_sources_keep_their_unseen_jobs():
+    tracker = ChangeTracker()
+    tracker.classify([job("a"), job("x", source="LinkedIn")], ["Direct Company", "LinkedIn"])
+    changes = tracker.classify([], ["Direct Company"])
+    assert changes.disappeared == ["a"]
+    assert tracker.observe(job("x", source="LinkedIn")) == UNCHANGED
+
+
+def test_completed_targets_sweep_only_their_own_jobs():
+    tracker = ChangeTracker()
+    tracker.observe(job("a"), "Acme")
+    tracker.observe(job("b"), "Outra")
+    tracker.finish(["Direct Company"])
+    assert tracker.observe(job("b"), "Outra") == UNCHANGED
+    assert tracker.finish([], [("Direct Company", "Acme")]) == ["a"]
+    assert tracker.observe(job("a"), "Acme") == NEW
+
+
+def test_snapshot_persists_and_old_files_gain_targets(tmp_path):
+    path = str(tmp_path / "snapshot.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE snapshot (id TEXT PRIMARY KEY, source TEXT NOT NULL, fingerprint TEXT NOT NULL)")
+    conn.execute("INSERT INTO snapshot VALUES ('a', 'Direct Company', 'v1')")
+    conn.commit()
+    conn.close()
+    tracker = ChangeTracker(path)
+    assert tracker.observe(job("a", "v2"), "Acme") == CHANGED
+    tracker.finish([])
+    tracker.close()
+    reopened = ChangeTracker(path)
+    assert reopened.finish([], [("Direct Company", "Acme")]) == ["a"]
+
+
+def test_observing_takes_no_write_lock_on_a_shared_snapshot(tmp_path):
+    path = str(tmp_path / "snapshot.db")
+    merging = ChangeTracker(path)
+    other = ChangeTracker(path)
+    other.conn.execute("PRAGMA busy_timeout = 0")
+    merging.observe(job("a"), "Acme")
+    # Another worker's merge finishes while this one is still observing
+    other.observe(job("b"), "Outra")
+    other.finish([], [("Direct Company", "Outra")])
+    merging.finish([], [("Direct Company", "Acme")])
+    assert ChangeTracker(path).observe(job("a")) == UNCHANGED
+    assert ChangeTracker(path).observe(job("b")) == UNCHANGED
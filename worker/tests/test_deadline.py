@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from src.scrapers.orchestrator import ScraperOrchestrator, parse_budgets
+from src.scrapers.registry import ScraperRegistry
+from stubs import posting
+
+PAGES = [[posting("Junior Developer")], [posting("Trainee Analyst")], [posting("Estágio Marketing")]]
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    monkeypatch.setenv("SCRAPER_PARSE_EXECUTOR", "inline")
+    monkeypatch.delenv("RUN_DEADLINE", raising=False)
+    monkeypatch.delenv("SCRAPER_BUDGETS", raising=False)
+
+    def make():
+        orchestrator = ScraperOrchestrator(registry=ScraperRegistry({"Board": "stubs:Board", "OtherBoard": "stubs:OtherBoard"}))
+        orchestrator.scraper("Board").pages = PAGES
+        orchestrator.scraper("OtherBoard").pages = [[posting("Junior Designer")]]
+        return orchestrator
+
+    return make
+
+
+def run(orchestrator, **kwargs):
+    async def consume():
+        return [job.title async for job in orchestrator.stream_all(**kwargs)]
+
+    return asyncio.run(consume())
+
+
+def test_budgets_are_parsed():
+    assert parse_budgets("Indeed=300, CompanyPages = 600.5,,Broken=") == {"Indeed": 300.0, "CompanyPages": 600.5}
+    assert parse_budgets(None) == {}
+
+
+def test_deadline_keeps_what_was_scraped_in_time(orchestrator):
+    orchestrator = orchestrator()
+    orchestrator.scraper("Board").delay = 0.2
+    titles = run(orchestrator, deadline=0.3)
+    assert sorted(titles) == ["Junior Designer", "Junior Developer"]
+    assert orchestrator.last_report["truncated"] == ["Board"]
+
+
+def test_truncated_listing_sweeps_nothing(orchestrator):
+    orchestrator = orchestrator()
+    run(orchestrator)
+    assert orchestrator.last_report["truncated"] == []
+    orchestrator.scraper("Board").delay = 0.2
+    run(orchestrator, deadline=0.3)
+    assert orchestrator.last_changes["disappeared"] == []
+
+
+def test_run_deadline_from_the_environment(orchestrator, monkeypatch):
+    monkeypatch.setenv("RUN_DEADLINE", "0.3")
+    orchestrator = orchestrator()
+    orchestrator.scraper("OtherBoard").delay = 0.2
+    orchestrator.scraper("OtherBoard").pages *= 3
+    run(orchestrator)
+    assert orchestrator.last_report["truncated"] == ["OtherBoard"]
+
+
+def test_budget_only_bounds_its_scraper(orchestrator, monkeypatch):
+    monkeypatch.setenv("SCRAPER_BUDGETS", "Board=0.3")
+    orchestrator = orchestrator()
+    orchestrator.scraper("Board").delay = 0.2
+    orchestrator.scraper("OtherBoard").delay = 0.4
+    titles = run(orchestrator)
+    assert sorted(titles) == ["Junior Designer", "Junior Developer"]
+    assert orchestrator.last_report["truncated"] == ["Board"]
+
+
+def test_collect_reports_truncation(orchestrator):
+    orchestrator = orchestrator()
+    orchestrator.scraper("Board").delay = 0.2
+    results = {result["scraper"]: result for result in asyncio.run(orchestrator.collect(deadline=0.3))}
+    assert results["Board"]["run"]["truncated"] and not results["Board"]["run"]["listing_complete"]
+    assert [job["title"] for job in results["Board"]["jobs"]] == ["Junior Developer"]
+    assert not results["OtherBoard"]["run"]["truncated"]
@@ -0,0 +1,150 @@
+import fnmatch
+import hashlib
+
+import pytest
+
+from src.scrapers import dedup_store
+from src.scrapers.dedup_store import (BloomFilter, MemoryDedupStore, RedisDedupStore, SQLiteDedupStore,
+                                      dedup_store_from_url)
+from src.scrapers.deduplicator import Deduplicator
+
+
+class FakeRedis:
+    """In-process stand-in for the redis-py calls RedisDedupStore makes, with expiry on a fake clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}
+        self.calls = 0
+
+    def _live(self, name):
+        value = self.data.get(name)
+        if value is not None and value[1] <= self.clock[0]:
+            del self.data[name]
+            value = None
+        return value
+
+    def set(self, name, value, ex=None, get=False):
+        self.calls += 1
+        previous = self._live(name)
+        self.data[name] = (str(value).encode(), self.clock[0] + ex if ex else float("inf"))
+        if get:
+            return previous[0] if previous else None
+        return True
+
+    def exists(self, name):
+        self.calls += 1
+        return int(self._live(name) is not None)
+
+    def scan_iter(self, match=b"*"):
+        self.calls += 1
+        pattern = match.decode("latin-1")
+        return iter([name for name in list(self.data) if self._live(name) and fnmatch.fnmatchcase(name.decode("latin-1"), pattern)])
+
+
+def digest(n: int) -> bytes:
+    return hashlib.blake2b(str(n).encode(), digest_size=16).digest()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(dedup_store.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path, clock):
+    if request.param == "memory":
+        store = MemoryDedupStore(ttl=100)
+    elif request.param == "sqlite":
+        store = SQLiteDedupStore(str(tmp_path / "dedup.sqlite3"), ttl=100)
+    else:
+        store = RedisDedupStore(FakeRedis(clock), ttl=100)
+    yield store
+    store.close()
+
+
+def test_check_and_add(store):
+    assert not store.check_and_add(digest(1))
+    assert store.check_and_add(digest(1))
+    assert store.contains(digest(1))
+    assert not store.contains(digest(2))
+
+
+def test_digests_expire_unless_seen_again(store, clock):
+    store.add(digest(1))
+    store.add(digest(2))
+    clock[0] += 60
+    store.check_and_add(digest(1))
+    clock[0] += 60
+    assert store.contains(digest(1))
+    assert not store.contains(digest(2))
+    assert list(store.iter_digests()) == [digest(1)]
+
+
+def test_sqlite_store_persists_and_purges_expired(tmp_path, clock):
+    path = str(tmp_path / "dedup.sqlite3")
+    store = SQLiteDedupStore(path, ttl=100)
+    store.add(digest(1))
+    store.close()
+    reopened = SQLiteDedupStore(path, ttl=100)
+    assert reopened.contains(digest(1))
+    reopened.close()
+    clock[0] += 200
+    purged = SQLiteDedupStore(path, ttl=100)
+    assert purged.conn.execute("SELECT COUNT(*) FROM dedup").fetchone()[0] == 0
+    purged.close()
+
+
+def test_memory_store_evicts_least_recently_seen():
+    store = MemoryDedupStore(max_entries=2)
+    store.add(digest(1))
+    store.add(digest(2))
+    store.check_and_add(digest(1))
+    store.add(digest(3))
+    assert store.contains(digest(1)) and store.contains(digest(3))
+    assert not store.contains(digest(2))
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    for n in range(1000):
+        bloom.add(digest(n))
+    assert all(digest(n) in bloom for n in range(1000))
+    false_positives = sum(digest(n) in bloom for n in range(1000, 11000))
+    assert false_positives < 300
+
+
+def test_store_from_url(tmp_path):
+    assert isinstance(dedup_store_from_url(None), MemoryDedupStore)
+    store = dedup_store_from_url(f"sqlite:///{tmp_path}/dedup.sqlite3")
+    assert isinstance(store, SQLiteDedupStore)
+    store.close()
+    with pytest.raises(ValueError):
+        dedup_store_from_url("ftp://example.pt")
+
+
+def job(title):
+    return {"title": title, "company": "Acme", "location": "Lisboa"}
+
+
+def test_bloom_filter_skips_store_lookups_for_new_jobs(clock):
+    redis = FakeRedis(clock)
+    deduplicator = Deduplicator(store=RedisDedupStore(redis, ttl=100), bloom_capacity=1000, near_threshold=0)
+    redis.calls = 0
+    assert not deduplicator.is_known(job("Junior Developer"))
+    assert redis.calls == 0
+    assert deduplicator.is_new(job("Junior Developer"))
+    assert not deduplicator.is_new(job("Junior Developer"))
+    assert deduplicator.is_known(job("Junior Developer"))
+
+
+def test_bloom_filter_picks_up_other_workers_digests_each_run(clock):
+    redis = FakeRedis(clock)
+    deduplicator = Deduplicator(store=RedisDedupStore(redis, ttl=100), bloom_capacity=1000, near_threshold=0)
+    other_worker = Deduplicator(store=RedisDedupStore(redis, ttl=100), near_threshold=0)
+    other_worker.is_new(job("Trainee Analyst"))
+    deduplicator.start_run()
+    assert deduplicator.is_known(job("Trainee Analyst"))
+    assert not deduplicator.is_new(job("Trainee Analyst"))
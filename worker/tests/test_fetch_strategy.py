@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from src.scrapers import fetch_strategy
+from src.scrapers.fetch_strategy import RENDERED, STATIC, FetchStrategyStore
+from stubs import StubScraper
+
+STATIC_PAGE = '<ul><li class="job">Junior Developer</li></ul>'
+SHELL_PAGE = '<div id="app"></div><script src="/app.js"></script>'
+
+
+def test_pages_of_a_listing_share_a_decision():
+    key = FetchStrategyStore.key("Sapo", "https://emprego.sapo.pt/offers?page=3")
+    assert key == FetchStrategyStore.key("Sapo", "https://emprego.sapo.pt/offers?page=1") == "Sapo emprego.sapo.pt/offers"
+    assert key != FetchStrategyStore.key("Sapo", "https://emprego.sapo.pt/offers/junior-1002")
+
+
+def test_rendered_pages_are_reprobed_after_the_interval():
+    store = FetchStrategyStore(reprobe_interval=3600)
+    assert store.should_probe("k", now=0)
+    store.record("k", RENDERED, now=0)
+    assert not store.should_probe("k", now=3599)
+    assert store.should_probe("k", now=3600)
+    store.record("k", STATIC, now=3600)
+    assert store.should_probe("k", now=3601)
+    assert store.get("k").fallbacks == 1
+
+
+def test_decisions_survive_restarts(tmp_path):
+    path = str(tmp_path / "strategy.db")
+    store = FetchStrategyStore(path)
+    store.record("k", RENDERED, now=0)
+    store.close()
+    assert FetchStrategyStore(path).get("k").mode == RENDERED
+
+
+class Site:
+    """What plain HTTP and the browser return for every page, and how often each was asked."""
+
+    def __init__(self, static, rendered):
+        self.static = static
+        self.rendered = rendered
+        self.fetches = []
+
+
+@pytest.fixture
+def site(monkeypatch):
+    monkeypatch.setenv("SCRAPER_PARSE_EXECUTOR", "inline")
+    monkeypatch.setattr(fetch_strategy, "_store", FetchStrategyStore(reprobe_interval=3600))
+    now = [1000.0]
+    monkeypatch.setattr(fetch_strategy.time, "time", lambda: now[0])
+    site = Site(STATIC_PAGE, STATIC_PAGE)
+    site.now = now
+    site.scraper = StubScraper("Listing", "Listing")
+    site.scraper.expected_selector = ".job"
+
+    async def fetch_html(url, probe=False):
+        site.fetches.append(STATIC)
+        return site.static
+
+    async def fetch_js_rendered_html(url, wait_selector=None):
+        site.fetches.append(RENDERED)
+        return site.rendered
+
+    monkeypatch.setattr(site.scraper, "fetch_html", fetch_html)
+    monkeypatch.setattr(site.scraper, "fetch_js_rendered_html", fetch_js_rendered_html)
+    return site
+
+
+def fetch(site, url="https://jobs.test/offers?page=1"):
+    return asyncio.run(site.scraper.fetch_static_first(url))
+
+
+def test_complete_static_pages_are_not_rendered(site):
+    assert fetch(site) == STATIC_PAGE
+    assert site.fetches == [STATIC]
+    assert fetch_strategy._store.get("Listing jobs.test/offers").mode == STATIC
+
+
+def test_pages_needing_js_go_straight_to_the_browser_until_reprobed(site):
+    site.static = SHELL_PAGE
+    assert fetch(site) == STATIC_PAGE
+    assert fetch(site, "https://jobs.test/offers?page=2") == STATIC_PAGE
+    assert site.fetches == [STATIC, RENDERED, RENDERED]
+    site.now[0] += 3600
+    site.static = STATIC_PAGE
+    fetch(site)
+    assert site.fetches[3:] == [STATIC]
+
+
+def test_empty_pages_never_hand_on_the_static_copy_nor_decide(site):
+    site.static = '<ul class="results"></ul>'
+    site.rendered = '<ul class="results"></ul><p>No results</p>'
+    assert fetch(site) == site.rendered
+    assert site.fetches == [STATIC, RENDERED]
+    assert fetch_strategy._store.get("Listing jobs.test/offers") is None
+
+
+def test_failed_render_returns_none(site):
+    site.static = SHELL_PAGE
+    site.rendered = None
+    assert fetch(site) is None
+    assert fetch_strategy._store.get("Listing jobs.test/offers") is None
@@ -0,0 +1,98 @@
+import asyncio
+import contextlib
+
+import httpx
+import pytest
+
+from src.scrapers import http_cache as http_cache_module
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.http_cache import MODE_CACHE_ONLY, HttpCache
+
+
+class Listing(BaseScraper):
+    async def fetch_pages(self):
+        return
+        yield
+
+    async def parse(self, raw_data):
+        return []
+
+
+class MockHttp:
+    """Stands in for the shared client manager, answering every request with `handler`."""
+
+    def __init__(self, handler):
+        self.requests = []
+
+        def record(request):
+            self.requests.append(request)
+            return handler(request)
+
+        self._client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+    def client(self) -> httpx.AsyncClient:
+        return self._client
+
+    def host_slot(self, host: str):
+        return contextlib.nullcontext()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HttpCache(str(tmp_path / "http_cache.sqlite3"), ttl=3600)
+    yield cache
+    cache.close()
+
+
+def test_stores_validators_and_builds_conditional_headers(cache):
+    cache.store("https://cache.test/a", "<html>a</html>", etag='"v1"', last_modified="Wed, 01 Oct 2026 09:00:00 GMT")
+    entry = cache.get("https://cache.test/a")
+    assert entry.body == "<html>a</html>"
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Oct 2026 09:00:00 GMT"}
+    assert cache.get("https://cache.test/b") is None
+
+
+def test_expired_entries_are_dropped_unless_cache_only(cache, monkeypatch):
+    cache.store("https://cache.test/a", "a")
+    later = http_cache_module.time.time() + 7200
+    monkeypatch.setattr(http_cache_module.time, "time", lambda: later)
+    cache.mode = MODE_CACHE_ONLY
+    assert cache.get("https://cache.test/a").body == "a"
+    cache.mode = "default"
+    assert cache.get("https://cache.test/a") is None
+
+
+def test_evicts_least_recently_used_past_max_bytes(cache):
+    cache.max_bytes = 10
+    cache.store("https://cache.test/a", "aaaa")
+    cache.store("https://cache.test/b", "bbbb")
+    cache.get("https://cache.test/a")
+    cache.store("https://cache.test/c", "cccc")
+    assert cache.get("https://cache.test/b") is None
+    assert cache.get("https://cache.test/a") is not None
+
+
+def test_fetch_html_revalidates_and_serves_304_from_cache(cache):
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="<html>jobs</html>", headers={"ETag": '"v1"'})
+
+    scraper = Listing(name="Listing", source="Test", rate_limit=0.01, burst=5)
+    scraper.http_cache = cache
+    scraper.http = MockHttp(handler)
+    url = "https://cache.test/offers"
+    assert asyncio.run(scraper.fetch_html(url)) == "<html>jobs</html>"
+    assert asyncio.run(scraper.fetch_html(url)) == "<html>jobs</html>"
+    assert [request.headers.get("If-None-Match") for request in scraper.http.requests] == [None, '"v1"']
+
+
+def test_cache_only_mode_never_touches_the_network(cache):
+    cache.store("https://cache.test/offers", "<html>cached</html>")
+    cache.mode = MODE_CACHE_ONLY
+    scraper = Listing(name="Listing", source="Test")
+    scraper.http_cache = cache
+    scraper.http = MockHttp(lambda request: httpx.Response(500))
+    assert asyncio.run(scraper.fetch_html("https://cache.test/offers")) == "<html>cached</html>"
+    assert asyncio.run(scraper.fetch_html("https://cache.test/missing")) is None
+    assert scraper.http.requests == []
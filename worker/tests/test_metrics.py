@@ -0,0 +1,62 @@
+import json
+
+from src.scrapers import metrics
+from src.scrapers.metrics import MetricsRegistry, run_report
+
+
+def test_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    errors = registry.counter("scraper_fetch_errors_total", "Failed fetch attempts.")
+    latency = registry.histogram("scraper_fetch_seconds", "Latency.", buckets=(0.5, 1.0))
+    errors.inc(scraper="Sapo", error='HTTP "429"')
+    errors.inc(2, scraper="Sapo", error='HTTP "429"')
+    latency.observe(0.25, scraper="Sapo")
+    latency.observe(0.75, scraper="Sapo")
+    assert registry.render_prometheus().splitlines() == [
+        "# HELP scraper_fetch_errors_total Failed fetch attempts.",
+        "# TYPE scraper_fetch_errors_total counter",
+        'scraper_fetch_errors_total{error="HTTP \\"429\\"",scraper="Sapo"} 3.0',
+        "# HELP scraper_fetch_seconds Latency.",
+        "# TYPE scraper_fetch_seconds histogram",
+        'scraper_fetch_seconds_bucket{scraper="Sapo",le="0.5"} 1',
+        'scraper_fetch_seconds_bucket{scraper="Sapo",le="1.0"} 2',
+        'scraper_fetch_seconds_bucket{scraper="Sapo",le="+Inf"} 2',
+        'scraper_fetch_seconds_sum{scraper="Sapo"} 1.0',
+        'scraper_fetch_seconds_count{scraper="Sapo"} 2',
+    ]
+
+
+def test_same_name_returns_the_same_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("jobs_total", "Jobs.") is registry.counter("jobs_total", "Jobs.")
+
+
+def test_run_report_holds_what_changed_during_the_run():
+    registry = MetricsRegistry()
+    jobs = registry.counter("scraper_jobs_total", "Jobs.")
+    parse = registry.histogram("scraper_parse_seconds", "Parse.")
+    runs = registry.histogram("orchestrator_run_seconds", "Runs.")
+    jobs.inc(5, scraper="Sapo")
+    jobs.inc(1, scraper="Indeed")
+    before = registry.snapshot()
+    jobs.inc(3, scraper="Sapo")
+    parse.observe(0.25, scraper="Sapo")
+    runs.observe(12.0)
+    assert run_report(before, registry.snapshot()) == {
+        "Sapo": {"scraper_jobs_total": 3.0, "scraper_parse_seconds_sum": 0.25, "scraper_parse_seconds_count": 1},
+        "_orchestrator": {"orchestrator_run_seconds_sum": 12.0, "orchestrator_run_seconds_count": 1},
+    }
+
+
+def test_export_run_writes_report_and_text_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_METRICS_DIR", str(tmp_path))
+    metrics.export_run({"emitted": 3})
+    assert json.loads((tmp_path / "run_report.json").read_text()) == {"emitted": 3}
+    assert "# TYPE scraper_jobs_total counter" in (tmp_path / "scraper_metrics.prom").read_text()
+
+
+def test_export_run_is_off_without_a_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("SCRAPER_METRICS_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+    metrics.export_run({"emitted": 3})
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,59 @@
+from src.scrapers.dedup_store import MemoryDedupStore
+from src.scrapers.deduplicator import Deduplicator
+from src.scrapers.near_dedup import NearDuplicateIndex, choose_winner
+
+
+def job(title, company="Acme Tecnologia", location="Lisboa", source="LinkedIn", posted_at=None):
+    return {"title": title, "company": company, "location": location, "source": source,
+            "url": f"https://example.pt/{title}", "posted_at": posted_at}
+
+
+def test_same_posting_listed_differently_matches():
+    index = NearDuplicateIndex()
+    key = index.add(job("Junior Software Developer (M/F)", "Acme Tecnologia, Lda", "Lisbon, Portugal"))
+    match = index.query(job("Junior Software Developer", "ACME Tecnologia", "Lisboa", source="Indeed"))
+    assert match is not None and match.key == key
+
+
+def test_same_title_at_another_company_or_city_does_not_match():
+    index = NearDuplicateIndex()
+    index.add(job("Junior Software Developer"))
+    assert index.query(job("Junior Software Developer", company="Outra Empresa")) is None
+    assert index.query(job("Junior Software Developer", location="Porto")) is None
+
+
+def test_different_title_does_not_match():
+    index = NearDuplicateIndex()
+    index.add(job("Junior Software Developer"))
+    assert index.query(job("Trainee Controlo de Gestão")) is None
+
+
+def test_index_forgets_oldest_entries_past_max_entries():
+    titles = ["Junior Software Developer", "Trainee Controlo de Gestão", "Estágio em Marketing Digital",
+              "Graduate Data Analyst", "Internship in Human Resources"]
+    index = NearDuplicateIndex(max_entries=3)
+    for title in titles:
+        index.add(job(title))
+    assert len(index) == 3
+    assert sum(len(bucket) for bucket in index.buckets.values()) == 3 * index.bands
+    assert index.query(job(titles[0])) is None
+    assert index.query(job(titles[-1])) is not None
+
+
+def test_more_complete_record_wins():
+    wins, _ = choose_winner(job("Trainee", location="Portugal"), job("Trainee", posted_at="2026-01-01"))
+    assert wins
+    wins, reason = choose_winner(job("Trainee", source="Indeed"), job("Trainee", source="Direct Company"))
+    assert wins and reason == "preferred source"
+
+
+def test_deduplicator_keeps_preferred_record_and_reports_match():
+    deduplicator = Deduplicator(store=MemoryDedupStore())
+    deduplicator.start_run()
+    indeed = job("Junior Software Developer", source="Indeed")
+    direct = job("Junior Software Developer (m/f)", source="Direct Company")
+    unique = deduplicator.process_and_deduplicate([indeed, direct, dict(indeed)])
+    assert unique == [direct]
+    [match] = deduplicator.near_duplicate_report
+    assert match["kept"]["source"] == "Direct Company"
+    assert deduplicator.is_known(indeed)
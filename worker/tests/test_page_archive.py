@@ -0,0 +1,67 @@
+import asyncio
+import os
+
+import pytest
+
+from src.scrapers import page_archive
+from src.scrapers.page_archive import CODEC_GZIP, CODEC_ZSTD, PageArchive, page_digest
+from src.scrapers.recording import PageCorpus
+from src.scrapers.sapo import SapoScraper
+
+CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "corpus", "v1")
+FIRST_PAGE = "https://emprego.sapo.pt/offers?q=trainee%20OR%20estagio&page=1"
+
+CODECS = [CODEC_GZIP] + ([CODEC_ZSTD] if page_archive.zstandard else [])
+
+
+@pytest.fixture(params=CODECS)
+def archive(request, tmp_path):
+    archive = PageArchive(str(tmp_path / "archive"), request.param)
+    yield archive
+    archive.close()
+
+
+def test_round_trips_compressed_pages(archive):
+    digest = archive.put("Sapo", "SAPO Emprego", FIRST_PAGE, "<html>ofertas</html>", rendered=False)
+    assert digest == page_digest("<html>ofertas</html>")
+    assert archive.get(digest) == "<html>ofertas</html>"
+    assert archive.get(page_digest("<html>other</html>")) is None
+    assert os.path.exists(os.path.join(archive.root, "objects", digest[:2], f"{digest}.{archive.codec}"))
+
+
+def test_identical_bodies_are_stored_once(archive):
+    archive.put("Sapo", "SAPO Emprego", FIRST_PAGE, "<html>same</html>", rendered=False)
+    archive.put("Sapo", "SAPO Emprego", FIRST_PAGE + "&sort=date", "<html>same</html>", rendered=False)
+    objects = [name for _, _, files in os.walk(os.path.join(archive.root, "objects")) for name in files]
+    assert len(objects) == 1
+    assert len(archive.latest_pages("Sapo")) == 2
+
+
+def test_latest_pages_keeps_the_last_fetch_of_each_url(archive, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(page_archive.time, "time", lambda: now[0])
+    archive.put("Sapo", "SAPO Emprego", FIRST_PAGE, "<html>old</html>", rendered=False)
+    now[0] = 200.0
+    new = archive.put("Sapo", "SAPO Emprego", FIRST_PAGE, "<html>new</html>", rendered=False)
+    rendered = archive.put("Sapo", "SAPO Emprego", FIRST_PAGE, "<html>rendered</html>", rendered=True)
+    latest = archive.latest_pages("Sapo")
+    assert [(page.digest, page.rendered) for page in latest] == [(new, False), (rendered, True)]
+    assert archive.latest_pages("Indeed") == []
+
+
+def test_reparse_streams_archived_pages_without_fetching(archive, monkeypatch):
+    monkeypatch.setenv("SCRAPER_PARSE_EXECUTOR", "inline")
+    html = PageCorpus(CORPUS).load("Sapo", FIRST_PAGE, rendered=False)
+    digest = archive.put("Sapo", "SAPO Emprego", FIRST_PAGE, html, rendered=False)
+    scraper = SapoScraper()
+    scraper.archive = archive
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("reparse fetched a page")
+
+    scraper.fetch_html = scraper.fetch_js_rendered_html = fail
+    jobs = asyncio.run(scraper.run(reparse=True))
+    assert len(jobs) == 3
+    assert {job["page_digest"] for job in jobs} == {digest}
+    # Archived pages may come from several runs: a reparse never proves a posting disappeared
+    assert not scraper.listing_complete
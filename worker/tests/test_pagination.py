@@ -0,0 +1,54 @@
+import asyncio
+from typing import Dict, List, Optional
+
+from src.scrapers.pagination import (STOP_ALL_KNOWN, STOP_EMPTY, STOP_EMPTY_FIRST, STOP_FETCH_FAILED, STOP_MAX_DEPTH,
+                                      Paginator)
+
+
+def crawl(listing: Dict[int, Optional[List[str]]], max_pages: int = 10, prefetch: int = 1, known=()):
+    """Walks `listing` (page number -> job IDs, None for a failed fetch) the way `BaseScraper.stream` does."""
+    fetched = []
+
+    async def fetch(url: str) -> Optional[str]:
+        fetched.append(int(url))
+        return None if listing.get(int(url), []) is None else url
+
+    async def run():
+        paginator = Paginator("Test", fetch, str, max_pages, prefetch,
+                              is_known=lambda job: job["id"] in known)
+        async for html in paginator.pages():
+            paginator.observe([{"id": job_id} for job_id in listing.get(int(html), [])])
+        return paginator
+
+    return asyncio.run(run()), fetched
+
+
+def test_stops_on_empty_page_after_results():
+    paginator, _ = crawl({0: ["a", "b"], 1: ["c"], 2: []})
+    assert paginator.stop_reason == STOP_EMPTY
+    assert paginator.pages_fetched == 3
+
+
+def test_empty_first_page_is_not_the_end_of_the_listing():
+    paginator, _ = crawl({0: []})
+    assert paginator.stop_reason == STOP_EMPTY_FIRST
+
+
+def test_stops_once_a_page_holds_only_known_jobs():
+    paginator, _ = crawl({0: ["a", "b"], 1: ["c", "a"], 2: ["d"]}, known={"c"})
+    assert paginator.stop_reason == STOP_ALL_KNOWN
+    assert paginator.pages_fetched == 2
+
+
+def test_stops_on_failed_fetch():
+    paginator, _ = crawl({0: ["a"], 1: None, 2: ["b"]})
+    assert paginator.stop_reason == STOP_FETCH_FAILED
+    assert paginator.pages_fetched == 1
+
+
+def test_max_depth_and_prefetch():
+    listing = {n: [str(n)] for n in range(10)}
+    paginator, fetched = crawl(listing, max_pages=4, prefetch=2)
+    assert paginator.stop_reason == STOP_MAX_DEPTH
+    # Never fetches past max_pages, however far ahead it prefetches
+    assert sorted(fetched) == [0, 1, 2, 3]
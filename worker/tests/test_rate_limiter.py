@@ -0,0 +1,71 @@
+import pytest
+
+from src.scrapers import rate_limiter
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.rate_limiter import TokenBucket, parse_retry_after
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_goes_out_at_once_then_waits_for_the_rate(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    # Callers queue up: the next one waits for the token after that
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_up_to_burst(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock[0] += 10
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_penalize_halves_rate_and_holds_host_until_retry_after(clock):
+    bucket = TokenBucket(rate=1.0, burst=1)
+    bucket.reserve()
+    bucket.penalize(retry_after=30)
+    assert bucket.rate == 0.5
+    assert bucket.reserve() == pytest.approx(30 + 2.0)
+
+
+def test_penalized_rate_has_a_floor_and_recovers(clock):
+    bucket = TokenBucket(rate=8.0)
+    for _ in range(10):
+        bucket.penalize()
+    assert bucket.rate == 1.0
+    for _ in range(20):
+        bucket.record_success()
+    assert bucket.rate == 8.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+
+class Unthrottled(BaseScraper):
+    async def fetch_pages(self):
+        return
+        yield
+
+    async def parse(self, raw_data):
+        return []
+
+
+def test_scraper_rejects_a_rate_limit_of_zero():
+    with pytest.raises(ValueError, match="rate_limit"):
+        Unthrottled(name="Unthrottled", source="Test", rate_limit=0)
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from src.scrapers import registry
+from src.scrapers.registry import ScraperRegistry, declared_scrapers
+from stubs import Board
+
+
+def test_scrapers_are_instantiated_once_on_first_use():
+    scrapers = ScraperRegistry({"Board": "stubs:Board", "OtherBoard": "stubs:OtherBoard"})
+    assert scrapers.names() == ["Board", "OtherBoard"] and "Board" in scrapers
+    assert scrapers.loaded() == []
+    board = scrapers.get("Board")
+    assert isinstance(board, Board) and scrapers.get("Board") is board
+    assert scrapers.loaded() == [board]
+
+
+def test_unknown_and_misnamed_scrapers():
+    scrapers = ScraperRegistry({"Listing": "stubs:Board"})
+    with pytest.raises(KeyError):
+        scrapers.get("Board")
+    with pytest.raises(ValueError, match="declared as Listing is named Board"):
+        scrapers.get("Listing")
+
+
+def test_entry_points_add_scrapers_but_cannot_take_over_builtins(monkeypatch):
+    declared = [
+        EntryPoint("Board", "stubs:Board", registry.ENTRY_POINT_GROUP),
+        EntryPoint("Sapo", "stubs:OtherBoard", registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(registry, "entry_points", lambda group: [ep for ep in declared if ep.group == group])
+    specs = declared_scrapers()
+    assert specs["Board"] == "stubs:Board"
+    assert specs["Sapo"] == registry.BUILTIN_SCRAPERS["Sapo"]
+    assert isinstance(ScraperRegistry().get("Board"), Board)
+
+
+def test_using_one_scraper_imports_no_other():
+    code = (
+        "import sys\n"
+        "from src.scrapers import ScraperOrchestrator\n"
+        "from src.scrapers.registry import ScraperRegistry\n"
+        "ScraperRegistry().get('Sapo')\n"
+        "print(sorted(m for m in sys.modules if m in ('playwright', 'src.scrapers.linkedin', 'src.scrapers.indeed')))\n"
+    )
+    worker = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=worker, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
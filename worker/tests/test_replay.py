@@ -0,0 +1,44 @@
+import asyncio
+import os
+
+import pytest
+
+from src.scrapers.recording import PageCorpus, ReplayTransport, set_replay_transport
+from src.scrapers.sapo import SapoScraper
+
+# Pages recorded in the layout `bench_scrapers record` writes
+CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "corpus", "v1")
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    monkeypatch.setenv("SCRAPER_PARSE_EXECUTOR", "inline")
+    transport = ReplayTransport(PageCorpus(CORPUS))
+    set_replay_transport(transport)
+    yield transport
+    set_replay_transport(None)
+
+
+def test_corpus_lists_recorded_scrapers():
+    assert PageCorpus(CORPUS).scrapers() == ["Sapo"]
+
+
+def test_missing_pages_replay_as_failed_fetches(replay):
+    assert replay.fetch("Sapo", "https://emprego.sapo.pt/offers?page=99", rendered=False) is None
+
+
+def test_scraper_runs_offline_from_the_corpus(replay):
+    scraper = SapoScraper()
+    jobs = asyncio.run(scraper.run())
+    assert [job["title"] for job in jobs] == [
+        "Estágio Profissional - Marketing Digital", "Junior Software Developer", "Trainee Controlo de Gestão",
+    ]
+    assert jobs[1]["company"] == "Acme Tecnologia S.A."
+    assert jobs[1]["location"] == "Porto"
+    assert jobs[1]["url"] == "https://emprego.sapo.pt/offers/junior-software-developer-1002"
+    assert jobs[1]["source"] == "SAPO Emprego"
+    assert "level:junior" in jobs[1]["tags"]
+    assert all(job["id"] and job["fingerprint"] for job in jobs)
+    # Page 2's static copy is the JS shell and rendered it has no offers: the end of the listing, not a failure
+    assert scraper.pages_streamed == 2
+    assert scraper.listing_complete
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from src.scrapers.resource_policy import AssetCache, CachedAsset, RequestInterceptor, ResourcePolicy
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeResponse:
+    def __init__(self, body=b"console.log(1)", status=200, headers=None):
+        self.status = status
+        self.headers = headers if headers is not None else {"content-type": "text/javascript"}
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    """Records what a Playwright route was answered with; `failing` names the calls that raise."""
+
+    def __init__(self, url, resource_type, response=None, failing=()):
+        self.request = FakeRequest(url, resource_type)
+        self.response = response or FakeResponse()
+        self.failing = set(failing)
+        self.answers = []
+
+    async def _answer(self, action, *args, **kwargs):
+        if action in self.failing:
+            raise RuntimeError(f"{action} failed")
+        self.answers.append((action, args, kwargs))
+
+    async def abort(self, *args):
+        await self._answer("abort", *args)
+
+    async def continue_(self):
+        await self._answer("continue")
+
+    async def fulfill(self, **kwargs):
+        await self._answer("fulfill", **kwargs)
+
+    async def fetch(self):
+        if "fetch" in self.failing:
+            raise RuntimeError("fetch failed")
+        return self.response
+
+
+@pytest.fixture
+def interceptor():
+    return RequestInterceptor(ResourcePolicy(allowed_domains={"cdn.sapo.pt"}), AssetCache(), "Sapo")
+
+
+def handle(interceptor, route):
+    asyncio.run(interceptor.handle(route))
+    return [action for action, _, _ in route.answers]
+
+
+def test_blocks_by_type_and_tracker_domain_unless_allowed(interceptor):
+    assert handle(interceptor, FakeRoute("https://emprego.sapo.pt/logo.png", "image")) == ["abort"]
+    assert handle(interceptor, FakeRoute("https://www.google-analytics.com/analytics.js", "script")) == ["abort"]
+    assert handle(interceptor, FakeRoute("https://cdn.sapo.pt/hero.png", "image")) == ["continue"]
+    assert handle(interceptor, FakeRoute("https://emprego.sapo.pt/offers", "document")) == ["continue"]
+
+
+def test_caches_scripts_across_pages(interceptor):
+    url = "https://emprego.sapo.pt/app.js"
+    assert handle(interceptor, FakeRoute(url, "script")) == ["fulfill"]
+    cached = FakeRoute(url, "script", failing={"fetch"})
+    assert handle(interceptor, cached) == ["fulfill"]
+    assert cached.answers[0][2]["body"] == b"console.log(1)"
+
+
+def test_uncacheable_responses_are_not_kept(interceptor):
+    url = "https://emprego.sapo.pt/session.js"
+    handle(interceptor, FakeRoute(url, "script", FakeResponse(headers={"cache-control": "private"})))
+    assert interceptor.cache.get(url) is None
+
+
+def test_failed_fetch_lets_the_request_through(interceptor):
+    assert handle(interceptor, FakeRoute("https://emprego.sapo.pt/app.js", "script", failing={"fetch"})) == ["continue"]
+    assert handle(interceptor, FakeRoute("https://emprego.sapo.pt/app.js", "script", failing={"fulfill"})) == ["continue"]
+
+
+def test_aborts_when_the_request_cannot_be_continued(interceptor):
+    route = FakeRoute("https://emprego.sapo.pt/app.js", "script", failing={"fetch", "continue"})
+    assert handle(interceptor, route) == ["abort"]
+
+
+def test_closed_page_is_not_an_error(interceptor):
+    route = FakeRoute("https://emprego.sapo.pt/app.js", "script", failing={"fetch", "continue", "abort", "fulfill"})
+    assert handle(interceptor, route) == []
+
+
+def test_asset_cache_is_bounded():
+    cache = AssetCache(max_bytes=10)
+    cache.put("a", CachedAsset(200, {}, b"aaaaaa"))
+    cache.put("b", CachedAsset(200, {}, b"bbbbbb"))
+    assert cache.get("a") is None and cache.get("b") is not None
+    assert cache.size == 6
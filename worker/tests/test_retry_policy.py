@@ -0,0 +1,82 @@
+import pytest
+
+from src.scrapers import retry_policy
+from src.scrapers.retry_policy import (BLOCKED, GIVE_UP_BLOCKED, GIVE_UP_BUDGET, GIVE_UP_EXHAUSTED, GIVE_UP_PERMANENT,
+                                       PERMANENT, PROBE_TIMEOUT, RETRYABLE, RetryPolicy, classify_status)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(retry_policy.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_classify_status():
+    assert classify_status(429) == BLOCKED
+    assert classify_status(503) == RETRYABLE
+    assert classify_status(404) == PERMANENT
+
+
+def test_circuit_opens_after_consecutive_blocks(clock):
+    policy = RetryPolicy(breaker_threshold=3, breaker_cooldown=60)
+    for _ in range(2):
+        policy.record("example.pt", BLOCKED)
+    assert policy.allow("example.pt")
+    policy.record("example.pt", BLOCKED)
+    assert not policy.allow("example.pt")
+    assert policy.allow("other.pt")
+
+
+def test_success_resets_the_count(clock):
+    policy = RetryPolicy(breaker_threshold=2)
+    policy.record("example.pt", BLOCKED)
+    policy.record("example.pt", None)
+    policy.record("example.pt", BLOCKED)
+    assert policy.allow("example.pt")
+
+
+def test_half_open_circuit_lets_one_probe_through(clock):
+    policy = RetryPolicy(breaker_threshold=1, breaker_cooldown=60)
+    policy.record("example.pt", BLOCKED)
+    clock[0] += 61
+    assert policy.allow("example.pt")
+    assert not policy.allow("example.pt")
+    policy.record("example.pt", None)
+    assert policy.allow("example.pt")
+    assert policy.allow("example.pt")
+
+
+def test_blocked_probe_reopens_for_twice_as_long(clock):
+    policy = RetryPolicy(breaker_threshold=1, breaker_cooldown=60)
+    policy.record("example.pt", BLOCKED)
+    clock[0] += 61
+    assert policy.allow("example.pt")
+    policy.record("example.pt", BLOCKED)
+    clock[0] += 61
+    assert not policy.allow("example.pt")
+    clock[0] += 60
+    assert policy.allow("example.pt")
+
+
+def test_probe_that_fails_otherwise_or_never_reports_frees_the_slot(clock):
+    policy = RetryPolicy(breaker_threshold=1, breaker_cooldown=60)
+    policy.record("example.pt", BLOCKED)
+    clock[0] += 61
+    assert policy.allow("example.pt")
+    policy.record("example.pt", RETRYABLE)
+    assert policy.allow("example.pt")
+    clock[0] += PROBE_TIMEOUT
+    assert policy.allow("example.pt")
+
+
+def test_retry_delay():
+    policy = RetryPolicy(retry_budget=2, backoff=1.0, max_wait=60)
+    assert policy.retry_delay(PERMANENT, 0, 3).reason == GIVE_UP_PERMANENT
+    assert policy.retry_delay(RETRYABLE, 3, 3).reason == GIVE_UP_EXHAUSTED
+    assert policy.retry_delay(BLOCKED, 0, 3).reason == GIVE_UP_BLOCKED
+    assert policy.retry_delay(RETRYABLE, 2, 3).delay == 4.0
+    assert policy.retry_delay(BLOCKED, 0, 3, retry_after=10).delay == 0.0
+    assert policy.retry_delay(RETRYABLE, 0, 3).reason == GIVE_UP_BUDGET
+    policy.start_run()
+    assert policy.retry_delay(RETRYABLE, 0, 3, retry_after=5).delay == 5.0
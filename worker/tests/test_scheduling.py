@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.scrapers.orchestrator import ScraperOrchestrator
+from src.scrapers.registry import ScraperRegistry
+from src.scrapers.scheduling import AdaptiveScheduler, SourceOutcome
+from stubs import posting
+
+HOUR = 3600
+
+
+@pytest.fixture
+def scheduler():
+    return AdaptiveScheduler(min_interval=15 * 60, max_interval=7 * 24 * HOUR, target_changes=5, backoff=1.5)
+
+
+def test_sources_never_run_are_due(scheduler):
+    scheduler.record("Board", SourceOutcome(10, 0, False, False), now=0)
+    assert scheduler.due(["Board", "Careers:Acme"], now=60) == ["Careers:Acme"]
+
+
+def test_churning_source_runs_often_and_quiet_one_backs_off(scheduler):
+    scheduler.record("Busy", SourceOutcome(50, 10, False, False), now=0)
+    scheduler.record("Quiet", SourceOutcome(50, 0, False, False), now=0)
+    busy = scheduler.record("Busy", SourceOutcome(50, 20, False, False), now=HOUR)
+    quiet = scheduler.record("Quiet", SourceOutcome(50, 0, False, False), now=HOUR)
+    assert busy.interval == scheduler.min_interval
+    assert quiet.interval == scheduler.min_interval * 1.5 * 1.5
+    assert scheduler.due(["Busy", "Quiet"], now=HOUR + 16 * 60) == ["Busy"]
+
+
+def test_interval_follows_change_rate(scheduler):
+    scheduler.record("Board", SourceOutcome(50, 1, False, False), now=0)
+    schedule = scheduler.record("Board", SourceOutcome(50, 1, False, False), now=HOUR)
+    # About target_changes changes per run
+    assert schedule.interval == pytest.approx(5 / schedule.change_rate * HOUR)
+    assert scheduler.min_interval < schedule.interval <= scheduler.max_interval
+
+
+def test_failures_back_off_exponentially_up_to_max_interval(scheduler):
+    intervals = [scheduler.record("Board", SourceOutcome(0, 0, True, False), now=0).interval for _ in range(12)]
+    assert intervals[:3] == [30 * 60, 60 * 60, 120 * 60]
+    assert intervals[-1] == scheduler.max_interval
+    assert scheduler.record("Board", SourceOutcome(20, 0, False, False), now=0).consecutive_failures == 0
+
+
+def test_claim_keeps_dispatched_sources_from_being_due_again(scheduler):
+    scheduler.claim(["Board"], lease=HOUR, now=0)
+    assert scheduler.due(["Board"], now=60) == []
+    assert scheduler.due(["Board"], now=HOUR) == ["Board"]
+
+
+def test_state_survives_restarts(tmp_path):
+    path = str(tmp_path / "schedule.sqlite3")
+    AdaptiveScheduler(path).record("Board", SourceOutcome(10, 2, False, False), now=0)
+    assert AdaptiveScheduler(path).get("Board").runs == 1
+
+
+def test_only_the_blocked_target_counts_as_blocked():
+    orchestrator = ScraperOrchestrator(registry=ScraperRegistry({"Careers": "stubs:Careers"}))
+    careers = orchestrator.scraper("Careers")
+    careers.pages = {"Acme": [posting("Junior Developer", "Acme")], "Outra": [], "Sword": [posting("Trainee", "Sword")]}
+    careers.blocked = ["Outra"]
+
+    async def run():
+        return [job async for job in orchestrator.stream_all()]
+
+    asyncio.run(run())
+    outcomes = orchestrator.last_outcomes
+    assert outcomes["Careers:Acme"] == SourceOutcome(1, 1, False, False)
+    assert outcomes["Careers:Outra"] == SourceOutcome(0, 0, True, True)
+    assert outcomes["Careers:Sword"].blocked is False
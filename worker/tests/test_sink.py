@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from src.scrapers.normalizer import normalize_job
+from src.scrapers.sink import JobSink, jobs_table
+
+
+@pytest.fixture
+def sink(tmp_path):
+    return JobSink(f"sqlite:///{tmp_path / 'jobs.db'}", batch_size=2, flush_interval=3600, create_tables=True)
+
+
+def job(title, company="Acme Tecnologia", **fields):
+    return normalize_job({"title": title, "company": company, "location": "Lisboa", "source": "SAPO Emprego",
+                          "url": f"https://example.pt/{title}", "tags": ["level:junior"], **fields},
+                         fetched_at="2026-10-01T09:00:00")
+
+
+def rows(sink):
+    with sink.engine.connect() as conn:
+        return {row.id: row for row in conn.execute(select(jobs_table))}
+
+
+def test_flushes_full_batches_and_the_rest_on_request(sink):
+    assert sink.add(job("Junior Developer")) == 0
+    assert sink.add(job("Trainee Analyst")) == 2
+    assert sink.add(job("Estagiário")) == 0
+    assert sink.flush() == 1
+    assert len(rows(sink)) == 3
+
+
+def test_upserts_on_the_stable_id(sink):
+    first = job("Junior Developer", posted_at="2026-09-30")
+    sink.add_many([first])
+    updated = job("Junior Developer", posted_at="2026-10-01")
+    assert updated["id"] == first["id"]
+    # The same job twice in one batch is written once
+    assert sink.add_many([updated, updated]) == 1
+    [row] = rows(sink).values()
+    assert row.posted_at == "2026-10-01"
+    assert row.tags == ["level:junior"]
+    assert row.fetched_at.isoformat() == "2026-10-01T09:00:00"
+
+
+def test_consume_writes_a_stream(sink):
+    async def stream():
+        for title in ("Junior Developer", "Trainee Analyst", "Estagiário"):
+            yield job(title)
+
+    assert asyncio.run(sink.consume(stream())) == 3
+    assert len(rows(sink)) == 3
@@ -0,0 +1,41 @@
+from src.scrapers.tagging import Tagger, get_tagger
+
+VOCABULARY = {
+    "level": {"internship": ["intern", "estágio"], "junior": ["junior", "jr."]},
+    "stack": {"java": ["java"], "csharp": ["c#", ".net"]},
+}
+
+
+def test_matches_whole_words_only():
+    tagger = Tagger(VOCABULARY)
+    assert tagger.tags("Java Developer") == ["stack:java"]
+    assert tagger.tags("JavaScript Developer") == []
+    assert tagger.tags("Internal Auditor") == []
+    assert tagger.tags("Summer Intern") == ["level:internship"]
+
+
+def test_folds_case_and_accents():
+    tagger = Tagger(VOCABULARY)
+    assert tagger.tags("ESTAGIO em Lisboa") == ["level:internship"]
+    assert tagger.tags("Estágio Profissional") == ["level:internship"]
+
+
+def test_terms_with_punctuation():
+    tagger = Tagger(VOCABULARY)
+    assert tagger.tags("Jr. C# / .NET developer") == ["level:junior", "stack:csharp"]
+
+
+def test_tag_jobs_uses_title_and_location_and_keeps_existing_tags():
+    tagger = Tagger(VOCABULARY)
+    jobs = [{"title": "Junior Java Developer", "location": "Lisboa", "type": "Estágio", "tags": ["level:internship"]},
+            {"title": "Accountant", "location": "Porto", "type": "Intern"}]
+    tagger.tag_jobs(jobs)
+    assert jobs[0]["tags"] == ["level:internship", "level:junior", "stack:java"]
+    # A scraper's fixed `type` label says nothing about the posting
+    assert jobs[1]["tags"] == []
+
+
+def test_bundled_vocabulary_loads():
+    tagger = get_tagger()
+    assert tagger.size > 0
+    assert tagger.has_any("Programa de Trainees 2026", ("level:trainee",))
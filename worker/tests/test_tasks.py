@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine, select
+
+from src import pipeline, tasks
+from src.scrapers import scheduling
+from src.scrapers.orchestrator import ScraperOrchestrator
+from src.scrapers.registry import ScraperRegistry
+from src.scrapers.scheduling import AdaptiveScheduler
+from src.scrapers.sink import jobs_table
+from src.worker import app
+from stubs import posting
+
+SPECS = {"Board": "stubs:Board", "OtherBoard": "stubs:OtherBoard", "Careers": "stubs:Careers"}
+
+
+@pytest.fixture
+def eager(tmp_path, monkeypatch):
+    """Runs the chord in-process against stub scrapers, a SQLite database and a fresh scheduler."""
+    database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    monkeypatch.setenv("DATABASE_URL", database_url)
+    monkeypatch.setenv("SCRAPER_PARSE_EXECUTOR", "inline")
+    monkeypatch.setenv("SCRAPE_TARGETS_PER_TASK", "1")
+    monkeypatch.setitem(app.conf, "task_always_eager", True)
+    orchestrator = ScraperOrchestrator(registry=ScraperRegistry(SPECS))
+    monkeypatch.setattr(pipeline, "_orchestrator", orchestrator)
+    monkeypatch.setattr(scheduling, "_scheduler", AdaptiveScheduler())
+    yield orchestrator, create_engine(database_url)
+    tasks.shutdown_loop()
+
+
+def test_fan_out_batches_targets_and_keeps_listings_whole():
+    units = ["Board", "Careers:Acme", "Careers:Outra", "Careers:Sword", "OtherBoard"]
+    assert tasks.fan_out(units, targets_per_task=2) == [
+        ["Board"], ["OtherBoard"], ["Careers:Acme", "Careers:Outra"], ["Careers:Sword"],
+    ]
+    assert tasks.queue_for("Careers:Acme") == "scrape.careers"
+
+
+def test_chord_scrapes_merges_and_persists_eagerly(eager):
+    orchestrator, engine = eager
+    orchestrator.scraper("Board").pages = [[posting("Junior Developer"), posting("Trainee Analyst")]]
+    # The same posting on another board is merged away
+    orchestrator.scraper("OtherBoard").pages = [[posting("Junior Developer")]]
+    orchestrator.scraper("Careers").pages = {
+        "Acme": [posting("Estágio em Marketing", "Acme")],
+        "Outra": [posting("Graduate Engineer", "Outra")],
+    }
+
+    tasks.run_full_scraping_pipeline()
+
+    with engine.connect() as conn:
+        titles = sorted(row.title for row in conn.execute(select(jobs_table)))
+    assert titles == ["Estágio em Marketing", "Graduate Engineer", "Junior Developer", "Trainee Analyst"]
+    report = orchestrator.last_report
+    assert report["total_fetched"] == 5
+    assert report["emitted"] == 4
+    # Careers came back in one batch per company; the merge adds their metrics up
+    assert report["scrapers"]["Careers"]["scraper_jobs_total"] == 2.0
+    scheduler = scheduling.get_scheduler()
+    assert sorted(schedule.key for schedule in scheduler.schedules()) == [
+        "Board", "Careers:Acme", "Careers:Outra", "OtherBoard",
+    ]
+    assert scheduler.get("Careers:Acme").runs == 1
+
+
+def test_due_sources_only_dispatches_what_is_due(eager):
+    orchestrator, engine = eager
+    orchestrator.scraper("Board").pages = [[posting("Junior Developer")]]
+    orchestrator.scraper("Careers").pages = {"Acme": [posting("Estágio em Marketing", "Acme")]}
+    tasks.run_due_sources()
+    assert tasks.run_due_sources() is None
+    assert scheduling.get_scheduler().get("Board").runs == 1